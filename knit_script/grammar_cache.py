@@ -0,0 +1,126 @@
+"""Process-wide and on-disk cache of parglare grammars, LR tables, and parsers"""
+import hashlib
+import os
+import tempfile
+from typing import Any
+
+import importlib_resources
+import parglare
+from parglare import Grammar, Parser
+from parglare.closure import LR_1
+from parglare.tables import create_table
+from parglare.tables.persist import load_table, save_table
+
+_grammars: dict[str, Grammar] = {}
+_tables: dict[int, Any] = {}
+_parsers: dict[str, Parser] = {}
+
+
+def cache_directory() -> str:
+    """
+    :return: Directory that holds cached LR tables. Set by KNIT_SCRIPT_CACHE_DIR, defaults to ~/.cache/knit_script
+    """
+    cache_dir = os.environ.get("KNIT_SCRIPT_CACHE_DIR")
+    if cache_dir is None:
+        cache_dir = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "knit_script")
+    return cache_dir
+
+
+def grammar_key(grammar_path) -> str:
+    """
+    :param grammar_path: path to a .pg grammar file
+    :return: Key that identifies the grammar by its content and the parglare version that compiles it
+    """
+    with open(grammar_path, "rb") as grammar_file:
+        digest = hashlib.sha256(grammar_file.read()).hexdigest()[:16]
+    return f"{os.path.splitext(os.path.basename(grammar_path))[0]}-{digest}-parglare{parglare.version.__version__}"
+
+
+def get_grammar(package, grammar_file: str, debug_grammar: bool = False) -> tuple[str, Grammar]:
+    """
+    Loads a grammar once per process. Debugged grammars are always rebuilt so that debugging output is printed
+    :param package: the package holding the grammar resource
+    :param grammar_file: name of the .pg file in the package
+    :param debug_grammar: prints grammar debugging information
+    :return: the key of the grammar and the grammar
+    """
+    grammar_path = importlib_resources.files(package).joinpath(grammar_file)
+    key = grammar_key(grammar_path)
+    if debug_grammar:
+        return key, Grammar.from_file(grammar_path, debug=True, ignore_case=True)
+    if key not in _grammars:
+        _grammars[key] = Grammar.from_file(grammar_path, ignore_case=True)
+    return key, _grammars[key]
+
+
+def get_table(key: str, grammar: Grammar):
+    """
+    Loads the LR table of a grammar from memory, then from the disk cache, and otherwise computes and stores it
+    :param key: the key of the grammar
+    :param grammar: the grammar to build the table for
+    :return: the LR table of the grammar
+    """
+    if id(grammar) in _tables:
+        return _tables[id(grammar)]
+    table_path = os.path.join(cache_directory(), f"{key}.pgt")
+    table = None
+    if os.path.exists(table_path):
+        try:
+            table = load_table(table_path, grammar)
+        except (OSError, ValueError, KeyError):  # corrupt or incompatible table, rebuild it
+            table = None
+    if table is None:
+        table = create_table(grammar, itemset_type=LR_1, prefer_shifts=True, prefer_shifts_over_empty=True, lexical_disambiguation=True)
+        _write_table(table_path, table)
+    if key in _grammars and _grammars[key] is grammar:  # only cache tables for grammars that live for the whole process
+        _tables[id(grammar)] = table
+    return table
+
+
+def _write_table(table_path: str, table):
+    """
+    Writes the table to a temporary file and moves it into place so concurrent processes never read a partial table
+    :param table_path: location of the cached table
+    :param table: the table to save
+    """
+    try:
+        os.makedirs(os.path.dirname(table_path), exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(table_path), suffix=".tmp")
+        os.close(file_descriptor)
+        save_table(temp_path, table)
+        os.replace(temp_path, table_path)
+    except OSError:  # cache is an optimization, an unwritable cache directory is not an error
+        pass
+
+
+def get_parser(package, grammar_file: str, actions: dict, debug_grammar: bool = False, debug_parser: bool = False, debug_parser_layout: bool = False,
+               ws: str = '\n\r\t ') -> Parser:
+    """
+    Parsers without debugging are shared across the process. Debugging parsers are rebuilt from the cached table
+    :param package: the package holding the grammar resource
+    :param grammar_file: name of the .pg file in the package
+    :param actions: parglare actions for the grammar
+    :param debug_grammar: prints grammar debugging information
+    :param debug_parser: prints parser debugging information
+    :param debug_parser_layout: prints layout parser debugging information
+    :param ws: characters skipped as whitespace between tokens
+    :return: a parser for the grammar
+    """
+    key, grammar = get_grammar(package, grammar_file, debug_grammar)
+    debugging = debug_grammar or debug_parser or debug_parser_layout
+    parser_key = f"{key}:{ws!r}"
+    if not debugging and parser_key in _parsers:
+        return _parsers[parser_key]
+    parser = Parser(grammar, debug=debug_parser, debug_layout=debug_parser_layout, actions=actions, table=get_table(key, grammar), ws=ws)
+    if not debugging:
+        _parsers[parser_key] = parser
+    return parser
+
+
+def clear_memory_cache():
+    """
+        Drops the process-wide grammars, tables, and parsers. The disk cache is kept
+    """
+    _grammars.clear()
+    _tables.clear()
+    _parsers.clear()
@@ -1,4 +1,6 @@
 """The graph structure used to represent knitted objects"""
+from array import array
+
 import networkx
 
 from knit_script.knit_graphs.Loop import Loop
@@ -14,6 +16,7 @@ class Course:
     def __init__(self):
         self.loops_by_id_in_order: list[int] = []
         self.loops_by_id: dict[int, Loop] = {}
+        self._indices: dict[int, int] | None = {}  # index of each loop id in the course, None after a loop is inserted before the end
 
     def add_loop(self, loop: Loop, index: int | None = None):
         """
@@ -25,22 +28,39 @@ class Course:
             assert parent_loop not in self, f"{loop} has parent {parent_loop}, cannot be added to same course"
         self.loops_by_id[loop.loop_id] = loop
         if index is None:
+            if self._indices is not None:
+                self._indices[loop.loop_id] = len(self.loops_by_id_in_order)
             self.loops_by_id_in_order.append(loop.loop_id)
         else:
             self.loops_by_id_in_order.insert(index, loop.loop_id)
+            self._indices = None
+
+    def copy(self) -> "Course":
+        """
+        :return: A course with the same loops in the same order that can be changed without changing this course
+        """
+        course = Course()
+        course.loops_by_id_in_order = [*self.loops_by_id_in_order]
+        course.loops_by_id = {**self.loops_by_id}
+        course._indices = None if self._indices is None else {**self._indices}
+        return course
 
     def __getitem__(self, index: int) -> int:
         return self.loops_by_id_in_order[index]
 
     def index(self, loop_id: int | Loop) -> int:
         """
-        Searches for index of given loop_id
+        Looks up the index of given loop_id
         :param loop_id: loop_id or loop to find
         :return: index of the loop_id
         """
         if isinstance(loop_id, Loop):
             loop_id = loop_id.loop_id
-        return self.loops_by_id_in_order.index(loop_id)
+        if self._indices is None:
+            self._indices = {l: i for i, l in enumerate(self.loops_by_id_in_order)}
+        if loop_id not in self._indices:
+            raise ValueError(f"{loop_id} is not in course")
+        return self._indices[loop_id]
 
     def __contains__(self, loop_id: int | Loop) -> bool:
         if isinstance(loop_id, Loop):
@@ -63,37 +83,124 @@ class Course:
 class Knit_Graph:
     """
     A representation of knitted structures as connections between loops on yarns
+    Stitch edges are stored in parallel arrays, with each child loop pointing to its first edge and each edge to the next edge of the same child
+    Loops and stitches recorded by a knitting machine are logged and only added to the graph when the graph is first read
     ...
 
     Attributes
     ----------
     graph : networkx.DiGraph
-        the directed-graph structure of loops pulled through other loops.
+        the directed-graph structure of loops pulled through other loops, built on demand from the stitch edges.
     loops: Dict[int, Loop]
         A map of each unique loop id to its loop
     yarns: Dict[str, Yarn]
          A list of Yarns used in the graph
     """
+    _pull_directions: tuple[Pull_Direction, ...] = tuple(Pull_Direction)
 
     def __init__(self):
-        self.graph: networkx.DiGraph = networkx.DiGraph()
-        self.loops: dict[int, Loop] = {}
-        self.last_loop_id: int = -1
-        self.yarns: dict[str, Yarn] = {}
+        self._loops: dict[int, Loop] = {}
+        self._last_loop_id: int = -1
+        self._yarns: dict[str, Yarn] = {}
+        self._logged_loops: list[Loop] = []  # recorded loops in the order they were made
+        self._logged_parents: array = array("q")  # recorded stitches in the order they were made
+        self._logged_children: array = array("q")
+        self._logged_pull_directions: array = array("b")
+        self._edge_parents: array = array("q")
+        self._edge_children: array = array("q")
+        self._edge_pull_directions: array = array("b")  # index into _pull_directions
+        self._edge_depths: array = array("b")
+        self._edge_offsets: array = array("q")
+        self._next_edges: array = array("q")  # index of the next edge into the same child, -1 for the last edge
+        self._first_edges: array = array("q")  # by child loop id, -1 for loops without parents
+        self._last_edges: array = array("q")  # by child loop id, used to add edges to the end of each child's chain
+        self._child_ids: array = array("q")  # by parent loop id, the first child pulled through the loop or -1
+        self._courses: list[Course] | None = None  # courses found since the graph last changed
+        self._course_positions: tuple[array, array] | None = None
+
+    def record_loops(self, loops: list[Loop]):
+        """
+        Logs loops made on a knitting machine to be added to the graph when the graph is read
+        :param loops: new loops, with ids greater than every loop already in the graph or log
+        """
+        self._logged_loops.extend(loops)
+
+    def record_stitch(self, parent_loop_id: int, child_loop_id: int, pull_direction: Pull_Direction):
+        """
+        Logs a stitch made on a knitting machine to be connected in the graph when the graph is read
+        :param parent_loop_id: the id of the parent loop
+        :param child_loop_id: the id of the recorded loop pulled through the parent
+        :param pull_direction: the direction the child is pulled through the parent
+        """
+        self._logged_parents.append(parent_loop_id)
+        self._logged_children.append(child_loop_id)
+        self._logged_pull_directions.append(self._pull_directions.index(pull_direction))
+
+    def _materialize(self):
+        """
+        Adds the logged loops and stitches to the graph in the order they were recorded
+        """
+        if len(self._logged_loops) == 0 and len(self._logged_parents) == 0:
+            return
+        loops, self._logged_loops = self._logged_loops, []  # cleared first because adding loops reads the graph
+        parents, self._logged_parents = self._logged_parents, array("q")
+        children, self._logged_children = self._logged_children, array("q")
+        pull_directions, self._logged_pull_directions = self._logged_pull_directions, array("b")
+        for loop in loops:
+            loop.yarn.add_loop_to_end(loop_id=loop.loop_id, loop=loop, knit_graph=self)
+        for parent_loop_id, child_loop_id, pull_direction in zip(parents, children, pull_directions):
+            self.connect_loops(parent_loop_id, child_loop_id, self._pull_directions[pull_direction])
+
+    @property
+    def loops(self) -> dict[int, Loop]:
+        """
+        :return: A map of each unique loop id to its loop
+        """
+        self._materialize()
+        return self._loops
+
+    @property
+    def yarns(self) -> dict[str, Yarn]:
+        """
+        :return: The yarns used in the graph by their ids
+        """
+        self._materialize()
+        return self._yarns
+
+    @property
+    def last_loop_id(self) -> int:
+        """
+        :return: The largest loop id in the graph or -1 if the graph is empty
+        """
+        self._materialize()
+        return self._last_loop_id
+
+    def _extend_loop_columns(self, loop_id: int):
+        """
+        Grows the columns indexed by loop id to include the given loop id
+        :param loop_id: the largest loop id in the graph
+        """
+        missing = loop_id + 1 - len(self._first_edges)
+        if missing > 0:
+            empty = array("q", [-1]) * missing
+            self._first_edges.extend(empty)
+            self._last_edges.extend(empty)
+            self._child_ids.extend(empty)
 
     def add_loop(self, loop: Loop):
         """
         Adds a loop to the graph
         :param loop: the loop to be added in as a node in the graph
         """
-        self.graph.add_node(loop.loop_id, loop=loop)
+        self._extend_loop_columns(loop.loop_id)
+        self._clear_courses()
         if loop.yarn not in self.yarns:
             self.add_yarn(loop.yarn)
         if loop not in self.yarns[loop.yarn.yarn_id]:  # make sure the loop is on the yarn specified
             self.yarns[loop.yarn].add_loop_to_end(loop_id=None, loop=loop, knit_graph=self)
-        if loop.loop_id > self.last_loop_id:
-            self.last_loop_id = loop.loop_id
-        self.loops[loop.loop_id] = loop
+        if loop.loop_id > self._last_loop_id:
+            self._last_loop_id = loop.loop_id
+        self._loops[loop.loop_id] = loop
 
     def add_yarn(self, yarn: Yarn):
         """
@@ -102,6 +209,39 @@ class Knit_Graph:
         """
         self.yarns[yarn.yarn_id] = yarn
 
+    def remove_loops_after(self, last_loop_id: int):
+        """
+        Removes the loops with ids greater than the given id from the graph and from their yarns.
+        Yarns left without loops are removed from the graph
+        :param last_loop_id: the id of the last loop to keep
+        """
+        self._clear_courses()
+        while len(self._logged_loops) > 0 and self._logged_loops[-1].loop_id > last_loop_id:  # logged loops have not been added to their yarns
+            self._logged_loops.pop()
+        while len(self._logged_children) > 0 and self._logged_children[-1] > last_loop_id:
+            for column in [self._logged_parents, self._logged_children, self._logged_pull_directions]:
+                column.pop()
+        # loops are connected to their parents when they are made, so the stitch edges of the removed loops are at the end of the edge arrays
+        while len(self._edge_children) > 0 and self._edge_children[-1] > last_loop_id:
+            parent_id = self._edge_parents.pop()
+            child_id = self._edge_children.pop()
+            if self._child_ids[parent_id] == child_id:
+                self._child_ids[parent_id] = -1
+            for column in [self._edge_pull_directions, self._edge_depths, self._edge_offsets, self._next_edges]:
+                column.pop()
+        emptied_yarns = set()
+        for loop_id in range(self._last_loop_id, last_loop_id, -1):  # remove the newest loops first so the end of each yarn moves back
+            loop = self._loops.pop(loop_id, None)
+            if loop is not None:
+                self._first_edges[loop_id] = -1
+                self._last_edges[loop_id] = -1
+                loop.yarn.remove_loop(loop_id)
+                if len(loop.yarn) == 0:
+                    emptied_yarns.add(loop.yarn.yarn_id)
+        for yarn_id in emptied_yarns:
+            del self._yarns[yarn_id]
+        self._last_loop_id = min(self._last_loop_id, last_loop_id)
+
     def connect_loops(self, parent_loop_id: int, child_loop_id: int,
                       pull_direction: Pull_Direction = Pull_Direction.BtF,
                       stack_position: int | None = None, depth: int = 0, parent_offset: int = 0):
@@ -116,30 +256,127 @@ class Knit_Graph:
         """
         assert parent_loop_id in self, f"parent loop {parent_loop_id} is not in this graph"
         assert child_loop_id in self, f"child loop {child_loop_id} is not in this graph"
-        self.graph.add_edge(parent_loop_id, child_loop_id, pull_direction=pull_direction, depth=depth, parent_offset=parent_offset)
+        self._clear_courses()
+        edge = self._find_edge(parent_loop_id, child_loop_id)
+        if edge is None:
+            edge = len(self._edge_parents)
+            self._edge_parents.append(parent_loop_id)
+            self._edge_children.append(child_loop_id)
+            self._edge_pull_directions.append(0)
+            self._edge_depths.append(0)
+            self._edge_offsets.append(0)
+            self._next_edges.append(-1)
+            if self._first_edges[child_loop_id] == -1:
+                self._first_edges[child_loop_id] = edge
+            else:
+                self._next_edges[self._last_edges[child_loop_id]] = edge
+            self._last_edges[child_loop_id] = edge
+            if self._child_ids[parent_loop_id] == -1:
+                self._child_ids[parent_loop_id] = child_loop_id
+        self._edge_pull_directions[edge] = self._pull_directions.index(pull_direction)
+        self._edge_depths[edge] = depth
+        self._edge_offsets[edge] = parent_offset
         child_loop = self[child_loop_id]
         parent_loop = self[parent_loop_id]
         child_loop.add_parent_loop(parent_loop, stack_position)
 
+    def _edges_into(self, child_loop_id: int):
+        """
+        :param child_loop_id: id of a loop in the graph
+        :return: iterator over the indices of the stitch edges from the parents of the loop in the order they were connected
+        """
+        edge = self._first_edges[child_loop_id]
+        while edge != -1:
+            yield edge
+            edge = self._next_edges[edge]
+
+    def _find_edge(self, parent_loop_id: int, child_loop_id: int) -> int | None:
+        """
+        :param parent_loop_id: id of the parent loop
+        :param child_loop_id: id of the child loop
+        :return: index of the stitch edge between the loops or None if they are not connected
+        """
+        for edge in self._edges_into(child_loop_id):
+            if self._edge_parents[edge] == parent_loop_id:
+                return edge
+        return None
+
+    def _edge_data(self, edge: int) -> dict:
+        """
+        :param edge: index of a stitch edge
+        :return: the properties of the stitch edge
+        """
+        return {"pull_direction": self._pull_directions[self._edge_pull_directions[edge]], "depth": self._edge_depths[edge], "parent_offset": self._edge_offsets[edge]}
+
+    def parent_ids(self, child_loop_id: int) -> list[int]:
+        """
+        :param child_loop_id: id of a loop in the graph
+        :return: ids of the loops the loop is pulled through in the order they were connected
+        """
+        self._materialize()
+        return [self._edge_parents[edge] for edge in self._edges_into(child_loop_id)]
+
+    @property
+    def graph(self) -> networkx.DiGraph:
+        """
+        :return: A directed graph of loops pulled through other loops, built from the stitch edges each time it is requested
+        """
+        graph = networkx.DiGraph()
+        graph.add_nodes_from((loop_id, {"loop": loop}) for loop_id, loop in self.loops.items())
+        graph.add_edges_from((self._edge_parents[edge], self._edge_children[edge], self._edge_data(edge)) for edge in range(len(self._edge_parents)))
+        return graph
+
+    def _clear_courses(self):
+        """
+        Forgets the courses found before the graph changed
+        """
+        self._courses = None
+        self._course_positions = None
+
     def get_courses(self) -> list[Course]:
         """
         :return: A dictionary of loop_ids to the course they are on,
         a dictionary or course ids to the loops on that course in the order of creation.
         The first set of loops in the graph is on course 0.
         A course change occurs when a loop has a parent loop that is in the last course.
+        The courses are found once and reused until the graph changes. Callers get copies, so changing a returned course does not change the graph's courses.
         """
-        courses = []
-        course = Course()
-        for loop_id in sorted([*self.graph.nodes]):
-            loop = self[loop_id]
-            for parent_id in self.graph.predecessors(loop_id):
-                if parent_id in course:
-                    courses.append(course)
-                    course = Course()
-                    break
-            course.add_loop(loop)
-        courses.append(course)
-        return courses
+        return [course.copy() for course in self._find_courses()]
+
+    def _find_courses(self) -> list[Course]:
+        """
+        :return: The courses of the graph, found once and shared until the graph changes. Must not be changed
+        """
+        self._materialize()
+        if self._courses is None:
+            courses = []
+            course = Course()
+            for loop_id in sorted(self._loops):
+                loop = self._loops[loop_id]
+                for parent_id in self.parent_ids(loop_id):
+                    if parent_id in course:
+                        courses.append(course)
+                        course = Course()
+                        break
+                course.add_loop(loop)
+            courses.append(course)
+            self._courses = courses
+        return self._courses
+
+    def course_positions(self) -> tuple[array, array]:
+        """
+        :return: Two arrays indexed by loop id: the course of each loop and the index of each loop in its course. Both are -1 for ids not in the graph
+        """
+        courses = self._find_courses()
+        if self._course_positions is None:
+            course_numbers = array("q", [-1]) * len(self._first_edges)
+            course_indices = array("q", [-1]) * len(self._first_edges)
+            for course_number, course in enumerate(courses):
+                for index, loop_id in enumerate(course):
+                    course_numbers[loop_id] = course_number
+                    course_indices[loop_id] = index
+            self._course_positions = course_numbers, course_indices
+        return self._course_positions
 
     def __contains__(self, item):
         """
@@ -148,9 +385,9 @@ class Knit_Graph:
         :return: true if the loop_id of item or the loop is in the graph
         """
         if type(item) is int:
-            return self.graph.has_node(item)
+            return item in self.loops
         elif isinstance(item, Loop):
-            return self.graph.has_node(item.loop_id)
+            return item.loop_id in self.loops
         else:
             return False
 
@@ -163,7 +400,7 @@ class Knit_Graph:
         if item not in self:
             raise AttributeError
         else:
-            return self.graph.nodes[item]["loop"]
+            return self.loops[item]
 
     def get_stitch_edge(self, parent: Loop | int, child: Loop | int, stitch_property: str | None = None):
         """
@@ -179,11 +416,12 @@ class Knit_Graph:
         child_id = child
         if isinstance(child, Loop):
             child_id = child.loop_id
-        if self.graph.has_edge(parent_id, child_id):
+        edge = self._find_edge(parent_id, child_id) if child_id in self else None
+        if edge is not None:
             if stitch_property is not None:
-                return self.graph[parent_id][child_id][stitch_property]
+                return self._edge_data(edge)[stitch_property]
             else:
-                return self.graph[parent_id][child_id]
+                return self._edge_data(edge)
         else:
             return None
 
@@ -194,7 +432,8 @@ class Knit_Graph:
         """
         if isinstance(loop_id, Loop):
             loop_id = loop_id.loop_id
-        successors = [*self.graph.successors(loop_id)]
-        if len(successors) == 0:
+        self._materialize()
+        child_id = self._child_ids[loop_id]
+        if child_id == -1:
             return None
-        return successors[0]
+        return child_id
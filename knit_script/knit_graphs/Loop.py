@@ -24,6 +24,8 @@ class Loop:
     layer: int
         The position of this loop relative to other layers
     """
+    __slots__ = ("_holding_needle", "instructions", "creating_instruction", "_is_twisted", "_loop_id", "yarn", "parent_loops", "layer")
+
     #Todo add needle stacking edges to knitgraph structure
     def __init__(self, loop_id: int, yarn, layer: int = 0, is_twisted: bool = False, holding_needle=None):
         """
@@ -34,7 +36,7 @@ class Loop:
         :param is_twisted: True if the loop should be twisted
             (created by pulling a carrier backwards across the needle)
         """
-        self._holding_needle = holding_needle
+        self._holding_needle = None
         self.instructions: List[Instruction] = []
         self.creating_instruction: Optional[Instruction] = None
         self.is_twisted: bool = is_twisted
@@ -43,18 +45,25 @@ class Loop:
         self.yarn = yarn
         self.parent_loops: List[Loop] = []
         self.layer: int = layer
+        self.put_on_needle(holding_needle)
 
     def put_on_needle(self, needle):
         """
         :param needle: Needle that now holds the loop
         """
+        was_on_needle = self._holding_needle is not None
         self._holding_needle = needle
+        if self.yarn is not None and was_on_needle != (needle is not None):  # index loops on needles by yarn
+            if needle is None:
+                self.yarn.loop_dropped(self)
+            else:
+                self.yarn.loop_put_on_needle(self)
 
     def drop_from_needle(self):
         """
         Drop loop from holding needle
         """
-        self._holding_needle = None
+        self.put_on_needle(None)
 
     @property
     def holding_needle(self):
@@ -98,7 +107,7 @@ class Loop:
         :return: the id of the loop that comes before this in the knitgraph
         """
         prior_id = self.loop_id - 1
-        if knitGraph.graph.has_node(prior_id):
+        if prior_id in knitGraph:
             return prior_id
         else:
             return None
@@ -109,7 +118,7 @@ class Loop:
         :return: the id of the loop that comes after this in the knitgraph
         """
         next_id = self.loop_id + 1
-        if knitGraph.graph.has_node(next_id):
+        if next_id in knitGraph:
             return next_id
         else:
             return None
@@ -1,6 +1,7 @@
 """
 The Yarn Data Structure
 """
+from array import array
 from typing import Optional, Tuple, List, Dict
 
 import networkx as networkx
@@ -12,15 +13,17 @@ from knit_script.knitting_machine.machine_components.needles import Needle
 class Yarn:
     """
     A class to represent a yarn structure.
-    Yarns are structured as a list of loops with a pointer to the last loop id
+    Yarns are structured as an array of loop ids in order along the yarn with a pointer to the last loop id
     ...
 
     Attributes
     ----------
     yarn_graph: networkx.DiGraph
-        A directed graph structure (always a list) of loops on the yarn
+        A directed graph structure (always a list) of loops on the yarn, built on demand from the sequence of loop ids
     last_loop_id: Optional[int]
         The id of the last loop on the yarn, none if no loops on the yarn
+    on_needle_loops: Dict[int, Loop]
+        The loops made with this yarn that are held on needles keyed by loop id, including loops that are not in the yarn graph
     """
 
     def __init__(self, yarn_id: str, last_loop: Optional[Loop] = None,
@@ -33,12 +36,15 @@ class Yarn:
         self.color = color
         self.plies = plies
         self.size = size
-        self.yarn_graph: networkx.DiGraph = networkx.DiGraph()
+        self._loop_ids: array = array("q")  # the ids of the loops in order along the yarn
+        self._loops: Dict[int, Loop] = {}
         if last_loop is None:
             self.last_loop_id = None
         else:
             self.last_loop_id: int = last_loop.loop_id
         self._yarn_id: str = yarn_id
+        self.on_needle_loops: Dict[int, Loop] = {}
+        self._last_on_needle_loop: Optional[Loop] = None  # None when no loops are on needles or the last loop must be found again
 
     @staticmethod
     def yarn_by_type(color: str, last_loop: Optional[Loop] = None,
@@ -66,16 +72,38 @@ class Yarn:
         return str(self)
 
     def __len__(self):
-        return len(self.yarn_graph.nodes)
+        return len(self._loop_ids)
+
+    def loop_put_on_needle(self, loop: Loop):
+        """
+        Records that a loop on this yarn is now held on a needle
+        :param loop: the loop that was off the needles
+        """
+        self.on_needle_loops[loop.loop_id] = loop
+        if self._last_on_needle_loop is not None and loop.loop_id > self._last_on_needle_loop.loop_id:
+            self._last_on_needle_loop = loop
+        elif len(self.on_needle_loops) == 1:
+            self._last_on_needle_loop = loop
+
+    def loop_dropped(self, loop: Loop):
+        """
+        Records that a loop on this yarn is no longer held on a needle
+        :param loop: the loop that was on a needle
+        """
+        del self.on_needle_loops[loop.loop_id]
+        if self._last_on_needle_loop is loop:
+            self._last_on_needle_loop = None
 
     def last_needle(self) -> Optional[Needle]:
         """
         :return: The needle that holds the loop closest to the end of the yarn or None if the yarn has been dropped entirely
         """
-        for loop in reversed(self):
-            if loop.on_needle:
-                return loop.holding_needle
-        return None
+        if self._last_on_needle_loop is None:
+            if len(self.on_needle_loops) == 0:
+                return None
+            # only the loops still on needles are searched, which is bounded by the needles on the machine
+            self._last_on_needle_loop = self.on_needle_loops[max(self.on_needle_loops)]
+        return self._last_on_needle_loop.holding_needle
 
     def add_loop_to_end(self, loop_id: int = None, loop: Optional[Loop] = None, is_twisted: bool = False, knit_graph=None) -> Tuple[int, Loop]:
         """
@@ -113,24 +141,54 @@ class Yarn:
 
         if loop is None:  # create a loop from default information
             loop = Loop(loop_id, self, layer=layer, is_twisted=is_twisted)
-        self.yarn_graph.add_node(loop_id, loop=loop)
+        if loop_id in self._loops:  # re-adding a loop moves it to its new position
+            self._remove_loop_id(loop_id)
+        self._loops[loop_id] = loop
         if knit_graph is not None:
             knit_graph.add_loop(loop)
-        if neighbor_loop_id is not None:
-            if insert_after:
-                for next_neighbor_id in [*self.yarn_graph.successors(neighbor_loop_id)]:
-                    self.yarn_graph.remove_edge(neighbor_loop_id, next_neighbor_id)
-                    self.yarn_graph.add_edge(loop_id, next_neighbor_id)
-                self.yarn_graph.add_edge(neighbor_loop_id, loop_id)
+        if neighbor_loop_id is None or neighbor_loop_id not in self._loops:  # the yarn starts with this loop
+            if insert_after or len(self._loop_ids) == 0:
+                self._loop_ids.append(loop_id)
             else:
-                for prior_neighbor_id in [*self.yarn_graph.predecessors(neighbor_loop_id)]:
-                    self.yarn_graph.remove_edge(prior_neighbor_id, neighbor_loop_id)
-                    self.yarn_graph.add_edge(prior_neighbor_id, loop_id)
-                self.yarn_graph.add_edge(loop_id, neighbor_loop_id)
-        if len([*self.yarn_graph.successors(loop_id)]) == 0:
+                self._loop_ids.insert(0, loop_id)
+        elif insert_after and neighbor_loop_id == self._loop_ids[-1]:  # the common case of adding to the end of the yarn
+            self._loop_ids.append(loop_id)
+        else:
+            self._loop_ids.insert(self._loop_ids.index(neighbor_loop_id) + (1 if insert_after else 0), loop_id)
+        if self._loop_ids[-1] == loop_id:
             self.last_loop_id = loop_id
         return loop_id, loop
 
+    def _remove_loop_id(self, loop_id: int):
+        """
+        Removes the loop id from the sequence of loops on the yarn
+        :param loop_id: the id of a loop on the yarn
+        """
+        if self._loop_ids[-1] == loop_id:  # loops are usually removed from the end of the yarn
+            self._loop_ids.pop()
+        else:
+            self._loop_ids.remove(loop_id)
+
+    def remove_loop(self, loop_id: int):
+        """
+        Removes the loop from the yarn and connects the loops on either side of it
+        :param loop_id: the id of the loop to remove
+        """
+        del self._loops[loop_id]
+        self._remove_loop_id(loop_id)
+        if self.last_loop_id == loop_id:
+            self.last_loop_id = self._loop_ids[-1] if len(self._loop_ids) > 0 else None
+
+    @property
+    def yarn_graph(self) -> networkx.DiGraph:
+        """
+        :return: A directed graph of the loops on the yarn, built from the sequence of loops each time it is requested
+        """
+        yarn_graph = networkx.DiGraph()
+        yarn_graph.add_nodes_from((loop_id, {"loop": self._loops[loop_id]}) for loop_id in self._loop_ids)
+        yarn_graph.add_edges_from(zip(self._loop_ids, self._loop_ids[1:]))
+        return yarn_graph
+
     def __contains__(self, item):
         """
         Return true if the loop is on the yarn
@@ -138,14 +196,17 @@ class Yarn:
         :return: true if the loop_id of item or the loop is in the yarn
         """
         if type(item) is int:
-            return self.yarn_graph.has_node(item)
+            return item in self._loops
         elif isinstance(item, Loop):
-            return self.yarn_graph.has_node(item.loop_id)
+            return item.loop_id in self._loops
         else:
             return False
 
     def __iter__(self):
-        return iter(self.yarn_graph)
+        return iter(self._loop_ids)
+
+    def __reversed__(self):
+        return reversed(self._loop_ids)
 
     def __getitem__(self, item: int) -> Loop:
         """
@@ -153,10 +214,10 @@ class Yarn:
         :param item: the loop_id being checked for in the yarn
         :return: the Loop on the yarn with the matching id
         """
-        if item not in self:
+        if item not in self._loops:
             raise AttributeError
         else:
-            return self.yarn_graph.nodes[item].loop
+            return self._loops[item]
 
     def cut_yarn(self):
         """
@@ -7,9 +7,12 @@ from knit_script.knit_graphs.Pull_Direction import Pull_Direction
 
 
 # visualization for non-tube/sheets
-def visualize_sheet(knit_graph: Knit_Graph, file_name: str = "knit_graph.png", start_course=1):
+def visualize_sheet(knit_graph: Knit_Graph, file_name: str = "knit_graph.png", start_course=1, max_figure_inches: int = 600, detailed: bool | None = None):
     """
     Runs a html file in browser to visualize the given knitgraph
+    :param detailed: If true, edges are drawn as arrows and loops are labelled with their ids.
+        If false, edges are drawn as lines without labels, which is much faster for large swatches. If None, swatches of up to 100 courses are detailed
+    :param max_figure_inches: the largest width and height of the figure. Wider or taller swatches are drawn smaller
     :param start_course: The course to start visualizing from
     :param file_name: name to save the figure to
     :param knit_graph: the knit graph to visualize
@@ -18,12 +21,8 @@ def visualize_sheet(knit_graph: Knit_Graph, file_name: str = "knit_graph.png", s
     stitch_styles = {Pull_Direction.BtF: "solid", Pull_Direction.FtB: ':'}
 
     courses: list[Course] = knit_graph.get_courses()
-    loop_ids_to_course: dict[int, int] = {}
-    loop_ids_to_index_in_course: dict[int, int] = {}
-    for r, course in enumerate(courses):
-        for loop_id in course:
-            loop_ids_to_course[loop_id] = r
-            loop_ids_to_index_in_course[loop_id] = course.index(loop_id)
+    graph = knit_graph.graph  # the knit graph builds this on each request
+    loop_ids_to_course, loop_ids_to_index_in_course = knit_graph.course_positions()
     loop_id_to_x_position: dict[int, float] = {}
     loop_id_to_y_position: dict[int, float] = {}
     loop_id_to_color_property: dict[int, str] = {}
@@ -39,7 +38,7 @@ def visualize_sheet(knit_graph: Knit_Graph, file_name: str = "knit_graph.png", s
             for loop_id in course:
                 loop = knit_graph[loop_id]
                 y = r * standard_height_between_courses
-                parent_ids = [*knit_graph.graph.predecessors(loop_id)]
+                parent_ids = [*graph.predecessors(loop_id)]
                 if r == start_course:  # place first course
                     if rightward:
                         x = loop_ids_to_index_in_course[loop_id] * standard_width_between_loops
@@ -51,9 +50,12 @@ def visualize_sheet(knit_graph: Knit_Graph, file_name: str = "knit_graph.png", s
                     # parent_average = parent_sum / float(len(parent_ids))
                     # x = parent_average
                     dominant_parent = loop.parent_loops[-1].loop_id
-                    parent_offset = knit_graph.graph[dominant_parent][loop_id]['parent_offset']
+                    parent_offset = graph[dominant_parent][loop_id]['parent_offset']
                     if parent_offset != 0:
-                        placement_parent_course_index = courses[r - 1].index(dominant_parent)
+                        if loop_ids_to_course[dominant_parent] == r - 1:
+                            placement_parent_course_index = loop_ids_to_index_in_course[dominant_parent]
+                        else:  # parent is not on the prior course
+                            placement_parent_course_index = courses[r - 1].index(dominant_parent)
                         placement_index = placement_parent_course_index + parent_offset
                         placement_loop = courses[r - 1][placement_index]
                     else:
@@ -64,7 +66,7 @@ def visualize_sheet(knit_graph: Knit_Graph, file_name: str = "knit_graph.png", s
                 # store node position and color property
                 loop_id_to_x_position[loop_id] = x
                 loop_id_to_y_position[loop_id] = y
-                loop_id_to_color_property[loop_id] = knit_graph.graph.nodes[loop_id]["loop"].yarn.color
+                loop_id_to_color_property[loop_id] = graph.nodes[loop_id]["loop"].yarn.color
 
             unplaced = []
             for loop_id in course:
@@ -96,22 +98,22 @@ def visualize_sheet(knit_graph: Knit_Graph, file_name: str = "knit_graph.png", s
             if not (prior_loop_node_id in loop_id_to_x_position and next_loop_node_id in loop_id_to_x_position):
                 continue
             edge_color_property[(prior_loop_node_id, next_loop_node_id)] = {}
-            edge_color_property[(prior_loop_node_id, next_loop_node_id)]['color'] = knit_graph.graph.nodes[next_loop_node_id]["loop"].yarn.color
+            edge_color_property[(prior_loop_node_id, next_loop_node_id)]['color'] = graph.nodes[next_loop_node_id]["loop"].yarn.color
             edge_style_property[(prior_loop_node_id, next_loop_node_id)] = '--'
             edge_width_property[(prior_loop_node_id, next_loop_node_id)] = 2.0
             edge_alpha_property[(prior_loop_node_id, next_loop_node_id)] = 1.0
 
     # add stitch edges and create edge labels
-    for parent_loop_id, child_loop_id in knit_graph.graph.edges:
+    for parent_loop_id, child_loop_id in graph.edges:
         if not (parent_loop_id in loop_id_to_x_position and child_loop_id in loop_id_to_x_position):
             continue
         edge_color_property[(parent_loop_id, child_loop_id)] = {}
-        pull_direction = knit_graph.graph[parent_loop_id][child_loop_id]["pull_direction"]
+        pull_direction = graph[parent_loop_id][child_loop_id]["pull_direction"]
         stitch_labels[(parent_loop_id, child_loop_id)] = str(pull_direction)[0]
         edge_style_property[(parent_loop_id, child_loop_id)] = stitch_styles[pull_direction]
         edge_width_property[(parent_loop_id, child_loop_id)] = 4.0
-        edge_color_property[(parent_loop_id, child_loop_id)]['color'] = knit_graph.graph.nodes[parent_loop_id]["loop"].yarn.color
-        stitch_depth = knit_graph.graph[parent_loop_id][child_loop_id]["depth"]
+        edge_color_property[(parent_loop_id, child_loop_id)]['color'] = graph.nodes[parent_loop_id]["loop"].yarn.color
+        stitch_depth = graph[parent_loop_id][child_loop_id]["depth"]
         if stitch_depth == 0:
             edge_alpha_property[(parent_loop_id, child_loop_id)] = 0.75
         elif stitch_depth < 0:
@@ -126,18 +128,26 @@ def visualize_sheet(knit_graph: Knit_Graph, file_name: str = "knit_graph.png", s
     # add nodes
     viz_graph.add_nodes_from(pos.keys())
 
-    plt.figure(1, figsize=(len(courses[0]), len(courses)))
+    # matplotlib cannot save figures over 2^16 pixels on a side
+    plt.figure(1, figsize=(min(len(courses[0]), max_figure_inches), min(len(courses), max_figure_inches)))
     # draw nodes
-    for loop_id in viz_graph.nodes():
-        nx.draw_networkx_nodes(viz_graph, pos, nodelist=[loop_id], node_color=loop_id_to_color_property[loop_id])
-    # draw edges
-    for edge in [*edge_color_property.keys()]:
-        nx.draw_networkx_edges(viz_graph, pos, edgelist=[edge],
-                               width=edge_width_property[edge], edge_color=edge_color_property[edge]['color'], style=edge_style_property[edge], alpha=edge_alpha_property[edge])
+    node_list = [*viz_graph.nodes()]
+    nx.draw_networkx_nodes(viz_graph, pos, nodelist=node_list, node_color=[loop_id_to_color_property[loop_id] for loop_id in node_list])
+    # draw edges, batched by the properties that are drawn once per call
+    if detailed is None:
+        detailed = len(courses) <= 100
+    edge_batches: dict[tuple[str, float], list[tuple[int, int]]] = {}
+    for edge in edge_color_property:
+        edge_batches.setdefault((edge_style_property[edge], edge_alpha_property[edge]), []).append(edge)
+    for (style, alpha), edges in edge_batches.items():
+        nx.draw_networkx_edges(viz_graph, pos, edgelist=edges, width=[edge_width_property[edge] for edge in edges],
+                               edge_color=[edge_color_property[edge]['color'] for edge in edges], style=style, alpha=alpha,
+                               arrows=detailed)
     # draw node labels
-    node_labels = {x: x for x in viz_graph.nodes}
+    if detailed:
+        node_labels = {x: x for x in viz_graph.nodes}
 
-    nx.draw_networkx_labels(viz_graph, pos, labels=node_labels, font_size=10, font_color='w')
+        nx.draw_networkx_labels(viz_graph, pos, labels=node_labels, font_size=10, font_color='w')
     # draw edge labels
     # nx.draw_networkx_edge_labels(viz_graph, pos, edge_labels=stitch_labels, label_pos=0.5, font_size=10, font_color='k', rotate=False)
     plt.savefig(file_name)
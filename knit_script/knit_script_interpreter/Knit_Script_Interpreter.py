@@ -6,6 +6,7 @@ from typing import Any
 from knit_script.knit_graphs.Knit_Graph import Knit_Graph
 from knit_script.knit_script_interpreter.Knit_Script_Parser import Knit_Script_Parser
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
+from knit_script.knit_script_interpreter.module_cache import parsed_modules, Statement_Disk_Cache
 from knit_script.knitout_compilers.compile_knitout import knitout_to_dat
 from knit_script.knitout_interpreter.Knitout_Interpreter import Knitout_Interpreter
 from knit_script.knitout_interpreter.Knitout_Optimizer import Knitout_Optimizer
@@ -20,20 +21,24 @@ class Knit_Script_Interpreter:
     """
 
     def __init__(self, debug_grammar: bool = False, debug_parser: bool = False, debug_parser_layout: bool = False,
-                 context: Knit_Script_Context | None = None, starting_variables: dict[str, Any] | None = None):
+                 context: Knit_Script_Context | None = None, starting_variables: dict[str, Any] | None = None, compile_statements: bool = True,
+                 statement_cache: Statement_Disk_Cache | None = None):
         """
         Instantiate
         :param context:
+        :param compile_statements: If true, parsed statements are compiled to functions before execution. Otherwise, they are executed by walking the statement tree
+        :param statement_cache: If given, parsed programs and modules are stored in and loaded from this on-disk cache
         :param debug_grammar: Will provide full parglare output for grammar states
         :param debug_parser: Will provide full parglare output for parsed file shift reduce status
         :param debug_parser_layout: Will provide layout information from parser
         """
-        self._parser: Knit_Script_Parser = Knit_Script_Parser(debug_grammar, debug_parser, debug_parser_layout)
+        self._parser: Knit_Script_Parser = Knit_Script_Parser(debug_grammar, debug_parser, debug_parser_layout, statement_cache)
         if context is None:
-            self._knit_pass_context: Knit_Script_Context = Knit_Script_Context(parser=self._parser)
+            self._knit_pass_context: Knit_Script_Context = Knit_Script_Context(parser=self._parser, compiles_statements=compile_statements)
         else:
             self._knit_pass_context: Knit_Script_Context = context
             self._knit_pass_context.parser = self._parser
+            self._knit_pass_context.compiles_statements = compile_statements
         self._add_variables(starting_variables)
 
     def _add_variables(self, python_variables: dict[str, Any] | None):
@@ -62,9 +67,16 @@ class Knit_Script_Interpreter:
         Resets the context of the knit_script_interpreter to a starting state with no set variables or operations on the machine
         """
         header = self._knit_pass_context.header
-        self._knit_pass_context = Knit_Script_Context(parser=self._parser)
+        self._knit_pass_context = Knit_Script_Context(parser=self._parser, compiles_statements=self._knit_pass_context.compiles_statements)
         self._knit_pass_context.header = header  # resets machine state as well
 
+    @staticmethod
+    def import_cache_info() -> dict[str, int]:
+        """
+        :return: hits and misses of the process-wide cache of parsed knit script files and of the modules reused within a program
+        """
+        return parsed_modules.info()
+
     def parse(self, pattern: str, pattern_is_file: bool = False) -> list:
         """
         Executes the parsing code for the parglare parser
@@ -84,7 +96,7 @@ class Knit_Script_Interpreter:
         out_file_name: the output file name
         pattern_is_file: true if the pattern is a file name
         :param header_values: Values to update the ehader too
-        :param clean_optimization: If true, deletes intermediate files
+        :param clean_optimization: If true, optimizes without writing intermediate files. Otherwise, keeps the original and organized knitout for debugging
         :param python_variables: values from python to load into the knit script scope
         :param visualize_instruction_graph: If true, generates a visualization of the graph written
         :param optimize:If true, optimizes the knitout output
@@ -107,8 +119,11 @@ class Knit_Script_Interpreter:
         self._knit_pass_context.knitout.extend(self._knit_pass_context.machine_state.carrier_system.cut_all_yarns(self._knit_pass_context.machine_state))
         if optimize:
             try:
-                knitout = self.optimize_knitout(f"_original_{out_file_name}", f"_organized_{out_file_name}",
-                                                visualize=visualize_instruction_graph, clean_original=clean_optimization, clean_organized=clean_optimization)
+                if clean_optimization:  # intermediate files are only written for debugging
+                    knitout = self.optimize_knitout(None, None, visualize=visualize_instruction_graph)
+                else:
+                    knitout = self.optimize_knitout(f"_original_{out_file_name}", f"_organized_{out_file_name}", visualize=visualize_instruction_graph,
+                                                    clean_original=False, clean_organized=False)
             except Exception as e:
                 print(e)
                 knitout = self._knit_pass_context.knitout
@@ -124,21 +139,19 @@ class Knit_Script_Interpreter:
 
     def optimize_knitout(self, original_out_name: str | None, organized_out_name: str | None, visualize: bool = False, clean_original: bool = True, clean_organized: bool = True) -> list[Knitout_Line]:
         """
-        :param clean_organized:
-        :param clean_original:
-        :param visualize:
-        :param original_out_name:
-        :param organized_out_name:
+        Replays the knitout in a new knitout context without writing it as text and reorders it with the optimizer
+        :param clean_organized: If true, deletes the organized knitout file after optimizing
+        :param clean_original: If true, deletes the original knitout file after optimizing
+        :param visualize: If true, shows the instruction graph
+        :param original_out_name: file to write the original knitout to for debugging, or None to skip writing it
+        :param organized_out_name: file to write the organized knitout to for debugging, or None to skip writing it
         :return: knitout instructions with optimized order
         """
-        temp_knitout = ""
-        for k in self._knit_pass_context.knitout:
-            temp_knitout += str(k)
         if original_out_name is not None:
             with open(original_out_name, 'w') as temp:
                 temp.writelines([str(k) for k in self._knit_pass_context.knitout])
         knitout_interpreter = Knitout_Interpreter()
-        organized_knitout = knitout_interpreter.interpret_knitout(temp_knitout, pattern_is_file=False)
+        organized_knitout = knitout_interpreter.interpret_knitout_lines(self._knit_pass_context.knitout)
         if organized_out_name is not None:
             with open(organized_out_name, 'w') as temp:
                 temp.writelines([str(k) for k in organized_knitout])
@@ -146,9 +159,9 @@ class Knit_Script_Interpreter:
         if visualize:
             optimizer.visualize()
         optimized_knitout = optimizer.optimize(visualize=visualize)
-        if clean_original:
+        if clean_original and original_out_name is not None:
             os.remove(original_out_name)
-        if clean_organized:
+        if clean_organized and organized_out_name is not None:
             os.remove(organized_out_name)
         return optimized_knitout
 
@@ -1,9 +1,10 @@
 """Parser code for accessing Parglare language support"""
-import importlib_resources
-from parglare import Parser, Grammar
+from parglare import Parser
 
 import knit_script
+from knit_script.grammar_cache import get_parser
 from knit_script.knit_script_interpreter.knit_script_actions import action
+from knit_script.knit_script_interpreter.module_cache import parsed_modules, Statement_Disk_Cache
 
 
 class Knit_Script_Parser:
@@ -11,20 +12,30 @@ class Knit_Script_Parser:
         Parser for reading knit script files using parglare library
     """
 
-    def __init__(self, debug_grammar: bool = False, debug_parser: bool = False, debug_parser_layout: bool = False):
-
-        pg_resource_stream = importlib_resources.files(knit_script.knit_script_interpreter).joinpath('knit_script.pg')
-        self._grammar: Grammar = Grammar.from_file(pg_resource_stream, debug=debug_grammar, ignore_case=True)
-        self._parser: Parser = Parser(self._grammar, debug=debug_parser, debug_layout=debug_parser_layout, actions=action.all)
+    def __init__(self, debug_grammar: bool = False, debug_parser: bool = False, debug_parser_layout: bool = False, statement_cache: Statement_Disk_Cache | None = None):
+        """
+        Instantiate
+        :param debug_grammar: Will provide full parglare output for grammar states
+        :param debug_parser: Will provide full parglare output for parsed file shift reduce status
+        :param debug_parser_layout: Will provide layout information from parser
+        :param statement_cache: If given, parsed statements are stored in and loaded from this on-disk cache
+        """
+        self._parser: Parser = get_parser(knit_script.knit_script_interpreter, 'knit_script.pg', action.all, debug_grammar, debug_parser, debug_parser_layout)
+        self._debugging: bool = debug_grammar or debug_parser or debug_parser_layout
+        self._statement_cache: Statement_Disk_Cache | None = None if self._debugging else statement_cache
 
     def parse(self, pattern: str, pattern_is_file: bool = False) -> list:
         """
         Executes the parsing code for the parglare parser
         :param pattern: either a file or the knit script string to be parsed
-        :param pattern_is_file: if true, assumes that the pattern is parsed from a file
+        :param pattern_is_file: if true, assumes that the pattern is parsed from a file. Unchanged files are parsed once per process unless debugging
         :return: List of statements parsed from file
         """
         if pattern_is_file:
-            return self._parser.parse_file(pattern)
+            if self._debugging:
+                return self._parser.parse_file(pattern)
+            return parsed_modules.parse_file(self._parser, pattern, self._statement_cache)
+        elif self._statement_cache is not None:
+            return self._statement_cache.parse(self._parser, pattern)
         else:
             return self._parser.parse(pattern)
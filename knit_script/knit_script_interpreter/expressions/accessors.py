@@ -1,5 +1,5 @@
 """Used to access attributes from instances in code"""
-from typing import Any, Union
+from typing import Any, Callable, Union
 
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.expressions.function_expressions import Function_Call
@@ -75,7 +75,47 @@ class Attribute_Accessor_Expression(Expression):
         :param context: The current context of the knit_script_interpreter
         :return: accessed attribute of parent expression
         """
-        parent = self._evaluate_parent(context)
+        return self._access(context, self._evaluate_parent(context))
+
+    def compile(self) -> Callable[[Knit_Script_Context], Any]:
+        """
+        Compiles the parent path once and specializes attribute and method access by the kind of attribute
+        :return: function that evaluates the accessor
+        """
+        if len(self.parent) == 1:
+            evaluate_parent = self.parent[0].compile()
+        else:
+            evaluate_parent = Attribute_Accessor_Expression(self.parser_node, self.parent[:-1], self.parent[-1]).compile()
+        if isinstance(self.attribute, Variable_Expression):
+            attribute_name = self.attribute.variable_name
+
+            def _evaluate(context: Knit_Script_Context) -> Any:
+                attr = getattr(evaluate_parent(context), attribute_name)
+                if isinstance(attr, Expression):
+                    return attr.evaluate(context)
+                return attr
+        elif isinstance(self.attribute, Function_Call):
+            method_call = self.attribute
+            method_name = method_call.func_name.variable_name
+            args = [arg.compile() for arg in method_call.args]
+            kwargs = [(kwarg.variable_name, kwarg.compile_value()) for kwarg in method_call.kwargs]
+
+            def _evaluate(context: Knit_Script_Context) -> Any:
+                attribute = getattr(evaluate_parent(context), method_name)
+                if isinstance(attribute, Function_Signature):
+                    return attribute.execute(context, method_call.args, method_call.kwargs)
+                return attribute(*[arg(context) for arg in args], **{name: value(context) for name, value in kwargs})
+        else:
+            def _evaluate(context: Knit_Script_Context) -> Any:
+                return self._access(context, evaluate_parent(context))
+        return _evaluate
+
+    def _access(self, context: Knit_Script_Context, parent: Any) -> Any:
+        """
+        :param context: The current context of the knit_script_interpreter
+        :param parent: the value of the parent path
+        :return: accessed attribute of the parent value
+        """
         if isinstance(self.attribute, Variable_Expression):  # variable name, access directly from parent instance
             attr = getattr(parent, self.attribute.variable_name)
             if isinstance(attr, Expression):
@@ -1,12 +1,13 @@
 """
 Base class of all expression values
 """
-from typing import Any, List
+from typing import Any, Callable, List
 
 from parglare.parser import LRStackNode
 
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
 from knit_script.knit_script_interpreter.ks_element import KS_Element
+from knit_script.knitting_machine.machine_components.Needle_Range import Needle_Range
 
 
 class Expression(KS_Element):
@@ -22,6 +23,14 @@ class Expression(KS_Element):
         """
         pass
 
+    def compile(self) -> Callable[[Knit_Script_Context], Any]:
+        """
+        Resolves the parts of the expression that do not depend on the context ahead of evaluation.
+        Expressions without a specialized compilation are evaluated by walking the expression tree
+        :return: function that evaluates the expression in a given context
+        """
+        return self.evaluate
+
 
 def get_expression_value_list(context: Knit_Script_Context, expressions: List[Expression]):
     """
@@ -33,7 +42,7 @@ def get_expression_value_list(context: Knit_Script_Context, expressions: List[Ex
     values = []
     for exp in expressions:
         value = exp.evaluate(context)
-        if isinstance(value, list):
+        if isinstance(value, (list, Needle_Range)):
             values.extend(value)
         else:
             values.append(value)
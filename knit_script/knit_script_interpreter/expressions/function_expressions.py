@@ -58,6 +58,26 @@ class Function_Call(Expression):
         else:
             raise NameError(f"name {self.func_name.variable_name} is not defined.")  # Todo add way of tracking line numbers from statements and expressions
 
+    def compile(self) -> Callable[[Knit_Script_Context], Optional[Any]]:
+        """
+        Compiles the arguments once so python functions are called without walking the argument expressions
+        :return: function that finds the function in scope, fills parameters and then executes it
+        """
+        func_name = self.func_name.variable_name
+        args = [arg.compile() for arg in self.args]
+        kwargs = [(kwarg.variable_name, kwarg.compile_value()) for kwarg in self.kwargs]
+
+        def _evaluate(context: Knit_Script_Context) -> Optional[Any]:
+            if func_name not in context.variable_scope:
+                raise NameError(f"name {func_name} is not defined.")
+            function_signature = context.variable_scope[func_name]
+            if isinstance(function_signature, Function_Signature):
+                return function_signature.execute(context, self.args, self.kwargs)
+            elif isinstance(function_signature, Callable):
+                return function_signature(*[arg(context) for arg in args], **{name: value(context) for name, value in kwargs})
+            return self.evaluate(context)
+        return _evaluate
+
     def __str__(self):
         values = ""
         for exp in self.args:
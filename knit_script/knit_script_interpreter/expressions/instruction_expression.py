@@ -4,6 +4,7 @@ from typing import Union
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
 from knit_script.knitout_interpreter.knitout_structures.knitout_instructions.instruction import Instruction_Type
+from knit_script.knitting_machine.machine_components.Needle_Range import Needle_Range
 from knit_script.knitting_machine.machine_components.needles import Needle
 
 
@@ -40,7 +41,7 @@ class Needle_Instruction_Exp(Expression):
         needles = []
         for exp in self._needles:
             value = exp.evaluate(context)
-            if isinstance(value, list):
+            if isinstance(value, (list, Needle_Range)):
                 needles.extend(value)
             else:
                 needles.append(value)
@@ -1,12 +1,13 @@
 """Used for container structures (tuples, lists, dicts, comprehensions)"""
 
-from typing import List, Optional, Tuple, Iterable, Any
+from typing import List, Optional, Tuple, Iterable, Any, Sequence
 
 from knit_script.Knit_Errors import Knit_Script_Error
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.expressions.variables import Variable_Expression
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
 from knit_script.knitting_machine.Machine_State import Machine_State
+from knit_script.knitting_machine.machine_components.Needle_Range import Needle_Range
 from knit_script.knitting_machine.machine_components.needles import Needle
 
 
@@ -124,7 +125,8 @@ class Sliced_List(Expression):
             else:
                 raise Knit_Script_Error(f"Machine_State is not iterable and cannot be iterated over [{self._start}:{self._end}:{self._spacer}]")
         assert isinstance(iterable, Iterable)
-        iterable = [i for i in iterable]
+        if not isinstance(iterable, Sequence):  # only index iterables that are not sequences by iteration order
+            iterable = [i for i in iterable]
         if self._is_index:
             index = self._start.evaluate(context)
             return iterable[index]
@@ -141,7 +143,9 @@ class Sliced_List(Expression):
                 spacer = 1
             else:
                 spacer = int(self._spacer.evaluate(context))
-            return iterable[start:end:spacer]
+            if isinstance(iterable, (list, Needle_Range)):
+                return iterable[start:end:spacer]
+            return [*iterable[start:end:spacer]]  # slices of other sequences are lists of their values
 
     def _is_slice(self):
         return self._start_to_end or self._end_to_spacer
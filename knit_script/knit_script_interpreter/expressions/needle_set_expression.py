@@ -5,6 +5,7 @@ from typing import List, Optional, Dict, Union
 
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
+from knit_script.knitting_machine.machine_components.Needle_Range import Needle_Range
 from knit_script.knitting_machine.machine_components.needles import Needle
 
 
@@ -44,7 +45,7 @@ class Needle_Set_Expression(Expression):
         """
         return self._set_str
 
-    def evaluate(self, context: Knit_Script_Context) -> Union[List[Needle], Dict[Needle, Optional[Needle]]]:
+    def evaluate(self, context: Knit_Script_Context) -> Union[Needle_Range, List[Needle], Dict[Needle, Optional[Needle]]]:
         """
         Evaluate the expression
         :param context: The current context of the knit_script_interpreter
@@ -1,4 +1,5 @@
 """Expressions for interpreting conditions using Python conventions"""
+from typing import Callable
 
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
@@ -26,6 +27,13 @@ class Not_Expression(Expression):
         """
         return not self._negated_expression.evaluate(context)
 
+    def compile(self) -> Callable[[Knit_Script_Context], bool]:
+        """
+        :return: function that negates the compiled expression
+        """
+        evaluate = self._negated_expression.compile()
+        return lambda context: not evaluate(context)
+
     def __str__(self):
         return f"not {self._negated_expression}"
 
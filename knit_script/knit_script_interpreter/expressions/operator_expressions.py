@@ -1,5 +1,7 @@
 """Expressions with operators between left and right hand side"""
+import operator
 from enum import Enum
+from typing import Any, Callable
 
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
@@ -73,6 +75,21 @@ class Operator(Enum):
         elif self is Operator.Or:
             return lhs or rhs
 
+    @property
+    def function(self) -> Callable[[Any, Any], Any]:
+        """
+        :return: function of the left and right hand values that performs the operation
+        """
+        return _operator_functions[self]
+
+
+_operator_functions: dict[Operator, Callable[[Any, Any], Any]] = {
+    Operator.Add: operator.add, Operator.Sub: operator.sub, Operator.Div: operator.truediv, Operator.Mod: operator.mod,
+    Operator.Mul: operator.mul, Operator.Exp: operator.pow, Operator.LT: operator.lt, Operator.LTE: operator.le,
+    Operator.GT: operator.gt, Operator.GTE: operator.ge, Operator.Equal: operator.eq, Operator.NE: operator.ne,
+    Operator.Is: operator.is_, Operator.In: lambda lhs, rhs: lhs in rhs,
+    Operator.And: lambda lhs, rhs: lhs and rhs, Operator.Or: lambda lhs, rhs: lhs or rhs}
+
 
 class Operator_Expression(Expression):
     """Expression for managing operations of expressions"""
@@ -100,6 +117,19 @@ class Operator_Expression(Expression):
         second_num = self._rhs.evaluate(context)
         return op.operate(first_num, second_num)
 
+    def compile(self) -> Callable[[Knit_Script_Context], Any]:
+        """
+        :return: function that evaluates both sides and applies the operator, which is found once
+        """
+        lhs = self._lhs.compile()
+        rhs = self._rhs.compile()
+        operate = Operator.get_op(self.op_str).function
+
+        def _evaluate(context: Knit_Script_Context) -> Any:
+            first_num = lhs(context)
+            return operate(first_num, rhs(context))
+        return _evaluate
+
     def __str__(self):
         return f"({self._lhs} {self.op_str} {self._rhs})"
 
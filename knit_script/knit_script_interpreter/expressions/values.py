@@ -1,5 +1,5 @@
 """Expression values that don't need context to evaluate"""
-from typing import Any
+from typing import Any, Callable
 
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knitting_machine.machine_specification.Machine_Type import Machine_Type
@@ -24,6 +24,13 @@ class _Context_Free_Value(Expression):
     def _context_free_evaluation(self) -> Any:
         pass
 
+    def compile(self) -> Callable[[Knit_Script_Context], Any]:
+        """
+        :return: function that returns the value, which is found once
+        """
+        value = self._context_free_evaluation()
+        return lambda _context: value
+
     def __str__(self):
         return str(self._context_free_evaluation())
 
@@ -1,8 +1,9 @@
 """Expression for accessing variables"""
-from typing import Any
+from typing import Any, Callable
 
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
+from knit_script.knit_script_interpreter.scope.local_scope import Knit_Script_Scope
 
 
 class Variable_Expression(Expression):
@@ -18,6 +19,8 @@ class Variable_Expression(Expression):
         """
         super().__init__(parser_node)
         self._variable_name: str = variable_name
+        # python scope shadows knit script variables and cannot change during execution, so it is resolved once
+        self._python_value, self._in_python_scope = Knit_Script_Scope.get_value_from_python_scope(variable_name)
 
     @property
     def variable_name(self) -> str:
@@ -32,7 +35,19 @@ class Variable_Expression(Expression):
         :param context: The current context of the knit_script_interpreter
         :return: The lowest scope value of the variable by that name
         """
-        return context.variable_scope[self.variable_name]
+        if self._in_python_scope:
+            return self._python_value
+        return context.variable_scope.get_local(self.variable_name)
+
+    def compile(self) -> Callable[[Knit_Script_Context], Any]:
+        """
+        :return: function that looks up the variable, or returns the python value that shadows it
+        """
+        if self._in_python_scope:
+            python_value = self._python_value
+            return lambda _context: python_value
+        variable_name = self._variable_name
+        return lambda context: context.variable_scope.get_local(variable_name)
 
     def __str__(self):
         return self._variable_name
@@ -1,4 +1,5 @@
 """Manages variable scope and machine state of knit pass during execution"""
+from typing import Any
 
 from knit_script.knit_script_interpreter.scope.local_scope import Knit_Script_Scope
 from knit_script.knitout_interpreter.knitout_structures.Knitout_Line import Knitout_Line, Comment_Line
@@ -17,7 +18,7 @@ class Knit_Script_Context:
 
     def __init__(self, parent_scope: Knit_Script_Scope | None = None,
                  bed_width: int = 540, machine_position: Machine_Position = Machine_Position.Right,
-                 ks_file=None, parser=None):
+                 ks_file=None, parser=None, compiles_statements: bool = True):
         self.variable_scope: Knit_Script_Scope = Knit_Script_Scope(self, parent_scope)
         self._header: Header = Header(bed_width, machine_position)
         self.machine_state: Machine_State = self._header.machine_state()
@@ -25,6 +26,8 @@ class Knit_Script_Context:
         self.ks_file: str | None = ks_file
         self.parser = parser
         self.last_carriage_pass_result: list[Needle] | dict[Needle, Needle | None] = {}
+        self.compiles_statements: bool = compiles_statements  # if false, statements are executed by walking the statement tree
+        self.imported_modules: dict[str, Any] = {}  # import source to the module imported by it, so each module is executed once
 
     def add_variable(self, key, value):
         """
@@ -32,7 +35,7 @@ class Knit_Script_Context:
         :param key: Name of variable to be used in the knit script.
         :param value: Value of variable
         """
-        self.variable_scope.__setattr__(key, value)
+        self.variable_scope.set_local(key, value)
 
     @property
     def header(self) -> Header:
@@ -68,6 +71,33 @@ class Knit_Script_Context:
         """
         self.variable_scope = self.variable_scope.exit_current_scope()
 
+    def snapshot(self) -> tuple:
+        """
+        Marks the current point of execution so that the changes made by failed statements can be undone with restore
+        :return: the machine snapshot, the length of the knitout, the current scope and its machine settings, the last carriage pass result, and the imported modules
+        """
+        return (self.machine_state.snapshot(), len(self.knitout), self.variable_scope, self.variable_scope.machine_scope.snapshot(),
+                self.last_carriage_pass_result, dict(self.imported_modules))
+
+    def release(self, snapshot: tuple):
+        """
+        Keeps the changes made since the snapshot was taken
+        :param snapshot: the most recent snapshot that has not been restored or released
+        """
+        self.machine_state.release(snapshot[0])
+
+    def restore(self, snapshot: tuple):
+        """
+        Undoes the changes to the machine state, knitout, and machine settings made since the snapshot was taken and leaves any scopes entered since then.
+        Modules imported since then will be executed again if they are imported again
+        :param snapshot: the most recent snapshot that has not been restored or released
+        """
+        machine_snapshot, knitout_length, self.variable_scope, machine_scope_snapshot, self.last_carriage_pass_result, self.imported_modules = snapshot
+        self.machine_state.restore(machine_snapshot)
+        del self.knitout[knitout_length:]
+        self.variable_scope.child_scope = None
+        self.variable_scope.machine_scope.restore(machine_scope_snapshot)
+
     @property
     def sheet_needle_count(self, gauge: int | None = None) -> int:
         """
@@ -195,5 +225,9 @@ class Knit_Script_Context:
         Execute the list of statements on current context
         :param statements: statements to execute
         """
-        for statement in statements:
-            statement.execute(self)
+        if self.compiles_statements:
+            for statement in [statement.compile() for statement in statements]:
+                statement(self)
+        else:
+            for statement in statements:
+                statement.execute(self)
@@ -1,14 +1,50 @@
+from typing import NamedTuple, Optional
+
 from parglare.common import Location
 from parglare.parser import LRStackNode
 
 
+class Symbol_Location(NamedTuple):
+    """Location of a grammar symbol that can be pickled with the statements parsed from it"""
+    file_name: Optional[str]
+    line: int
+    column: int
+
+
+class _Cached_Symbol(NamedTuple):
+    location: Symbol_Location
+
+
+class Cached_Parser_Node(NamedTuple):
+    """Stands in for the parser node of elements loaded from the on-disk statement cache"""
+    symbol: _Cached_Symbol
+
+    @staticmethod
+    def from_parser_node(parser_node: LRStackNode):
+        """
+        :param parser_node: the parser node that reduced an element
+        :return: a picklable record of the location of the parser node's symbol
+        """
+        location = parser_node.symbol.location
+        return Cached_Parser_Node(_Cached_Symbol(Symbol_Location(location.file_name, location.line, location.column)))
+
+
 class KS_Element:
     """Super class of all parser elements in KS"""
     def __init__(self, parser_node: LRStackNode):
         self.parser_node = parser_node
 
+    def __getstate__(self) -> dict:
+        """
+        :return: attributes to pickle, with the parser node, which references the parser, replaced by a record of its location
+        """
+        state = dict(self.__dict__)
+        if isinstance(self.parser_node, LRStackNode):
+            state["parser_node"] = Cached_Parser_Node.from_parser_node(self.parser_node)
+        return state
+
     @property
-    def location(self) -> Location:
+    def location(self) -> Location | Symbol_Location:
         """
         :return: location of this symbol in KnitScript file
         """
@@ -0,0 +1,216 @@
+"""Caches of statements parsed from knit script programs and counts of how often parsed and executed modules are reused"""
+import glob
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import time
+from typing import Optional
+
+import importlib_resources
+from parglare import Parser
+
+import knit_script
+from knit_script.grammar_cache import cache_directory, grammar_key
+
+
+class Parsed_Module_Cache:
+    """
+        Process-wide cache of statements parsed from knit script files.
+        Entries are keyed by absolute path and reused while the modification time and size of the file are unchanged
+    """
+
+    def __init__(self):
+        self._statements: dict[str, tuple[tuple[int, int], list]] = {}
+        self.parse_hits: int = 0
+        self.parse_misses: int = 0
+        self.module_hits: int = 0
+        self.module_misses: int = 0
+
+    def parse_file(self, parser: Parser, path: str, disk_cache: Optional["Statement_Disk_Cache"] = None) -> list:
+        """
+        :param parser: parglare parser used when the file is not cached or has changed
+        :param path: path to the knit script file
+        :param disk_cache: cache of statements on disk to check before parsing
+        :return: statements parsed from the file
+        """
+        path = os.path.abspath(path)
+        file_stat = os.stat(path)
+        version = (file_stat.st_mtime_ns, file_stat.st_size)
+        cached = self._statements.get(path)
+        if cached is not None and cached[0] == version:
+            self.parse_hits += 1
+            return cached[1]
+        self.parse_misses += 1
+        if disk_cache is None:
+            statements = parser.parse_file(path)
+        else:
+            with open(path, "r", encoding="utf-8") as ks_file:
+                statements = disk_cache.parse(parser, ks_file.read(), file_name=path)
+        self._statements[path] = (version, statements)
+        return statements
+
+    def info(self) -> dict[str, int]:
+        """
+        :return: hits and misses of the parsed file cache and of the modules executed in each interpreter context
+        """
+        return {"parse_hits": self.parse_hits, "parse_misses": self.parse_misses, "module_hits": self.module_hits, "module_misses": self.module_misses}
+
+    def clear(self):
+        """
+            Drops parsed statements and resets the hit and miss counts
+        """
+        self._statements.clear()
+        self.parse_hits = 0
+        self.parse_misses = 0
+        self.module_hits = 0
+        self.module_misses = 0
+
+
+parsed_modules: Parsed_Module_Cache = Parsed_Module_Cache()
+
+_statement_format: Optional[str] = None
+
+
+def statement_format() -> str:
+    """
+    :return: Key of the grammar, the interpreter code that builds statements from it, and the python version that pickles them. Found once per process
+    """
+    global _statement_format
+    if _statement_format is None:
+        digest = hashlib.sha256()
+        interpreter_directory = os.path.dirname(knit_script.knit_script_interpreter.__file__)
+        for source_path in sorted(glob.glob(os.path.join(interpreter_directory, "**", "*.py"), recursive=True)):
+            with open(source_path, "rb") as source_file:
+                digest.update(source_file.read())
+        grammar = grammar_key(importlib_resources.files(knit_script.knit_script_interpreter).joinpath("knit_script.pg"))
+        _statement_format = f"{grammar}-{digest.hexdigest()[:16]}-py{sys.version_info.major}.{sys.version_info.minor}"
+    return _statement_format
+
+
+class Statement_Disk_Cache:
+    """
+        Cache of pickled statement trees on disk, shared by processes.
+        Entries are keyed by a hash of the source and of the statement format.
+        Entries are written atomically and refreshed when read.
+        Entries that are unused for max_age_seconds are evicted, and the least recently used entries are evicted while the cache is larger than max_bytes
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = 64 * 1024 * 1024, max_age_seconds: float = 30 * 24 * 60 * 60):
+        """
+        Instantiate
+        :param directory: directory that holds the cache. Defaults to the statements directory in the grammar cache directory
+        :param max_bytes: size the cache is reduced to after each write
+        :param max_age_seconds: time since the last use after which an entry is evicted
+        """
+        if directory is None:
+            directory = os.path.join(cache_directory(), "statements")
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        self.max_age_seconds: float = max_age_seconds
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def entry_path(self, source: str) -> str:
+        """
+        :param source: knit script program
+        :return: location of the cached statements of the program
+        """
+        digest = hashlib.sha256(statement_format().encode("utf-8"))
+        digest.update(source.encode("utf-8"))
+        return os.path.join(self.directory, f"{digest.hexdigest()[:32]}.pickle")
+
+    def parse(self, parser: Parser, source: str, file_name: Optional[str] = None) -> list:
+        """
+        :param parser: parglare parser used when the program is not cached
+        :param source: knit script program
+        :param file_name: the file the program was read from, used in parsing errors
+        :return: statements loaded from the cache or parsed and then cached
+        """
+        entry_path = self.entry_path(source)
+        statements = self._load(entry_path)
+        if statements is not None:
+            self.hits += 1
+            return statements
+        self.misses += 1
+        statements = parser.parse(source, file_name=file_name)
+        self._write(entry_path, statements)
+        return statements
+
+    def _load(self, entry_path: str) -> Optional[list]:
+        """
+        :param entry_path: location of the cached statements
+        :return: the cached statements or None if they are not cached or cannot be loaded
+        """
+        try:
+            with open(entry_path, "rb") as entry:
+                statements = pickle.load(entry)
+        except OSError:  # not cached or evicted by another process
+            return None
+        except Exception:  # corrupt or incompatible entry, parse again and replace it
+            self._remove(entry_path)
+            return None
+        try:
+            os.utime(entry_path)  # mark as recently used
+        except OSError:
+            pass
+        return statements
+
+    def _write(self, entry_path: str, statements: list):
+        """
+        Writes the statements to a temporary file and moves it into place so concurrent processes never read a partial entry. Then evicts old entries
+        :param entry_path: location of the cached statements
+        :param statements: the statements to cache
+        """
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:  # cache is an optimization, an unwritable cache directory is not an error
+            return
+        try:
+            with os.fdopen(file_descriptor, "wb") as entry:
+                pickle.dump(statements, entry, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, entry_path)
+        except Exception:  # statements that cannot be pickled are parsed each time
+            self._remove(temp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """
+            Removes entries and abandoned temporary files that are unused for max_age_seconds, then the least recently used entries until the cache fits in max_bytes
+        """
+        now = time.time()
+        entries: list[tuple[float, int, str]] = []
+        try:
+            with os.scandir(self.directory) as directory:
+                for file in directory:
+                    if not file.name.endswith((".pickle", ".tmp")):
+                        continue
+                    try:
+                        file_stat = file.stat()
+                    except OSError:  # removed by another process
+                        continue
+                    if now - file_stat.st_mtime > self.max_age_seconds:
+                        self._remove(file.path)
+                    elif file.name.endswith(".pickle"):
+                        entries.append((file_stat.st_mtime, file_stat.st_size, file.path))
+        except OSError:
+            return
+        cache_size = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if cache_size <= self.max_bytes:
+                break
+            self._remove(entry_path)
+            cache_size -= size
+
+    @staticmethod
+    def _remove(path: str):
+        """
+        :param path: cache file to remove, if no other process removed it first
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
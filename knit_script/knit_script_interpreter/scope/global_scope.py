@@ -33,13 +33,13 @@ class Knit_Script_Globals:
         self._exit_value = value
 
     def __getitem__(self, key: str) -> Any:
-        return getattr(self, key)
+        return self.values[key]
 
     def __setitem__(self, key: str, value: Any):
-        setattr(self, key, value)
+        self.values[key] = value
 
     def __delitem__(self, key: str):
-        delattr(self, key)
+        del self.values[key]
 
     def __contains__(self, key: str):
-        return hasattr(self, key)
+        return key in self.values
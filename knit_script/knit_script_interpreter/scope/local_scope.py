@@ -1,5 +1,5 @@
 """Scoping structure for Knit Script"""
-
+import builtins
 from typing import Optional, Tuple, Any, List, Union
 
 from knit_script.knit_script_interpreter.scope.global_scope import Knit_Script_Globals
@@ -12,9 +12,11 @@ from knit_script.knitting_machine.machine_components.yarn_management.Carrier_Set
 class Knit_Script_Scope:
     """
         Keeps track of values in a confined scope. Also accesses globals and checks python scope
+        Variables are held in a per-scope frame dictionary so lookups never evaluate python code
     """
 
     def __init__(self, context, parent=None, name: Optional[str] = None, is_function: bool = False, is_module: bool = False, module_scope=None):
+        self._variables: dict[str, Any] = {}
         self.context = context
         self._is_module = is_module
         self._is_function = is_function
@@ -95,11 +97,13 @@ class Knit_Script_Scope:
         :param key: value to access
         :return: the value from python, True if value was in python scope
         """
-        try:
-            value = eval(key)
-            return value, True
-        except NameError:
-            return None, False
+        python_scope = globals()
+        if key in python_scope:
+            return python_scope[key], True
+        python_scope = builtins.__dict__
+        if key in python_scope:
+            return python_scope[key], True
+        return None, False
 
     @property
     def is_module(self) -> bool:
@@ -142,11 +146,11 @@ class Knit_Script_Scope:
         """
         if self.has_local(key, stop_at_function=True, stop_at_module=True):  # value comes from higher up scope, but not including global
             scope = self
-            while not hasattr(scope, key):
+            while key not in scope._variables:
                 scope = scope.parent
-            setattr(scope, key, value)
+            scope._variables[key] = value
         else:  # set at lowest scope level
-            setattr(self, key, value)
+            self._variables[key] = value
 
     def set_global(self, key: str, value: Any):
         """
@@ -171,10 +175,10 @@ class Knit_Script_Scope:
         else:  # check lowest scope then globals
             scope = self
             while scope is not None:
-                if hasattr(scope, key):
+                if key in scope._variables:
                     if is_global:
                         print(f"KnitScript Warning: {key} shadows global variable")
-                    return getattr(scope, key)
+                    return scope._variables[key]
                 elif scope.module_scope is not None:
                     try:
                         return scope.module_scope[key]
@@ -219,7 +223,7 @@ class Knit_Script_Scope:
         """
         scope = self
         while scope is not None:
-            if hasattr(scope, key):
+            if key in scope._variables:
                 return True
             elif stop_at_function and scope.is_function:
                 return False
@@ -244,8 +248,8 @@ class Knit_Script_Scope:
         """
         scope = self
         while scope is not None:
-            if hasattr(scope, key):
-                delattr(scope, key)
+            if key in scope._variables:
+                del scope._variables[key]
                 return True
             scope = scope.parent
         return False
@@ -297,6 +301,13 @@ class Knit_Script_Scope:
             return exists
         return self.has_global(key) or self.has_local(key)
 
+    def __getattr__(self, key: str) -> Any:
+        # Only reached when normal attribute access fails, exposes module variables as attributes (e.g., module.function)
+        try:
+            return self.__dict__["_variables"][key]
+        except KeyError:
+            raise AttributeError(f"{self.name} has no variable {key}") from None
+
     def __setitem__(self, key: str, value: Any):
         self.set_local(key, value)
 
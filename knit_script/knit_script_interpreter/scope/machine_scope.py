@@ -25,7 +25,7 @@ class Machine_Variables(Enum):
         :param key: variable string
         :return: True if key is a variable
         """
-        return key in [i.name for i in Machine_Variables]
+        return key in _MACHINE_VARIABLE_NAMES
 
     def get_value(self, scope):
         """
@@ -43,6 +43,9 @@ class Machine_Variables(Enum):
         setattr(context, self.value, value)
 
 
+_MACHINE_VARIABLE_NAMES: frozenset[str] = frozenset(i.name for i in Machine_Variables)
+
+
 class Machine_Scope:
     """
         Keeps track of the machine state within different scopes
@@ -76,6 +79,19 @@ class Machine_Scope:
         scope.sheet = self.sheet
         return scope
 
+    def snapshot(self) -> tuple:
+        """
+        :return: the direction, carrier, racking, gauge, and sheet of the scope
+        """
+        return self._direction, self._carrier, self._racking, self._gauge, self._sheet
+
+    def restore(self, snapshot: tuple):
+        """
+        Returns the scope to the values it had when the snapshot was taken without updating the machine state
+        :param snapshot: the values returned by snapshot
+        """
+        self._direction, self._carrier, self._racking, self._gauge, self._sheet = snapshot
+
     @property
     def direction(self) -> Pass_Direction:
         """
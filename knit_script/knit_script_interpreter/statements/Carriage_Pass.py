@@ -1,4 +1,5 @@
 """Used to manage all instruction sets written for a single carriage pass in a given direction"""
+from collections import OrderedDict
 from typing import Optional, Dict
 
 from knit_script.Knit_Errors.knitting_errors import Incompatible_Carriage_Pass_Operations, Instructions_Require_Direction, Repeated_Needle_In_Pass, All_Needle_Operation_Error
@@ -9,6 +10,11 @@ from knit_script.knitting_machine.machine_components.machine_pass_direction impo
 from knit_script.knitting_machine.machine_components.machine_position import Machine_Bed_Position
 from knit_script.knitting_machine.machine_components.needles import Needle
 
+# Plans of recent carriage passes, keyed by direction, racking, target bed and the needle keys and instructions of the pass in the order they were given.
+# Each plan is the order to execute the needles in, as indices in the given needles, and whether the pass needs all-needle racking
+pass_plans: OrderedDict[tuple, tuple[tuple[int, ...], bool]] = OrderedDict()
+max_pass_plans: int = 256
+
 
 class Carriage_Pass:
     """
@@ -85,26 +91,8 @@ class Carriage_Pass:
         if self._racking is not None:
             context.racking = self._racking
 
-        needles = [*self._needle_to_instruction.keys()]
-
-        needles = self._keep_target_bed_needles(needles)  # ignore needles that are already on target bed
-
-        needles_in_order = self._direction.sort_needles(needles, racking=context.racking)  # sort into the direction of machine pass
-
-        # calculate all-needle racking condition
-        needs_all_needle_rack = False
-        for n, m in zip(needles_in_order[0:-1], needles_in_order[1:]):
-            if n.racked_position_on_front(context.racking) == m.racked_position_on_front(context.racking):
-                if n.is_front == m.is_front:
-                    raise Repeated_Needle_In_Pass(n)
-                n_instruction = self._needle_to_instruction[n]
-                # todo: what did these do?
-                # m_instruction = self._needle_to_instruction[n]
-                # assert n_instruction is m_instruction, \
-                #     f"Cannot {n_instruction} on {n} and {m_instruction} on same position {m}"
-                if not n_instruction.all_needle_instruction:
-                    raise All_Needle_Operation_Error(n, m, n_instruction)
-                needs_all_needle_rack = True
+        needle_instructions = tuple(self._needle_to_instruction.items())
+        order, needs_all_needle_rack = self._cached_plan(needle_instructions, context.racking)
 
         if needs_all_needle_rack:
             if context.racking >= 0:
@@ -112,8 +100,8 @@ class Carriage_Pass:
             else:
                 context.knitout.append(rack(context.machine_state, context.racking - .25, comment=f"All Needle racking {context.racking} to left"))
 
-        for needle in needles_in_order:
-            instruction_type = self._needle_to_instruction[needle]
+        for index in order:
+            needle, instruction_type = needle_instructions[index]
             if instruction_type.requires_second_needle:
                 second_needle = context.machine_state.xfer_needle_at_racking(needle, slider=self._to_sliders)
             else:
@@ -127,6 +115,54 @@ class Carriage_Pass:
             results.update(self._drop_pass.write_knitout(context))
         return results
 
+    def _cached_plan(self, needle_instructions: tuple[tuple[Needle, Instruction_Type], ...], racking: float) -> tuple[tuple[int, ...], bool]:
+        """
+        Repeated passes reuse the plan of the first pass instead of sorting and checking the needles again
+        :param needle_instructions: the needles of the pass and their instructions
+        :param racking: the racking the pass is executed at
+        :return: the order to execute the needles in, as indices in needle_instructions, and True if the pass needs all-needle racking
+        """
+        # keyed by needle keys so cached plans do not keep needles, or the loops and yarns they hold, alive after a program ends
+        plan_key = (self._direction, racking, self._target_bed, tuple((needle.key, instruction_type) for needle, instruction_type in needle_instructions))
+        plan = pass_plans.get(plan_key)
+        if plan is None:
+            plan = self._plan(needle_instructions, racking)
+            pass_plans[plan_key] = plan
+            if len(pass_plans) > max_pass_plans:
+                pass_plans.popitem(last=False)
+        else:
+            pass_plans.move_to_end(plan_key)
+        return plan
+
+    def _plan(self, needle_instructions: tuple[tuple[Needle, Instruction_Type], ...], racking: float) -> tuple[tuple[int, ...], bool]:
+        """
+        :param needle_instructions: the needles of the pass and their instructions
+        :param racking: the racking the pass is executed at
+        :return: the order to execute the needles in, as indices in needle_instructions, and True if the pass needs all-needle racking
+        """
+        needles = [needle for needle, _ in needle_instructions]
+        indices = {id(needle): i for i, needle in enumerate(needles)}
+
+        needles = self._keep_target_bed_needles(needles)  # ignore needles that are already on target bed
+
+        needles_in_order = self._direction.sort_needles(needles, racking=racking)  # sort into the direction of machine pass
+
+        # calculate all-needle racking condition
+        needs_all_needle_rack = False
+        for n, m in zip(needles_in_order[0:-1], needles_in_order[1:]):
+            if n.racked_position_on_front(racking) == m.racked_position_on_front(racking):
+                if n.is_front == m.is_front:
+                    raise Repeated_Needle_In_Pass(n)
+                n_instruction = self._needle_to_instruction[n]
+                # todo: what did these do?
+                # m_instruction = self._needle_to_instruction[n]
+                # assert n_instruction is m_instruction, \
+                #     f"Cannot {n_instruction} on {n} and {m_instruction} on same position {m}"
+                if not n_instruction.all_needle_instruction:
+                    raise All_Needle_Operation_Error(n, m, n_instruction)
+                needs_all_needle_rack = True
+        return tuple(indices[id(needle)] for needle in needles_in_order), needs_all_needle_rack
+
     def _keep_target_bed_needles(self, needles):
         if self._target_bed is not None:  # throw out needles that are on target bed already
             if not isinstance(self._target_bed, Machine_Bed_Position):
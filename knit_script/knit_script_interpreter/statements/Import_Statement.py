@@ -8,6 +8,7 @@ import knit_script.knit_script_std_library as ks_library
 from knit_script.knit_script_interpreter.expressions.accessors import Attribute_Accessor_Expression
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.expressions.variables import Variable_Expression
+from knit_script.knit_script_interpreter.module_cache import parsed_modules
 from knit_script.knit_script_interpreter.statements.Statement import Statement
 
 
@@ -36,6 +37,29 @@ class Import_Statement(Statement):
             alias = self.src.variable_name
         else:
             alias = None
+        if src_string in context.imported_modules:  # module was already executed in this program
+            parsed_modules.module_hits += 1
+            module = context.imported_modules[src_string]
+        else:
+            parsed_modules.module_misses += 1
+            module = self._load_module(context, src_string, alias)
+            context.imported_modules[src_string] = module
+        if alias is not None:
+            context.variable_scope[alias] = module
+        else:  # attribute accessor path
+            assert isinstance(self.src, Attribute_Accessor_Expression)
+            path = [str(p) for p in self.src.parent]
+            path.append(str(self.src.attribute))
+            context.variable_scope.add_local_by_path(path, module)
+
+    def _load_module(self, context, src_string: str, alias: Optional[str]):
+        """
+        Imports a python module or executes a knit script module in a new module scope
+        :param context: the current context to execute at
+        :param src_string: the module path
+        :param alias: the name of the module in the importing scope
+        :return: the imported module
+        """
         try:
             try:
                 module = importlib.import_module(src_string)
@@ -75,13 +99,7 @@ class Import_Statement(Statement):
             else:
                 raise e
         assert module is not None
-        if alias is not None:
-            context.variable_scope[alias] = module
-        else:  # attribute accessor path
-            assert isinstance(self.src, Attribute_Accessor_Expression)
-            path = [str(p) for p in self.src.parent]
-            path.append(str(self.src.attribute))
-            context.variable_scope.add_local_by_path(path, module)
+        return module
 
     def __str__(self):
 
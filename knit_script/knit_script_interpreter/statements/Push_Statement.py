@@ -31,23 +31,22 @@ class Push_Statement(Statement):
         needles = get_expression_value_list(context, self._needles)
         positions = [n.position if isinstance(n, Needle) else int(n) for n in needles]
 
-        for needle_pos in positions:
-            if isinstance(self._push_val, Expression):
-                pos = int(self._push_val.evaluate(context))
-                context.machine_state.set_layer_position(needle_pos, pos)
-            elif isinstance(self._push_val, str):
-                if self._push_val.lower() == "front":
-                    context.machine_state.set_layer_to_front(needle_pos)
-                elif self._push_val.lower() == "back":
-                    context.machine_state.set_layer_to_back(needle_pos)
+        if isinstance(self._push_val, Expression):
+            pos = int(self._push_val.evaluate(context))
+            context.machine_state.set_layer_positions(positions, pos)
+        elif isinstance(self._push_val, str):
+            if self._push_val.lower() == "front":
+                context.machine_state.set_layers_to_front(positions)
+            elif self._push_val.lower() == "back":
+                context.machine_state.set_layers_to_back(positions)
+        else:
+            assert isinstance(self._push_val, tuple)
+            dist = int(self._push_val[0].evaluate(context))
+            direction = self._push_val[1].lower()
+            if direction == "forward":
+                context.machine_state.push_layers_forward(positions, dist)
             else:
-                assert isinstance(self._push_val, tuple)
-                dist = int(self._push_val[0].evaluate(context))
-                direction = self._push_val[1].lower()
-                if direction == "forward":
-                    context.machine_state.push_layer_forward(needle_pos, dist)
-                else:
-                    context.machine_state.push_layer_backward(needle_pos, dist)
+                context.machine_state.push_layers_backward(positions, dist)
         context.knitout.extend(context.machine_state.reset_sheet(context.sheet.sheet))
 
     def __str__(self):
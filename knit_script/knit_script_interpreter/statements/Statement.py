@@ -1,4 +1,6 @@
 """Basic statement structures"""
+from typing import Callable
+
 from parglare.parser import LRStackNode
 
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
@@ -21,6 +23,14 @@ class Statement(KS_Element):
         """
         pass
 
+    def compile(self) -> Callable[[Knit_Script_Context], None]:
+        """
+        Resolves the parts of the statement that do not depend on the context ahead of execution.
+        Statements without a specialized compilation are executed by walking the statement tree
+        :return: function that executes the statement in a given context
+        """
+        return self.execute
+
 
 class Expression_Statement(Statement):
     """
@@ -55,3 +65,13 @@ class Expression_Statement(Statement):
         :param context: The current context of the knit_script_interpreter
         """
         _ = self._expression.evaluate(context)
+
+    def compile(self) -> Callable[[Knit_Script_Context], None]:
+        """
+        :return: function that evaluates the expression in a given context
+        """
+        evaluate = self._expression.compile()
+
+        def _execute(context: Knit_Script_Context):
+            evaluate(context)
+        return _execute
@@ -38,17 +38,18 @@ class Swap_Statement(Statement):
             layer = self._layer.evaluate(context)
             assert isinstance(layer, int), f"Expected an integer for a layer but got {layer}"
             sheet = None
-        for needle_pos in positions:
-            if layer is not None:
-                positions = [needle_pos + (s - context.sheet.sheet) for s in range(0, context.gauge) if s != context.sheet.sheet]
-                for other_position in positions:
-                    other_layer = context.machine_state.get_layer_at_position(other_position)
-                    if other_layer == layer:
-                        context.machine_state.swap_layer_at_positions(needle_pos, other_layer)
-            else:
-                other_position = needle_pos + (sheet - context.sheet.sheet)
-                other_layer = context.machine_state.get_layer_at_position(other_position)
-                context.machine_state.swap_layer_at_positions(needle_pos, other_layer)
+        current_sheet = context.sheet.sheet
+        other_positions = []
+        if layer is not None:
+            sibling_sheets = [s for s in range(0, context.gauge) if s != current_sheet]
+            for needle_pos in positions:
+                siblings = [needle_pos + (s - current_sheet) for s in sibling_sheets]
+                matches = [p for p, l in zip(siblings, context.machine_state.get_layers_at_positions(siblings)) if l == layer]
+                other_positions.append(matches[0] if len(matches) > 0 else needle_pos)  # a needle without a sibling in the layer is not swapped
+        else:
+            other_positions = [needle_pos + (sheet - current_sheet) for needle_pos in positions]
+        context.machine_state.swap_layers_at_positions(positions, other_positions)
+        context.knitout.extend(context.machine_state.reset_sheet(current_sheet))
 
     def __str__(self):
         if self._layer is None:
@@ -1,4 +1,6 @@
 """Statement for declaring a variable"""
+from typing import Callable
+
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
 from knit_script.knit_script_interpreter.statements.Statement import Statement
 from knit_script.knit_script_interpreter.statements.assignment import Assignment
@@ -26,6 +28,12 @@ class Variable_Declaration(Statement):
         """
         self._assignment.assign_value(context, is_global=self._is_global)
 
+    def compile(self) -> Callable[[Knit_Script_Context], None]:
+        """
+        :return: function that puts the result of the compiled assignment into variable scope
+        """
+        return self._assignment.compile(is_global=self._is_global)
+
     def __str__(self):
         return f"{self._assignment};"
 
@@ -1,5 +1,5 @@
 """With statement for setting variables in temporary variable space"""
-from typing import List
+from typing import List, Callable
 
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
 from knit_script.knit_script_interpreter.scope.machine_scope import Machine_Variables
@@ -29,13 +29,28 @@ class With_Statement(Statement):
         Sets variable values at new scope and executes in-context code
         :param context: The current context of the knit_script_interpreter
         """
+        self._run(context, self._statement.execute)
+
+    def compile(self) -> Callable[[Knit_Script_Context], None]:
+        """
+        :return: function that sets variable values at new scope and executes the compiled in-context code
+        """
+        statement = self._statement.compile()
+        return lambda context: self._run(context, statement)
+
+    def _run(self, context: Knit_Script_Context, run_statement: Callable[[Knit_Script_Context], None]):
+        """
+        Sets variable values at new scope and executes in-context code
+        :param context: The current context of the knit_script_interpreter
+        :param run_statement: function that executes the in-context code
+        """
         context.enter_sub_scope()  # make sub scope with variable changes
         reset_machine_scope = {}
         for assign in self._assignments:
             if Machine_Variables.in_machine_variables(assign.variable_name.lower()):
                 reset_machine_scope[assign.variable_name] = context.variable_scope.machine_scope[assign.variable_name]
             assign.assign_value(context)
-        self._statement.execute(context)
+        run_statement(context)
         # Reset the machine state to before the with statement assignments
         if Machine_Variables.Sheet.name in reset_machine_scope:  # reset sheet before gauge
             Machine_Variables.Sheet.set_value(context, reset_machine_scope[Machine_Variables.Sheet.name])
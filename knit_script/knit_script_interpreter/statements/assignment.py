@@ -1,5 +1,5 @@
 """Assignment structure"""
-from typing import Any
+from typing import Any, Callable
 
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
@@ -39,6 +39,41 @@ class Assignment(KS_Element):
             context.variable_scope[self.variable_name] = value
         return value
 
+    def compile_value(self) -> Callable[[Knit_Script_Context], Any]:
+        """
+        :return: function that gets the value to be assigned
+        """
+        if not isinstance(self._value_expression, Expression):
+            value = self._value_expression
+            return lambda _context: value
+        return self._value_expression.compile()
+
+    def compile(self, is_global: bool = False) -> Callable[[Knit_Script_Context], Any]:
+        """
+        :param is_global: If true, the function assigns the variable in global space
+        :return: function that assigns the value to the variable and returns the value, with the kind of variable resolved once
+        """
+        value = self.compile_value()
+        variable_name = self.variable_name
+        if Machine_Variables.in_machine_variables(variable_name):  # shortcut for always global variables
+            machine_variable = Machine_Variables[variable_name]
+
+            def _assign(context: Knit_Script_Context) -> Any:
+                assigned_value = value(context)
+                machine_variable.set_value(context, assigned_value)
+                return assigned_value
+        elif is_global:
+            def _assign(context: Knit_Script_Context) -> Any:
+                assigned_value = value(context)
+                context.variable_scope.set_global(variable_name, assigned_value)
+                return assigned_value
+        else:
+            def _assign(context: Knit_Script_Context) -> Any:
+                assigned_value = value(context)
+                context.variable_scope[variable_name] = assigned_value
+                return assigned_value
+        return _assign
+
     def value(self, context) -> Any:
         """
         Get the value to be assigned
@@ -1,5 +1,5 @@
 """Manages branching condition statements"""
-from typing import Optional
+from typing import Optional, Callable
 
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
@@ -35,6 +35,26 @@ class If_Statement(Statement):
         elif self._false_statement is not None:
             self._false_statement.execute(context)
 
+    def compile(self) -> Callable[[Knit_Script_Context], None]:
+        """
+        :return: function that executes the compiled branch chosen by the compiled condition
+        """
+        condition = self._condition.compile()
+        true_statement = self._true_statement.compile()
+        if self._false_statement is None:
+            def _execute(context: Knit_Script_Context):
+                if condition(context):
+                    true_statement(context)
+        else:
+            false_statement = self._false_statement.compile()
+
+            def _execute(context: Knit_Script_Context):
+                if condition(context):
+                    true_statement(context)
+                else:
+                    false_statement(context)
+        return _execute
+
     def __str__(self):
         return f"If({self._condition})->{self._true_statement} else->{self._false_statement}"
 
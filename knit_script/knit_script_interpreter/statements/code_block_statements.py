@@ -1,6 +1,6 @@
 """manages blocks of code executed in a new scope"""
 
-from typing import List
+from typing import List, Callable
 
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
 from knit_script.knit_script_interpreter.statements.Statement import Statement
@@ -37,6 +37,28 @@ class Code_Block(Statement):
             context.variable_scope.returned = True
             context.variable_scope.return_value = return_value
 
+    def compile(self) -> Callable[[Knit_Script_Context], None]:
+        """
+        :return: function that executes the compiled statements of the block in a new scope
+        """
+        statements = [statement.compile() for statement in self._statements]
+
+        def _execute(context: Knit_Script_Context):
+            context.enter_sub_scope()
+            had_return = False
+            return_value = None
+            for statement in statements:
+                statement(context)
+                if context.variable_scope.returned:  # executed statement updated scope with return value
+                    had_return = True
+                    return_value = context.variable_scope.return_value
+                    break  # don't continue to execute block statements
+            context.exit_current_scope()
+            if had_return:
+                context.variable_scope.returned = True
+                context.variable_scope.return_value = return_value
+        return _execute
+
     def __str__(self):
         values = ""
         for stst in self._statements:
@@ -1,6 +1,6 @@
 """Loop control structures"""
 from collections.abc import Iterable
-from typing import List, Union, Optional
+from typing import List, Union, Optional, Callable
 
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.expressions.variables import Variable_Expression
@@ -34,6 +34,18 @@ class While_Statement(Statement):
             self._statement.execute(context)
             condition = self._condition.evaluate(context)
 
+    def compile(self) -> Callable[[Knit_Script_Context], None]:
+        """
+        :return: function that runs the compiled statement while the compiled condition is true
+        """
+        condition = self._condition.compile()
+        statement = self._statement.compile()
+
+        def _execute(context: Knit_Script_Context):
+            while condition(context):
+                statement(context)
+        return _execute
+
     def __str__(self):
         return f"While({self._condition} -> {self._statement})"
 
@@ -83,6 +95,31 @@ class For_Each_Statement(Statement):
             self._statement.execute(context)
         context.exit_current_scope()  # exit scope, removing access to iterator variable
 
+    def compile(self) -> Callable[[Knit_Script_Context], None]:
+        """
+        :return: function that executes the compiled statement for each value of the compiled iterable
+        """
+        iter_expression = self._iter_expression.compile()
+        statement = self._statement.compile()
+        var_name = self.var_name
+        variable_names = [variable.variable_name for variable in self._variables]
+
+        def _execute(context: Knit_Script_Context):
+            iterable = iter_expression(context)
+            assert isinstance(iterable, Iterable), f'Cannot iterate over non-iterable value {iterable}'
+            context.enter_sub_scope()  # create new scope that holds iterator variable
+            for var in iterable:
+                if var_name is not None:
+                    context.variable_scope[var_name] = var  # update iterator variable in scope
+                else:  # multiple vars to unpack
+                    iterated_var = [*var]
+                    assert len(iterated_var) == len(variable_names), "Unpacked values do not match variables provided"
+                    for variable_name, var_val in zip(variable_names, iterated_var):
+                        context.variable_scope[variable_name] = var_val
+                statement(context)
+            context.exit_current_scope()  # exit scope, removing access to iterator variable
+        return _execute
+
     def __str__(self):
         return f"for {self.var_name} in {self._iter_expression} -> {self._statement}"
 
@@ -1,5 +1,5 @@
 """Structures for declaring functions"""
-from typing import List, Any, Dict
+from typing import List, Any, Dict, Callable, Optional
 
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.expressions.variables import Variable_Expression
@@ -14,19 +14,24 @@ class Function_Signature:
         Function object which processes parameter values and executes function call
     """
 
-    def __init__(self, name: str, parameter_names: List[str], body: Statement, defaults: Dict[str, Any], module_scope: Knit_Script_Scope):
+    def __init__(self, name: str, parameter_names: List[str], body: Statement, defaults: Dict[str, Any], module_scope: Knit_Script_Scope,
+                 run_body: Optional[Callable[[Knit_Script_Context], None]] = None):
         """
         Instantiate
         :param name: name of function
         :param parameter_names: list of parameter names
         :param body: the body to execute on call
         :param defaults: key parameter names to default values
+        :param run_body: compiled body to run on call. Defaults to executing the body statement
         """
         self._name: str = name
         self._parameter_names: List[str] = parameter_names
         self._body: Statement = body
         self._defaults: Dict[str, Any] = defaults
         self._module_scope: Knit_Script_Scope = module_scope
+        if run_body is None:
+            run_body = body.execute
+        self._run_body: Callable[[Knit_Script_Context], None] = run_body
 
     def execute(self, context: Knit_Script_Context, args: List[Expression], kwargs: List[Assignment]) -> Any:
         """
@@ -60,7 +65,7 @@ class Function_Signature:
         for param in self._parameter_names:
             assert param in filled_params, f"No value assigned to required parameter {param}"
 
-        self._body.execute(context)  # execute function body
+        self._run_body(context)  # execute function body
         return_value = context.variable_scope.return_value  # store return value before exiting scope and deleting it
         context.exit_current_scope()  # leave parameter scope
         return return_value
@@ -97,6 +102,22 @@ class Function_Declaration(Statement):
         Puts function object with variable signature into variable scope
         :param context: The current context of the knit_script_interpreter
         """
+        self._declare(context, self._body.execute)
+
+    def compile(self) -> Callable[[Knit_Script_Context], None]:
+        """
+        Compiles the function body once for every call of the declared function
+        :return: function that puts the function object into variable scope
+        """
+        run_body = self._body.compile()
+        return lambda context: self._declare(context, run_body)
+
+    def _declare(self, context: Knit_Script_Context, run_body: Callable[[Knit_Script_Context], None]):
+        """
+        Puts function object with variable signature into variable scope
+        :param context: The current context of the knit_script_interpreter
+        :param run_body: function that executes the body of the function
+        """
         params = []
         defaults = {}
         for arg in self._args:
@@ -109,5 +130,5 @@ class Function_Declaration(Statement):
                 print(f"KP-Warning: argument {kwarg.variable_name} shadows outer scope")
             defaults[kwarg.variable_name] = kwarg.value(context)
 
-        function = Function_Signature(self._func_name, params, self._body, defaults, context.variable_scope)
+        function = Function_Signature(self._func_name, params, self._body, defaults, context.variable_scope, run_body)
         context.variable_scope[self._func_name] = function  # assign to current scope
@@ -1,5 +1,5 @@
 """Used to translate lists of knitting instructions in a single carriage pass"""
-from typing import List, Dict
+from typing import List, Dict, Callable, Any
 
 from knit_script.Knit_Errors.yarn_management_errors import No_Declared_Carrier_Error
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
@@ -32,16 +32,33 @@ class In_Direction_Statement(Statement):
         Creates sub-scope to set the direction and executes instructions
         :param context:  The current context of the knit_script_interpreter
         """
+        self._run(context, self._direction.evaluate, [instruction_exp.evaluate for instruction_exp in self._instructions])
 
+    def compile(self) -> Callable[[Knit_Script_Context], None]:
+        """
+        :return: function that executes the compiled instructions in the compiled direction
+        """
+        direction = self._direction.compile()
+        instructions = [instruction_exp.compile() for instruction_exp in self._instructions]
+        return lambda context: self._run(context, direction, instructions)
+
+    def _run(self, context: Knit_Script_Context, evaluate_direction: Callable[[Knit_Script_Context], Any],
+             evaluate_instructions: List[Callable[[Knit_Script_Context], tuple[Instruction_Type, List[Needle]]]]):
+        """
+        Creates sub-scope to set the direction and executes instructions
+        :param context:  The current context of the knit_script_interpreter
+        :param evaluate_direction: function that evaluates the direction to execute operations in
+        :param evaluate_instructions: functions that evaluate the instruction sets to execute
+        """
         context.enter_sub_scope()  # make sub scope with direction variable change
         if context.carrier_set is None:
             raise No_Declared_Carrier_Error()
-        direction = self._direction.evaluate(context)
+        direction = evaluate_direction(context)
         needles_to_instruction: Dict[Needle, Instruction_Type] = {}
 
         has_splits = False
-        for instruction_exp in self._instructions:
-            instruction, needles = instruction_exp.evaluate(context)
+        for evaluate_instruction in evaluate_instructions:
+            instruction, needles = evaluate_instruction(context)
             if instruction is Instruction_Type.Split:
                 has_splits = True
             for needle in needles:
@@ -1,4 +1,6 @@
 """Used for storing results of function returns"""
+from typing import Callable
+
 from knit_script.knit_script_interpreter.expressions.expressions import Expression
 from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
 from knit_script.knit_script_interpreter.statements.Statement import Statement
@@ -27,6 +29,17 @@ class Return_Statement(Statement):
         context.variable_scope.return_value = value
         context.variable_scope.has_return = True
 
+    def compile(self) -> Callable[[Knit_Script_Context], None]:
+        """
+        :return: function that collects the compiled return value
+        """
+        exp = self._exp.compile()
+
+        def _execute(context: Knit_Script_Context):
+            context.variable_scope.return_value = exp(context)
+            context.variable_scope.has_return = True
+        return _execute
+
     def __str__(self):
         return f"return {self._exp}"
 
@@ -26,12 +26,15 @@ class Try_Catch_Statement(Statement):
 
     def execute(self, context: Knit_Script_Context):
         """
-        Execute try-catch using python structure
+        Execute try-catch using python structure.
+        If the try statement fails, the machine state and knitout are restored to where they were before the try statement
         :param context: The current context of the knit_script_interpreter
         """
+        snapshot = context.snapshot()
         try:
             self._try_statement.execute(context)
         except Exception as e:
+            context.restore(snapshot)
             if len(self._errors) > 0:
                 for error_exp in self._errors:
                     if isinstance(error_exp, Assignment):
@@ -47,6 +50,8 @@ class Try_Catch_Statement(Statement):
                         break
             else:  # accept all errors
                 self._catch_statement.execute(context)
+        else:
+            context.release(snapshot)
 
     def __str__(self):
         return f"Try({self._try_statement})->Catch({self._errors} then {self._catch_statement})"
@@ -9,6 +9,7 @@ from knit_script.knit_script_interpreter.statements.Carriage_Pass import Carriag
 from knit_script.knit_script_interpreter.statements.Statement import Statement
 from knit_script.knitout_interpreter.knitout_structures.knitout_instructions.instruction import Instruction_Type
 from knit_script.knitting_machine.machine_components.machine_position import Machine_Bed_Position
+from knit_script.knitting_machine.machine_components.Needle_Range import Needle_Range
 from knit_script.knitting_machine.machine_components.needles import Needle
 
 
@@ -49,7 +50,7 @@ class Xfer_Pass_Statement(Statement):
         needles = []
         for needle in self._needles:
             n = needle.evaluate(context)
-            if isinstance(n, list):
+            if isinstance(n, (list, Needle_Range)):
                 needles.extend(n)
             else:
                 needles.append(n)
@@ -0,0 +1,292 @@
+"""Integer indexed graph of ordering constraints between knitout lines and carriage passes"""
+from array import array
+from enum import Enum
+from typing import Any, Optional
+
+from networkx import DiGraph
+
+
+class Constraint_Store:
+    """
+        Directed graph of ordering constraints.
+        Nodes are numbered in the order they are added and edges are held in flat arrays.
+        Each edge has a bitmask of its prerequisites and a bitmask of the kinds of constraints it comes from.
+    """
+
+    def __init__(self, prerequisites: list[Enum], kinds: list[Enum]):
+        """
+        :param prerequisites: every prerequisite that can be placed on an edge
+        :param kinds: every kind of constraint that an edge can come from
+        """
+        self.prerequisite_bits: dict[Enum, int] = {prerequisite: 1 << i for i, prerequisite in enumerate(prerequisites)}
+        self.kind_bits: dict[Enum, int] = {kind: 1 << i for i, kind in enumerate(kinds)}
+        self.nodes: list[Any] = []
+        self._node_indices: dict[Any, int] = {}
+        self._out_edges: list[list[int]] = []  # edges leaving each node in the order they were added
+        self._in_edges: list[list[int]] = []  # edges entering each node in the order they were added
+        self._edge_indices: dict[tuple[int, int], int] = {}
+        self.sources: array = array('l')
+        self.targets: array = array('l')
+        self.prerequisites: array = array('L')
+        self.kinds: array = array('B')
+        self._edge_attributes: dict[int, dict[str, Any]] = {}  # only edges with attributes beyond their prerequisites
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return node in self._node_indices
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    @property
+    def edge_count(self) -> int:
+        """
+        :return: Number of edges in the graph
+        """
+        return len(self.sources)
+
+    def edges(self) -> list[tuple[Any, Any]]:
+        """
+        :return: The start and end node of each edge, in the order the edges were added
+        """
+        return [(self.nodes[u], self.nodes[v]) for u, v in zip(self.sources, self.targets)]
+
+    def node_index(self, node) -> int:
+        """
+        :param node: node in the graph
+        :return: the index of the node
+        """
+        return self._node_indices[node]
+
+    def add_node(self, node) -> int:
+        """
+        Adds the node if it is not in the graph. Nodes that are equal to a node in the graph are the same node.
+        :param node: node to add
+        :return: the index of the node
+        """
+        index = self._node_indices.get(node)
+        if index is None:
+            index = len(self.nodes)
+            self._node_indices[node] = index
+            self.nodes.append(node)
+            self._out_edges.append([])
+            self._in_edges.append([])
+        return index
+
+    def add_edge(self, u, v, kind: Enum, prerequisite: Enum, **attributes) -> int:
+        """
+        Adds an edge or adds the prerequisite and kind to the edge that is already present.
+        :param u: Start of edge.
+        :param v: End of edge.
+        :param kind: The kind of constraint the edge comes from.
+        :param prerequisite: The prerequisite that the edge requires.
+        :param attributes: Attributes to update on the edge (override or add).
+        :return: the index of the edge
+        """
+        edge = self.add_edge_by_index(self.add_node(u), self.add_node(v), self.kind_bits[kind], self.prerequisite_bits[prerequisite])
+        if len(attributes) > 0:
+            if edge in self._edge_attributes:
+                self._edge_attributes[edge].update(attributes)
+            else:
+                self._edge_attributes[edge] = attributes
+        return edge
+
+    def add_edge_by_index(self, u: int, v: int, kind_bit: int, prerequisite_bit: int) -> int:
+        """
+        :param u: index of the start of the edge
+        :param v: index of the end of the edge
+        :param kind_bit: the bit of the kind of constraint
+        :param prerequisite_bit: the bit of the prerequisite
+        :return: the index of the edge
+        """
+        edge = self._edge_indices.get((u, v))
+        if edge is None:
+            edge = len(self.sources)
+            self._edge_indices[(u, v)] = edge
+            self.sources.append(u)
+            self.targets.append(v)
+            self.prerequisites.append(prerequisite_bit)
+            self.kinds.append(kind_bit)
+            self._out_edges[u].append(edge)
+            self._in_edges[v].append(edge)
+        else:
+            self.prerequisites[edge] |= prerequisite_bit
+            self.kinds[edge] |= kind_bit
+        return edge
+
+    def has_edge(self, u, v) -> bool:
+        """
+        :param u: Start of edge.
+        :param v: End of edge.
+        :return: True if the edge is in the graph
+        """
+        if u not in self._node_indices or v not in self._node_indices:
+            return False
+        return (self._node_indices[u], self._node_indices[v]) in self._edge_indices
+
+    def edge_index(self, u: int, v: int) -> int:
+        """
+        :param u: index of the start of the edge
+        :param v: index of the end of the edge
+        :return: the index of the edge
+        """
+        return self._edge_indices[(u, v)]
+
+    def edge_attribute(self, edge: int, key: str, default: Any = None) -> Any:
+        """
+        :param edge: index of the edge
+        :param key: name of the attribute
+        :param default: value returned if the edge does not have the attribute
+        :return: the value of the attribute on the edge
+        """
+        if edge not in self._edge_attributes:
+            return default
+        return self._edge_attributes[edge].get(key, default)
+
+    def successors(self, node, kind: Optional[Enum] = None) -> list:
+        """
+        :param node: node in the graph
+        :param kind: if given, only follow edges of this kind of constraint
+        :return: nodes that node has edges to, in the order the edges were added
+        """
+        kind_bit = self.kind_bits[kind] if kind is not None else ~0
+        return [self.nodes[self.targets[e]] for e in self._out_edges[self._node_indices[node]] if self.kinds[e] & kind_bit]
+
+    def predecessors(self, node, kind: Optional[Enum] = None) -> list:
+        """
+        :param node: node in the graph
+        :param kind: if given, only follow edges of this kind of constraint
+        :return: nodes that have edges to node, in the order the edges were added
+        """
+        kind_bit = self.kind_bits[kind] if kind is not None else ~0
+        return [self.nodes[self.sources[e]] for e in self._in_edges[self._node_indices[node]] if self.kinds[e] & kind_bit]
+
+    def successor_indices(self, u: int) -> list[int]:
+        """
+        :param u: index of a node
+        :return: indices of the nodes that u has edges to, in the order the edges were added
+        """
+        targets = self.targets
+        return [targets[e] for e in self._out_edges[u]]
+
+    def predecessor_indices(self, v: int) -> list[int]:
+        """
+        :param v: index of a node
+        :return: indices of the nodes that have edges to v, in the order the edges were added
+        """
+        sources = self.sources
+        return [sources[e] for e in self._in_edges[v]]
+
+    def topological_sort(self, prerequisites: Optional[array] = None) -> Optional[list]:
+        """
+        Sorts the nodes in generations of nodes whose prior nodes are sorted, matching networkx.topological_sort on the same graph.
+        :param prerequisites: prerequisites of each edge to sort by instead of the stored prerequisites. Edges without prerequisites are ignored
+        :return: the sorted nodes or None if the constraints have a cycle
+        """
+        if prerequisites is None:
+            prerequisites = self.prerequisites
+        targets = self.targets
+        in_degrees = [0] * len(self.nodes)
+        for edge, target in enumerate(targets):
+            if prerequisites[edge]:
+                in_degrees[target] += 1
+        out_edges = self._out_edges
+        sorted_indices = [node for node, in_degree in enumerate(in_degrees) if in_degree == 0]
+        generation_start = 0
+        while generation_start < len(sorted_indices):
+            generation_end = len(sorted_indices)
+            for u in sorted_indices[generation_start:generation_end]:
+                for edge in out_edges[u]:
+                    if prerequisites[edge]:
+                        v = targets[edge]
+                        in_degrees[v] -= 1
+                        if in_degrees[v] == 0:
+                            sorted_indices.append(v)
+            generation_start = generation_end
+        if len(sorted_indices) < len(self.nodes):
+            return None
+        return [self.nodes[i] for i in sorted_indices]
+
+    def cyclic_components(self, prerequisites: Optional[array] = None, nodes: Optional[list[int]] = None) -> list[list[int]]:
+        """
+        Finds the strongly connected components that contain a cycle with an iterative form of Tarjan's algorithm.
+        :param prerequisites: prerequisites of each edge to search by instead of the stored prerequisites. Edges without prerequisites are ignored
+        :param nodes: indices of the nodes to search among. Defaults to every node. Edges to other nodes are ignored
+        :return: the node indices in each component that contains a cycle
+        """
+        if prerequisites is None:
+            prerequisites = self.prerequisites
+        if nodes is None:
+            nodes = range(len(self.nodes))
+        members = set(nodes)
+        targets = self.targets
+
+        def _successors(u: int):
+            for edge in self._out_edges[u]:
+                if prerequisites[edge] and targets[edge] in members:
+                    yield targets[edge]
+
+        visit_order: dict[int, int] = {}
+        low_links: dict[int, int] = {}
+        stack: list[int] = []
+        on_stack: set[int] = set()
+        components: list[list[int]] = []
+        for root in nodes:
+            if root in visit_order:
+                continue
+            visit_order[root] = low_links[root] = len(visit_order)
+            stack.append(root)
+            on_stack.add(root)
+            search = [(root, _successors(root))]
+            while len(search) > 0:
+                u, successors = search[-1]
+                for v in successors:
+                    if v not in visit_order:
+                        visit_order[v] = low_links[v] = len(visit_order)
+                        stack.append(v)
+                        on_stack.add(v)
+                        search.append((v, _successors(v)))
+                        break
+                    elif v in on_stack:
+                        low_links[u] = min(low_links[u], visit_order[v])
+                else:  # all successors of u are searched
+                    search.pop()
+                    if len(search) > 0:
+                        parent = search[-1][0]
+                        low_links[parent] = min(low_links[parent], low_links[u])
+                    if low_links[u] == visit_order[u]:
+                        component = []
+                        while True:
+                            w = stack.pop()
+                            on_stack.remove(w)
+                            component.append(w)
+                            if w == u:
+                                break
+                        if len(component) > 1 or u in _successors(u):
+                            components.append(component)
+        return components
+
+    def to_networkx(self, kind: Optional[Enum] = None, prerequisites: Optional[array] = None) -> DiGraph:
+        """
+        Exports the graph for visualization. Edges are labeled with their prerequisites, kinds, and attributes.
+        :param kind: if given, only export edges of this kind of constraint
+        :param prerequisites: prerequisites of each edge to export instead of the stored prerequisites. Edges without prerequisites are left out
+        :return: networkx graph of the constraints
+        """
+        if prerequisites is None:
+            prerequisites = self.prerequisites
+        kind_bit = self.kind_bits[kind] if kind is not None else ~0
+        graph = DiGraph()
+        graph.add_nodes_from(self.nodes)
+        for edge, (u, v) in enumerate(zip(self.sources, self.targets)):
+            if not (self.kinds[edge] & kind_bit) or not prerequisites[edge]:
+                continue
+            edge_prerequisites = {p for p, bit in self.prerequisite_bits.items() if prerequisites[edge] & bit}
+            attributes = {str(p): True for p in edge_prerequisites}
+            attributes.update(self._edge_attributes.get(edge, {}))
+            attributes["prereqs"] = edge_prerequisites
+            attributes["constraint_graphs"] = {k for k, bit in self.kind_bits.items() if self.kinds[edge] & bit}
+            graph.add_edge(self.nodes[u], self.nodes[v], **attributes)
+        return graph
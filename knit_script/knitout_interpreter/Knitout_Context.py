@@ -16,8 +16,12 @@ from knit_script.knitting_machine.machine_specification.Header import Header
 
 class Knitout_Context:
 
-    def __init__(self):
+    def __init__(self, builds_knit_graph: bool = True):
+        """
+        :param builds_knit_graph: If false, the machine state validates the knitout without building a knit graph
+        """
         self._header: Header = Header()
+        self.builds_knit_graph: bool = builds_knit_graph
         self.machine_state: Optional[Machine_State] = None
         self._executed_knitout: list[str] = []
         self.version_line: Optional[Version_Line] = None
@@ -91,7 +95,7 @@ class Knitout_Context:
         :param instructions:
         :return: No-op instructions converted to comments
         """
-        self.machine_state = self._header.machine_state()
+        self.machine_state = self._header.machine_state(self.builds_knit_graph)
         self.carrier_instructions = {c: [] for c in self.machine_state.carrier_system.carriers.values()}
         self.carrier_management_instructions = {c: [] for c in self.machine_state.carrier_system.carriers.values()}
         prior_instruction = None
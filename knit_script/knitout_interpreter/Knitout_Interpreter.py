@@ -12,12 +12,16 @@ class Knitout_Interpreter:
         Interpreter for processing in writing knitout
     """
 
-    def __init__(self, debug_grammar: bool = False, debug_parser: bool = False, debug_parser_layout: bool = False):
+    def __init__(self, debug_grammar: bool = False, debug_parser: bool = False, debug_parser_layout: bool = False, builds_knit_graph: bool = True):
+        """
+        :param builds_knit_graph: If false, knitout is validated on a machine state that does not build a knit graph. Knitout cannot be optimized without a knit graph
+        """
         self._parser = Knitout_Parser(debug_grammar, debug_parser, debug_parser_layout)
-        self.context = Knitout_Context()
+        self._builds_knit_graph: bool = builds_knit_graph
+        self.context = Knitout_Context(builds_knit_graph)
 
     def _reset_context(self):
-        self.context = Knitout_Context()
+        self.context = Knitout_Context(self._builds_knit_graph)
 
     def parse_knitout(self, pattern: str, pattern_is_file: bool = True) -> tuple[Version_Line, list[Header_Declaration], list[Instruction], list[Knitout_Line], list[Knitout_Line]]:
         """
@@ -36,7 +40,30 @@ class Knitout_Interpreter:
         """
         if reset_context:
             self._reset_context()
-        version_line, header_declarations, instructions, knitout_by_lines, comments = self.parse_knitout(pattern, pattern_is_file)
+        return self._execute_parsed_knitout(*self.parse_knitout(pattern, pattern_is_file))
+
+    def interpret_knitout_lines(self, knitout: list[Knitout_Line], reset_context: bool = True) -> List[Knitout_Line]:
+        """
+        Interprets knitout lines that are already in memory without writing and parsing their text
+        :param knitout: knitout lines, possibly already executed on another machine state
+        :param reset_context: If true, reset the context for the file. Starts a new parse.
+        :return: List of knitout lines that make up the program
+        """
+        if reset_context:
+            self._reset_context()
+        return self._execute_parsed_knitout(*self._parser.parse_knitout_lines(knitout))
+
+    def _execute_parsed_knitout(self, version_line: Version_Line, header_declarations: list[Header_Declaration], instructions: list[Instruction],
+                                knitout_by_lines: list[Knitout_Line], comments: list[Knitout_Line]) -> List[Knitout_Line]:
+        """
+        Executes parsed knitout in the context
+        :param version_line: version of the knitout
+        :param header_declarations: header of the knitout
+        :param instructions: instructions to execute
+        :param knitout_by_lines: all parsed lines in order
+        :param comments: lines that are only comments
+        :return: List of knitout lines that make up the program
+        """
         top_comments = []
         last_non_comment = None
         for line in knitout_by_lines:
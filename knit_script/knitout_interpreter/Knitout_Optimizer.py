@@ -1,11 +1,12 @@
 import math
+from array import array
 from enum import Enum
-from typing import Any
 
 import networkx as nx
-from networkx import DiGraph, NetworkXUnfeasible
+from networkx import DiGraph
 
 from knit_script.Knit_Errors.Knitout_Error import Knitout_Error
+from knit_script.knitout_interpreter.Constraint_Store import Constraint_Store
 from knit_script.knitout_interpreter.Knitout_Context import Knitout_Context
 from knit_script.knitout_interpreter.knitout_structures.Carriage_Pass_Instructions import Carriage_Pass_Instructions
 from knit_script.knitout_interpreter.knitout_structures.Knitout_Line import Knitout_Line
@@ -52,6 +53,21 @@ class Instruction_Prerequisite(Enum):
         return str(self)
 
 
+class Constraint_Graph(Enum):
+    """
+    Enumeration of the kinds of constraints held in the optimizer's constraint graph
+    """
+    needles = "needles"
+    yarn = "yarn"
+    passes = "passes"
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return str(self)
+
+
 class Knitout_Optimizer:
     """
         Optimizes Knitout from given context by relationship between instructions and whole carriage passes
@@ -60,56 +76,87 @@ class Knitout_Optimizer:
     def __init__(self, context: Knitout_Context, min_loops_before_release_hook=3, hook_size=4):
         self._hook_size = hook_size
         self._min_loops_before_release_hook = min_loops_before_release_hook
+        assert context.builds_knit_graph, "Cannot optimize knitout that was executed without a knit graph"
         self.context = context
         self.carriage_passes: list[Carriage_Pass_Instructions] = [*self.context.carriage_passes]
         for i, cp in enumerate(self.carriage_passes):
             cp.index = i
-        self.needle_instruction_graph: DiGraph = DiGraph()
-        self.carriage_pass_prerequisites: DiGraph = DiGraph()
-        self.yarn_instruction_graph: DiGraph = DiGraph()
-        self.instructions_to_cp: dict[Knitout_Needle_Instruction, Carriage_Pass_Instructions] = {}
+        # all constraints, each edge is tagged with the kinds of constraints it comes from
+        self.constraint_graph: Constraint_Store = Constraint_Store([*CP_Prerequisite, *Instruction_Prerequisite], [*Constraint_Graph])
+        self._pass_index_by_line: array | None = None
+        self._pass_index_by_instruction: dict[Knitout_Needle_Instruction, int] = {}
         self.instruction_to_next_xfer: dict[Knitout_Needle_Instruction, Carriage_Pass_Instructions | None] = {}
+        self.relaxed_constraints: list[tuple[Carriage_Pass_Instructions | Knitout_Line, Carriage_Pass_Instructions | Knitout_Line, Instruction_Prerequisite]] = []
         self._organize_instructions_in_cp()
         self._add_carriage_pass_edges()
         self._add_stitch_edges()
         self._add_yarn_edges()
 
-    @staticmethod
-    def _add_edge(graph: DiGraph, u, v, list_attributes: dict[str, Any], update_attributes: dict[str, Any]):
+    @property
+    def needle_instruction_graph(self) -> DiGraph:
         """
-        Adds an edge to the graph or updates the attributes if already present.
-        :param graph: Graph to update.
-        :param u: Start of edge.
-        :param v: End of edge.
-        :param list_attributes: Attributes in lists to add to.
-        :param update_attributes: Attributes to update (override or add)
+        :return: Graph of the stitch order constraints between carriage passes
         """
-        if not graph.has_edge(u, v):
-            graph.add_edge(u, v)
-        for key, addition in list_attributes.items():
-            if key not in graph[u][v]:
-                if isinstance(addition, tuple):
-                    cur_values = {}
-                else:
-                    cur_values = set()
-            else:
-                cur_values = graph[u][v][key]
-            if isinstance(cur_values, set):
-                cur_values.add(addition)
-            elif isinstance(cur_values, list):
-                cur_values.append(addition)
-            elif isinstance(cur_values, dict):
-                assert isinstance(addition, tuple)
-                cur_values[addition[0]] = addition[1]
-            update_attributes[key] = cur_values
-        nx.set_edge_attributes(graph, {(u, v): update_attributes})
+        return self._export_constraints(Constraint_Graph.needles)
+
+    @property
+    def yarn_instruction_graph(self) -> DiGraph:
+        """
+        :return: Graph of the yarn management constraints
+        """
+        return self._export_constraints(Constraint_Graph.yarn)
+
+    @property
+    def carriage_pass_prerequisites(self) -> DiGraph:
+        """
+        :return: Graph of the racking and yarn order constraints between carriage passes
+        """
+        return self._export_constraints(Constraint_Graph.passes)
+
+    def _export_constraints(self, constraint: Constraint_Graph | None = None, prerequisites: array | None = None) -> DiGraph:
+        """
+        :param constraint: the kind of constraint to export or None to export all constraints
+        :param prerequisites: prerequisites of each edge to export instead of the constraint graph's prerequisites
+        :return: networkx graph of the constraints with stitch order edges labeled by the loops and instructions that order them
+        """
+        graph = self.constraint_graph.to_networkx(constraint, prerequisites)
+        if constraint is None or constraint is Constraint_Graph.needles:
+            for loop in self.context.machine_state.knit_graph.loops.values():
+                for instruction_1, instruction_2 in zip(loop.instructions[:-1], loop.instructions[1:]):
+                    cp_1 = self.carriage_passes[self._carriage_pass_index(instruction_1)]
+                    cp_2 = self.carriage_passes[self._carriage_pass_index(instruction_2)]
+                    if graph.has_edge(cp_1, cp_2):
+                        edge_data = graph[cp_1][cp_2]
+                        edge_data.setdefault("loops", set()).add(loop)
+                        edge_data.setdefault("prior_instructions", set()).add(instruction_1)
+                        edge_data.setdefault("post_instructions", set()).add(instruction_2)
+        return graph
 
     def _organize_instructions_in_cp(self):
         """
-            Organizes carriage passes based on their instructions for indexing
+            Organizes carriage passes based on their instructions for indexing.
+            Instructions are found by their line numbers unless some instructions do not have unique line numbers
         """
-        for carriage_pass in self.carriage_passes:
-            self.instructions_to_cp.update({instruction: carriage_pass for instruction in carriage_pass})
+        line_numbers = [instruction.original_line_number for carriage_pass in self.carriage_passes for instruction in carriage_pass]
+        if None not in line_numbers and len(set(line_numbers)) == len(line_numbers):
+            self._pass_index_by_line = array('l', [-1]) * (max(line_numbers, default=-1) + 1)
+            for carriage_pass in self.carriage_passes:
+                for instruction in carriage_pass:
+                    self._pass_index_by_line[instruction.original_line_number] = carriage_pass.index
+        else:
+            for carriage_pass in self.carriage_passes:
+                self._pass_index_by_instruction.update({instruction: carriage_pass.index for instruction in carriage_pass})
+
+    def _carriage_pass_index(self, instruction: Knitout_Needle_Instruction) -> int:
+        """
+        :param instruction: an instruction in a carriage pass
+        :return: the index of the carriage pass that holds the instruction
+        """
+        if self._pass_index_by_line is None:
+            return self._pass_index_by_instruction[instruction]
+        pass_index = self._pass_index_by_line[instruction.original_line_number]
+        assert pass_index >= 0, f"{instruction} is not in a carriage pass"
+        return pass_index
 
     def _add_carriage_pass_edges(self):
         """
@@ -122,13 +169,11 @@ class Knitout_Optimizer:
             rack_instruction.comment = f"Racked for carriage pass {carriage_pass.index}"
             if rack_instruction.rack != last_rack_instruction.rack:
                 if prior_pass is not None:
-                    self._add_edge(self.carriage_pass_prerequisites, prior_pass, rack_instruction,
-                                   list_attributes={"prereqs": Instruction_Prerequisite.rack_used}, update_attributes={str(Instruction_Prerequisite.rack_used): True})
+                    self.constraint_graph.add_edge(prior_pass, rack_instruction, Constraint_Graph.passes, Instruction_Prerequisite.rack_used)
                 last_rack_instruction = rack_instruction
-            self._add_edge(self.carriage_pass_prerequisites, last_rack_instruction, carriage_pass,
-                           list_attributes={"prereqs": CP_Prerequisite.rack_to}, update_attributes={str(CP_Prerequisite.rack_to): True})
+            self.constraint_graph.add_edge(last_rack_instruction, carriage_pass, Constraint_Graph.passes, CP_Prerequisite.rack_to)
             # if prior_pass is not None:
-            #     self._add_edge(self.carriage_pass_prerequisites, prior_pass)
+            #     self.constraint_graph.add_edge(prior_pass, carriage_pass, Constraint_Graph.passes, ...)
             prior_pass = carriage_pass
 
     def _add_yarn_edges(self):
@@ -165,8 +210,7 @@ class Knitout_Optimizer:
             for instruction in instructions:
                 if isinstance(instruction, Inhook_Instruction):
                     if isinstance(current_in, Inhook_Instruction):
-                        self._add_edge(self.yarn_instruction_graph, release, instruction,
-                                       list_attributes={"prereqs": Instruction_Prerequisite.hook_available}, update_attributes={str(Instruction_Prerequisite.hook_available): True, "yarn": carrier})
+                        self.constraint_graph.add_edge(release, instruction, Constraint_Graph.yarn, Instruction_Prerequisite.hook_available, yarn=carrier)
                     current_in = instruction
                     yarn_knit = False
                     release = Releasehook_Instruction(current_in.carrier_set)
@@ -177,128 +221,121 @@ class Knitout_Optimizer:
                     current_in = instruction
                     yarn_knit = False
                 elif isinstance(instruction, Knitout_Needle_Instruction):
-                    carriage_pass = self.instructions_to_cp[instruction]
+                    carriage_pass = self.carriage_passes[self._carriage_pass_index(instruction)]
                     if isinstance(current_in, Inhook_Instruction) and current_in not in inhook_to_first_carriage_passes:
                         inhook_to_first_carriage_passes[current_in] = carriage_pass
                         carriage_pass_to_inhook[carriage_pass] = current_in
                     if last_involved_pass is not None and last_involved_pass != carriage_pass:
-                        self._add_edge(self.carriage_pass_prerequisites, last_involved_pass, carriage_pass,
-                                       list_attributes={"prereqs": CP_Prerequisite.yarn_order}, update_attributes={str(CP_Prerequisite.yarn_order): True, "yarn": carrier})
+                        self.constraint_graph.add_edge(last_involved_pass, carriage_pass, Constraint_Graph.passes, CP_Prerequisite.yarn_order, yarn=carrier)
                     last_involved_pass = carriage_pass
                     assert current_in is not None, f"No in operation for {carrier} before {instruction}"
                     if not yarn_knit:
-                        self._add_edge(self.yarn_instruction_graph, current_in, carriage_pass,
-                                       list_attributes={"prereqs": CP_Prerequisite.yarn_available}, update_attributes={str(CP_Prerequisite.yarn_available): True, "yarn": carrier})
+                        self.constraint_graph.add_edge(current_in, carriage_pass, Constraint_Graph.yarn, CP_Prerequisite.yarn_available, yarn=carrier)
                         yarn_knit = True
                     if not release_satisfied:  # releasehook prerequisites have not been satisfied
                         if inhook_direction_set_pass is None:  # first knitting pass found before after inhook
                             inhook_direction_set_pass = carriage_pass
                         if loops_to_release > 0:
                             loops_to_release -= 1
-                            self._add_edge(self.yarn_instruction_graph, carriage_pass, release,
-                                           list_attributes={"prereqs": Instruction_Prerequisite.stable_yarn},
-                                           update_attributes={str(Instruction_Prerequisite.stable_yarn): True, "yarn": carrier, "remaining_loops": loops_to_release})
+                            self.constraint_graph.add_edge(carriage_pass, release, Constraint_Graph.yarn, Instruction_Prerequisite.stable_yarn, yarn=carrier, remaining_loops=loops_to_release)
 
                         elif inhook_direction_set_pass == carriage_pass or inhook_direction_set_pass.direction == carriage_pass.direction.opposite():  # inhook direction does not match yet
-                            self._add_edge(self.yarn_instruction_graph, carriage_pass, release,
-                                           list_attributes={"prereqs": Instruction_Prerequisite.hook_direction},
-                                           update_attributes={str(Instruction_Prerequisite.hook_direction): True, "yarn": carrier})
+                            self.constraint_graph.add_edge(carriage_pass, release, Constraint_Graph.yarn, Instruction_Prerequisite.hook_direction, yarn=carrier)
                         else:  # sufficient loops found, inhook direction matches
-                            self._add_edge(self.yarn_instruction_graph, release, carriage_pass,
-                                           list_attributes={"prereqs": CP_Prerequisite.matches_hook_direction}, update_attributes={str(CP_Prerequisite.matches_hook_direction): True, "yarn": carrier})
+                            self.constraint_graph.add_edge(release, carriage_pass, Constraint_Graph.yarn, CP_Prerequisite.matches_hook_direction, yarn=carrier)
                             inhook_direction_set_pass = None  # inhook satisfied
                             release_satisfied = True  # yarn stable and inhook satisfied
                 elif isinstance(instruction, Outhook_Instruction):
-                    self._add_edge(self.yarn_instruction_graph, current_in, instruction,
-                                   list_attributes={"prereqs": Instruction_Prerequisite.in_before_out}, update_attributes={str(Instruction_Prerequisite.in_before_out): True, "yarn": carrier})
-                    self._add_edge(self.yarn_instruction_graph, release, instruction,
-                                   list_attributes={"prereqs": Instruction_Prerequisite.hook_available}, update_attributes={str(Instruction_Prerequisite.hook_available): True, "yarn": carrier})
+                    self.constraint_graph.add_edge(current_in, instruction, Constraint_Graph.yarn, Instruction_Prerequisite.in_before_out, yarn=carrier)
+                    self.constraint_graph.add_edge(release, instruction, Constraint_Graph.yarn, Instruction_Prerequisite.hook_available, yarn=carrier)
                     if last_involved_pass is not None:
-                        self._add_edge(self.yarn_instruction_graph, last_involved_pass, instruction,
-                                       list_attributes={"prereqs": Instruction_Prerequisite.yarn_used}, update_attributes={str(Instruction_Prerequisite.yarn_used): True, "yarn": carrier})
+                        self.constraint_graph.add_edge(last_involved_pass, instruction, Constraint_Graph.yarn, Instruction_Prerequisite.yarn_used, yarn=carrier)
                     _reset_yarn()
                 elif isinstance(instruction, Out_Instruction):
-                    self._add_edge(self.yarn_instruction_graph, current_in, instruction,
-                                   list_attributes={"prereqs": Instruction_Prerequisite.in_before_out}, update_attributes={str(Instruction_Prerequisite.in_before_out): True, "yarn": carrier})
+                    self.constraint_graph.add_edge(current_in, instruction, Constraint_Graph.yarn, Instruction_Prerequisite.in_before_out, yarn=carrier)
                     if last_involved_pass is not None:
-                        self._add_edge(self.yarn_instruction_graph, last_involved_pass, instruction,
-                                       list_attributes={"prereqs": Instruction_Prerequisite.yarn_used}, update_attributes={str(Instruction_Prerequisite.yarn_used): True, "yarn": carrier})
+                        self.constraint_graph.add_edge(last_involved_pass, instruction, Constraint_Graph.yarn, Instruction_Prerequisite.yarn_used, yarn=carrier)
                     _reset_yarn()
 
+        next_xfer_passes = self._find_next_xfer_passes()
         for inhook, release in inhook_to_release.items():
-            merged_graph = self._merge_graphs()
-            next_xfer, distance = self._find_next_xfer_pass(inhook, merged_graph)
+            next_xfer, distance = self._next_xfer_pass(self.constraint_graph.node_index(inhook), next_xfer_passes)
             if next_xfer is not None:
-                self._add_edge(self.yarn_instruction_graph, release, next_xfer, list_attributes={"prereqs": CP_Prerequisite.xfer_after_release},
-                               update_attributes={str(CP_Prerequisite.xfer_after_release): True, "yarn": release.carrier_set})
+                self.constraint_graph.add_edge(release, next_xfer, Constraint_Graph.yarn, CP_Prerequisite.xfer_after_release, yarn=release.carrier_set)
 
         for inhook, carriage_pass in inhook_to_first_carriage_passes.items():
-            for predecessor in self.needle_instruction_graph.predecessors(carriage_pass):
+            for predecessor in self.constraint_graph.predecessors(carriage_pass, Constraint_Graph.needles):
                 if isinstance(predecessor, Carriage_Pass_Instructions):
                     pred_inhook = carriage_pass_to_inhook[predecessor]
                     if pred_inhook != inhook:
-                        # self._add_edge(self.yarn_instruction_graph, predecessor, inhook,
-                        #                list_attributes={"prereqs": Instruction_Prerequisite.hook_available},
-                        #                update_attributes={str(Instruction_Prerequisite.hook_available): True, "yarn": inhook.carrier_set})
-                        self._add_edge(self.yarn_instruction_graph, inhook_to_release[pred_inhook], inhook,
-                                       list_attributes={"prereqs": Instruction_Prerequisite.hook_available},
-                                       update_attributes={str(Instruction_Prerequisite.hook_available): True, "yarn": inhook.carrier_set})
+                        # self.constraint_graph.add_edge(predecessor, inhook, Constraint_Graph.yarn, Instruction_Prerequisite.hook_available, yarn=inhook.carrier_set)
+                        self.constraint_graph.add_edge(inhook_to_release[pred_inhook], inhook, Constraint_Graph.yarn, Instruction_Prerequisite.hook_available, yarn=inhook.carrier_set)
 
     def _add_stitch_edges(self):
         """
             Add edges by stitch constraints per loop
         """
+        constraint_bit = self.constraint_graph.kind_bits[Constraint_Graph.needles]
+        prerequisite_bit = self.constraint_graph.prerequisite_bits[CP_Prerequisite.stitch_order]
+        pass_nodes = [self.constraint_graph.add_node(carriage_pass) for carriage_pass in self.carriage_passes]
         for loop in self.context.machine_state.knit_graph.loops.values():
             loop_instructions = loop.instructions
             assert len(loop_instructions) > 0
             first_instruction = loop_instructions[0]
             assert isinstance(first_instruction, Loop_Making_Instruction), f"Loop is {first_instruction} before it is made by knit, tuck, or split"
-            self.needle_instruction_graph.add_node(self.instructions_to_cp[first_instruction])
-            for instruction_1, instruction_2 in zip(loop_instructions[:-1], loop_instructions[1:]):
-                cp_1 = self.instructions_to_cp[instruction_1]
-                cp_2 = self.instructions_to_cp[instruction_2]
-                self._add_edge(self.needle_instruction_graph, cp_1, cp_2,
-                               list_attributes={"loops": loop, "prereqs": CP_Prerequisite.stitch_order, "prior_instructions": instruction_1, "post_instructions": instruction_2},
-                               update_attributes={str(CP_Prerequisite.stitch_order): True})
-
-    def _find_next_xfer_pass(self, start_node: Carriage_Pass_Instructions | Knitout_Line,
-                             graph: DiGraph | None,
-                             prior_results: dict[Knitout_Line | Carriage_Pass_Instructions, tuple[None | Carriage_Pass_Instructions, int]] = None) -> tuple[None | Carriage_Pass_Instructions, int]:
+            prior_node = pass_nodes[self._carriage_pass_index(first_instruction)]
+            for instruction in loop_instructions[1:]:
+                node = pass_nodes[self._carriage_pass_index(instruction)]
+                self.constraint_graph.add_edge_by_index(prior_node, node, constraint_bit, prerequisite_bit)
+                prior_node = node
+
+    def _find_next_xfer_passes(self) -> dict[int, tuple[None | Carriage_Pass_Instructions, int]]:
+        """
+        Finds the closest xfer pass that must follow each carriage pass.
+        Carriage passes are resolved in reverse topological order, so every pass is found from its resolved successors in one sweep.
+        :return: Dictionary of the node index of each carriage pass to the closest following xfer pass, or None if there is none, and the distance to that xfer pass
+        """
+        graph = self.constraint_graph
+        is_pass = [isinstance(node, Carriage_Pass_Instructions) for node in graph.nodes]
+        unresolved_successors: dict[int, int] = {}
+        for node, node_is_pass in enumerate(is_pass):
+            if node_is_pass:
+                unresolved_successors[node] = sum(1 for successor in graph.successor_indices(node) if is_pass[successor])
+        resolvable = [node for node, count in unresolved_successors.items() if count == 0]
+        next_xfer_passes: dict[int, tuple[None | Carriage_Pass_Instructions, int]] = {}
+        while len(resolvable) > 0:
+            node = resolvable.pop()
+            carriage_pass = graph.nodes[node]
+            if carriage_pass.is_xfer_pass:
+                next_xfer_passes[node] = carriage_pass, 0
+            else:
+                next_xfer_passes[node] = self._next_xfer_pass(node, next_xfer_passes)
+            for predecessor in graph.predecessor_indices(node):
+                if is_pass[predecessor]:
+                    unresolved_successors[predecessor] -= 1
+                    if unresolved_successors[predecessor] == 0:
+                        resolvable.append(predecessor)
+        if len(next_xfer_passes) < len(unresolved_successors):
+            raise Knitout_Error("Cannot order carriage passes with cyclic constraints")
+        return next_xfer_passes
+
+    def _next_xfer_pass(self, node: int, next_xfer_passes: dict[int, tuple[None | Carriage_Pass_Instructions, int]]) -> tuple[None | Carriage_Pass_Instructions, int]:
         """
-        Recursive function from start_node
-        :param start_node: the node to start searching from
-        :return: None or the xfer pass found, the distance to the xfer pass
+        :param node: the node index to search from
+        :param next_xfer_passes: the closest xfer pass following each carriage pass that succeeds the node
+        :return: None or the closest xfer pass that follows a carriage pass succeeding the node, the distance to the xfer pass
         """
-        if prior_results is None:
-            prior_results = {}
-        elif start_node in prior_results:
-            return prior_results[start_node]
-        if isinstance(start_node, Carriage_Pass_Instructions) and start_node.is_xfer_pass:
-            prior_results[start_node] = start_node, 0
-            return start_node, 0
-        assert start_node in graph, f"Start Node is not included in graph structure"
         selected_xfer = None
         min_distance = math.inf
-        for successor in graph.successors(start_node):
-            if isinstance(successor, Carriage_Pass_Instructions):
-                next_xfer, distance = self._find_next_xfer_pass(successor, graph=graph, prior_results=prior_results)
+        for successor in self.constraint_graph.successor_indices(node):
+            if successor in next_xfer_passes:
+                next_xfer, distance = next_xfer_passes[successor]
                 if next_xfer is not None and distance < min_distance:
                     min_distance = distance
                     selected_xfer = next_xfer
         if selected_xfer is None:
-            prior_results[start_node] = None, 0
             return None, 0
-        else:
-            prior_results[start_node] = selected_xfer, min_distance + 1
-            return selected_xfer, min_distance + 1
-
-    def _merge_graphs(self) -> DiGraph:
-        """
-        :return: A graph that merges all the constraint graphs
-        """
-        yarn_and_needle = nx.compose(self.yarn_instruction_graph, self.needle_instruction_graph)
-        all_graph = nx.compose(yarn_and_needle, self.carriage_pass_prerequisites)
-        return all_graph
+        return selected_xfer, min_distance + 1
 
     @staticmethod
     def _visualize_graph(graph: DiGraph, output_name: str = "knitout_graph"):
@@ -329,62 +366,69 @@ class Knitout_Optimizer:
         if cp:
             self._visualize_graph(self.carriage_pass_prerequisites, f"passes_{output_name}")
         if merged_graphs:
-            self._visualize_graph(self._merge_graphs(), f"{output_name}_merged")
+            self._visualize_graph(self._export_constraints(), f"{output_name}_merged")
 
-    @staticmethod
-    def _reduce_release_direction_constraint(merged_graph: DiGraph) -> DiGraph:
-        hook_direction_edges = []
-        for u, v, is_hook_direction in merged_graph.edges(data=str(Instruction_Prerequisite.hook_direction), default=False):
-            if is_hook_direction:
-                prereqs = merged_graph[u][v]['prereqs']
-                prereqs.remove(Instruction_Prerequisite.hook_direction)
-                if len(prereqs) == 0:
-                    hook_direction_edges.append((u, v))
-        merged_graph.remove_edges_from(hook_direction_edges)
-        return merged_graph
+    def _relaxation_levels(self) -> list[tuple[Instruction_Prerequisite, int | None]]:
+        """
+        :return: The prerequisites that can be relaxed to break cycles, from lowest to highest priority.
+         Stable yarn prerequisites are relaxed for the loops closest to the releasehook first, given by the number of remaining loops that can be relaxed
+        """
+        levels: list[tuple[Instruction_Prerequisite, int | None]] = [(Instruction_Prerequisite.hook_direction, None)]
+        levels.extend((Instruction_Prerequisite.stable_yarn, reduction) for reduction in range(1, self._min_loops_before_release_hook))
+        return levels
 
-    @staticmethod
-    def _reduce_stable_loop_constraint(merged_graph: DiGraph, reduction=1) -> DiGraph:
-        stabilizing_edges = []
-        for u, v, stable_yarn in merged_graph.edges(data=str(Instruction_Prerequisite.stable_yarn), default=False):
-            if stable_yarn:
-                remaining_loops = merged_graph[u][v]["remaining_loops"]
-                if remaining_loops < reduction:
-                    prereqs = merged_graph[u][v]['prereqs']
-                    prereqs.remove(Instruction_Prerequisite.stable_yarn)
-                    if len(prereqs) == 0:
-                        stabilizing_edges.append((u, v))
-        merged_graph.remove_edges_from(stabilizing_edges)
-        return merged_graph
+    def _relax_cycles(self, visualize: bool = False) -> array:
+        """
+        Breaks the cycles in the constraint graph by relaxing the lowest priority prerequisites on the edges in each cycle.
+        Other edges keep all of their prerequisites. Relaxed constraints are recorded in relaxed_constraints.
+        :param visualize: If true, outputs the constraint graph after each level of relaxation
+        :return: the prerequisites of each edge after relaxation
+        """
+        graph = self.constraint_graph
+        prerequisites = array('L', graph.prerequisites)
+        cyclic_components = graph.cyclic_components(prerequisites)
+        for prerequisite, reduction in self._relaxation_levels():
+            if len(cyclic_components) == 0:
+                break
+            prerequisite_bit = graph.prerequisite_bits[prerequisite]
+            remaining_components = []
+            for component in cyclic_components:
+                members = set(component)
+                for u in component:
+                    for v in graph.successor_indices(u):
+                        if v in members:
+                            edge = graph.edge_index(u, v)
+                            if prerequisites[edge] & prerequisite_bit and (reduction is None or graph.edge_attribute(edge, "remaining_loops") < reduction):
+                                prerequisites[edge] &= ~prerequisite_bit
+                                self.relaxed_constraints.append((graph.nodes[u], graph.nodes[v], prerequisite))
+                remaining_components.extend(graph.cyclic_components(prerequisites, component))
+            cyclic_components = remaining_components
+            if visualize:
+                if reduction is None:
+                    self._visualize_graph(self._export_constraints(prerequisites=prerequisites), f"hook_direction_constraint_reduced")
+                else:
+                    self._visualize_graph(self._export_constraints(prerequisites=prerequisites), f"stable_constraint_reduced_by_{reduction}")
+        if len(cyclic_components) > 0:
+            raise Knitout_Error("Cannot optimize releasehook and rack placement with reduced constraints")
+        return prerequisites
 
     def optimize(self, visualize: bool = False) -> list[Knitout_Line]:
         """
+        Constraints that form cycles are relaxed and recorded in relaxed_constraints
+        :param visualize: If true, outputs the constraint graph after each level of relaxation
         :return: Knitout instructions optimized with topological sorted instruction constraints
         """
-        sorted_instructions = None
-        graphs = self._merge_graphs()
-        try:
-            sorted_instructions = [*nx.topological_sort(graphs)]
-        except NetworkXUnfeasible as _e:
-            print(f"Knitout Warning: Releasehook must happen before another operations. Reducing constraints on releasehook direction")
-            graphs = self._reduce_release_direction_constraint(graphs)
-            if visualize:
-                self._visualize_graph(graphs, f"hook_direction_constraint_reduced")
-            try:
-                sorted_instructions = [*nx.topological_sort(graphs)]
-            except NetworkXUnfeasible as _e:
-                for i in range(1, self._min_loops_before_release_hook):
-                    graphs = self._reduce_stable_loop_constraint(graphs, i)
-                    if visualize:
-                        self._visualize_graph(graphs, f"stable_constraint_reduced_by_{i}")
-                    try:
-                        sorted_instructions = [*nx.topological_sort(graphs)]
-                        print(f"Knitout Warning: Releasehook must happen before last {i} stabilizing loops. Yarn may be unstable")
-                        break
-                    except NetworkXUnfeasible as _e:
-                        continue
+        self.relaxed_constraints = []
+        sorted_instructions = self.constraint_graph.topological_sort()
         if sorted_instructions is None:
-            raise Knitout_Error("Cannot optimize releasehook and rack placement with reduced constraints")
+            prerequisites = self._relax_cycles(visualize)
+            for u, v, prerequisite in self.relaxed_constraints:
+                if prerequisite is Instruction_Prerequisite.hook_direction:
+                    print(f"Knitout Warning: Releasehook must happen before other operations. Relaxed releasehook direction constraint from {u.id_str().strip()} to {v.id_str().strip()}")
+                else:
+                    print(f"Knitout Warning: Releasehook must happen before stabilizing loops. Yarn may be unstable. Relaxed stable yarn constraint from {u.id_str().strip()} to {v.id_str().strip()}")
+            sorted_instructions = self.constraint_graph.topological_sort(prerequisites)
+        assert sorted_instructions is not None, "Relaxed constraints must be acyclic"
         clean_instructions = [self.context.version_line]
         clean_instructions.extend(self.context.executed_header)
         current_rack = 0
@@ -1,12 +1,11 @@
 """Parser code for accessing Parglare language support"""
-import re
-
-import importlib_resources
 import parglare.exceptions
-from parglare import Parser, Grammar
+from parglare import Parser
 
 import knit_script
+from knit_script.grammar_cache import get_parser
 from knit_script.knitout_interpreter.knitout_actions import action
+from knit_script.knitout_interpreter.knitout_fast_path import decode_line, clone_line
 from knit_script.knitout_interpreter.knitout_structures.Knitout_Line import Knitout_Line, Version_Line
 from knit_script.knitout_interpreter.knitout_structures.header_operations.Header_Declaration import Header_Declaration
 from knit_script.knitout_interpreter.knitout_structures.knitout_instructions.instruction import Instruction
@@ -18,15 +17,15 @@ class Knitout_Parser:
     """
 
     def __init__(self, debug_grammar: bool = False, debug_parser: bool = False, debug_parser_layout: bool = False):
-        pg_resource_stream = importlib_resources.files(knit_script.knitout_interpreter).joinpath('knitout.pg')
-        self._grammar: Grammar = Grammar.from_file(pg_resource_stream, debug=debug_grammar, ignore_case=True)
-        self._set_parser(debug_parser, debug_parser_layout)
+        self._set_parser(debug_parser, debug_parser_layout, debug_grammar)
 
-    def _set_parser(self, debug_parser: bool, debug_parser_layout: bool):
-        self._parser: Parser = Parser(self._grammar, debug=debug_parser, debug_layout=debug_parser_layout, actions=action.all)
+    def _set_parser(self, debug_parser: bool, debug_parser_layout: bool, debug_grammar: bool = False):
+        # newlines separate code lines in the grammar, so they are not skipped as whitespace
+        self._parser: Parser = get_parser(knit_script.knitout_interpreter, 'knitout.pg', action.all, debug_grammar, debug_parser, debug_parser_layout, ws='\r\t ')
         self._parser.knitout_parser = self  # make this structure available from actions
 
-    def parse(self, pattern: str, pattern_is_file: bool = False, reset_parser: bool = True, debug_parser: bool = False, debug_parser_layout: bool = False) -> \
+    def parse(self, pattern: str, pattern_is_file: bool = False, reset_parser: bool = True, debug_parser: bool = False, debug_parser_layout: bool = False,
+              batch_size: int = 1000, fast_path: bool = True) -> \
             tuple[Version_Line, list[Header_Declaration], list[Instruction], list[Knitout_Line], list[Knitout_Line]]:
         """
         Executes the parsing code for the parglare parser
@@ -35,27 +34,54 @@ class Knitout_Parser:
         :param reset_parser: resets parser to have no prior input
         :param pattern: Either a file or the knitout string to be parsed
         :param pattern_is_file: if true, assumes that the pattern is parsed from a file
+        :param batch_size: number of lines parsed by each call to the parser
+        :param fast_path: if true, common needle operations are decoded without the parser
         :return: version, header, instructions
         """
-        version = Version_Line(-1)
-        head = []
-        instructions = []
-        comments = []
-        codes = []
         if reset_parser:
             self._set_parser(debug_parser, debug_parser_layout)
         if pattern_is_file:
             with open(pattern, "r") as pattern_file:
-                lines = pattern_file.readlines()
+                lines = pattern_file.read().split("\n")
         else:
             lines = pattern.splitlines()
-        for i, line in enumerate(lines):
-            if not re.match(r'^\s*$', line):
-                try:
-                    code = self._parser.parse(line)
-                except parglare.exceptions.ParseError as e:
-                    print(f"Parser Error on {i}: {line}")
-                    raise e
+        return self._parse_lines(lines, batch_size, fast_path)
+
+    def parse_knitout_lines(self, knitout: list[Knitout_Line], batch_size: int = 1000) -> \
+            tuple[Version_Line, list[Header_Declaration], list[Instruction], list[Knitout_Line], list[Knitout_Line]]:
+        """
+        Produces the same results as parsing the text of the given knitout lines.
+        Lines are cloned directly where possible and only the remaining lines are written as text and parsed.
+        :param knitout: knitout lines, possibly already executed on a machine state
+        :param batch_size: number of lines parsed by each call to the parser
+        :return: version, header, instructions
+        """
+        lines: list[str | Knitout_Line] = []
+        for knitout_line in knitout:
+            clone = clone_line(knitout_line)
+            if clone is None:
+                lines.extend(str(knitout_line).splitlines())
+            else:
+                lines.append(clone)
+        return self._parse_lines(lines, batch_size, fast_path=True)
+
+    def _parse_lines(self, lines: list[str | Knitout_Line], batch_size: int, fast_path: bool) -> \
+            tuple[Version_Line, list[Header_Declaration], list[Instruction], list[Knitout_Line], list[Knitout_Line]]:
+        """
+        :param lines: lines of knitout text or knitout lines that were already decoded
+        :param batch_size: number of lines parsed by each call to the parser
+        :param fast_path: if true, common needle operations are decoded without the parser
+        :return: version, header, instructions
+        """
+        version = Version_Line(-1)
+        head = []
+        instructions = []
+        comments = []
+        codes = []
+        for batch_start in range(0, len(lines), batch_size):
+            batch = lines[batch_start: batch_start + batch_size]
+            batch_codes = self._parse_batch(batch, batch_start, fast_path)
+            for i, code in enumerate(batch_codes, start=batch_start):
                 if code is None:
                     continue
                 else:
@@ -74,3 +100,36 @@ class Knitout_Parser:
         if version.version < 0:
             version = Version_Line(2, "Version defaulted to 2")
         return version, head, instructions, codes, comments
+
+    def _parse_batch(self, batch: list[str | Knitout_Line], batch_start: int, fast_path: bool) -> list[Knitout_Line | None]:
+        """
+        Parses a batch of lines with one call to the parser
+        :param batch: the lines to parse. Lines that were already decoded are kept
+        :param batch_start: the line number of the first line in the batch
+        :param fast_path: if true, lines decoded by the fast path are not given to the parser
+        :return: the code parsed from each line in the batch, None for lines without code
+        """
+        batch_codes: list[Knitout_Line | None] = [None for _ in batch]
+        parsed_indices = []
+        for i, line in enumerate(batch):
+            if isinstance(line, Knitout_Line):
+                batch_codes[i] = line
+                continue
+            elif fast_path:
+                decoded, code = decode_line(line)
+                if decoded:
+                    batch_codes[i] = code
+                    continue
+            parsed_indices.append(i)
+        if len(parsed_indices) == 0:
+            return batch_codes
+        try:
+            parsed_codes = self._parser.parse("\n".join(batch[i] for i in parsed_indices))
+        except parglare.exceptions.ParseError as e:
+            i = batch_start + parsed_indices[e.location.line - 1]
+            print(f"Parser Error on {i}: {batch[i - batch_start]}")
+            raise e
+        assert len(parsed_codes) == len(parsed_indices), f"Parsed {len(parsed_codes)} lines from a batch of {len(parsed_indices)} lines"
+        for i, code in zip(parsed_indices, parsed_codes):
+            batch_codes[i] = code
+        return batch_codes
@@ -31,6 +31,21 @@ def comment(_, __, content: Optional[str]) -> Optional[str]:
     return content
 
 
+@action
+def code_lines(_, __, line: Optional[Knitout_Line], lines: Optional[List[Optional[Knitout_Line]]] = None) -> List[Optional[Knitout_Line]]:
+    """
+    :param _: The parser element that created this value
+    :param __:
+    :param line: the code parsed from the last line, None for blank lines
+    :param lines: the code parsed from prior lines
+    :return: the code in line order so that list index matches the line index
+    """
+    if lines is None:
+        return [line]
+    lines.append(line)
+    return lines
+
+
 @action
 def code_line(_, __, c: Optional[Knitout_Line], com: Optional[str]) -> Optional[Knitout_Line]:
     if c is None:
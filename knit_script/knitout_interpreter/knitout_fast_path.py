@@ -0,0 +1,177 @@
+"""Regular expression decoder for common knitout lines that bypasses the parglare parser"""
+import re
+from typing import Optional
+
+from knit_script.knitout_interpreter.knitout_actions import code_line, knit_op, tuck_op, miss_op, split_op, drop_op, xfer_op, rack_op, needle_id, int_exp, float_exp, carrier_set, \
+    amiss_op, in_op, inhook_op, releasehook_op, out_op, outhook_op
+from knit_script.knitout_interpreter.knitout_structures.Knitout_Line import Knitout_Line, Comment_Line
+from knit_script.knitout_interpreter.knitout_structures.knitout_instructions.Rack_Instruction import Rack_Instruction
+from knit_script.knitout_interpreter.knitout_structures.knitout_instructions.carrier_instructions import Carrier_Instruction
+from knit_script.knitout_interpreter.knitout_structures.knitout_instructions.instruction import Instruction_Type
+from knit_script.knitout_interpreter.knitout_structures.knitout_instructions.needle_instructions import Knitout_Needle_Instruction
+from knit_script.knitting_machine.machine_components.needles import Needle, Slider_Needle
+from knit_script.knitting_machine.machine_components.yarn_management.Carrier_Set import Carrier_Set
+
+# Whitespace skipped by the knitout parser. Newlines never appear within a line
+_ws = r"[ \t\r]"
+_needle = r"([fb]s?[0-9]+)"
+_carriers = rf"(-?[0-9]+(?:{_ws}+-?[0-9]+)*)"
+_comment = rf"{_ws}*(?:;{_ws}*(.*))?"
+_float = r"((?=-?\.?[0-9])-?[0-9]*(?:\.?[0-9]+)?)"
+
+_blank_line = re.compile(rf"{_ws}*")
+_comment_line = re.compile(rf"{_ws}*;(?![;!]){_ws}*(.*)")
+_carriage_line = re.compile(rf"{_ws}*(knit|tuck|miss){_ws}+([+-]){_ws}+{_needle}{_ws}+{_carriers}{_comment}")
+_split_line = re.compile(rf"{_ws}*split{_ws}+([+-]){_ws}+{_needle}{_ws}+{_needle}{_ws}+{_carriers}{_comment}")
+_xfer_line = re.compile(rf"{_ws}*xfer{_ws}+{_needle}{_ws}+{_needle}{_comment}")
+_drop_line = re.compile(rf"{_ws}*drop{_ws}+{_needle}{_comment}")
+_rack_line = re.compile(rf"{_ws}*rack{_ws}+{_float}{_comment}")
+
+_carriage_ops = {"knit": knit_op, "tuck": tuck_op, "miss": miss_op}
+
+# Characters that str.splitlines() breaks on. Lines containing these are split differently when written as text
+_line_breaks = re.compile("[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+_float_value = re.compile(_float)
+_carrier_ops = {Instruction_Type.In: in_op, Instruction_Type.Inhook: inhook_op, Instruction_Type.Releasehook: releasehook_op,
+                Instruction_Type.Out: out_op, Instruction_Type.Outhook: outhook_op}
+
+
+def _comment_content(content: Optional[str]) -> Optional[str]:
+    """
+    :param content: text following the comment marker, None if there is no comment
+    :return: the comment as reduced by the parser, which drops empty comments
+    """
+    if content == "":
+        return None
+    return content
+
+
+def _carrier_set(carriers: str):
+    return carrier_set(None, None, [int_exp(None, c) for c in carriers.split()])
+
+
+def decode_line(line: str) -> tuple[bool, Optional[Knitout_Line]]:
+    """
+    Decodes blank lines, comment lines, and knit, tuck, miss, split, xfer, drop, and rack instructions.
+    Values are built by the knitout parser's actions, so decoded lines are identical to parsed lines.
+    :param line: a single line of knitout
+    :return: True if the line was decoded, and the decoded knitout line or None if the line has no code
+    """
+    match = _carriage_line.fullmatch(line)
+    if match is not None:
+        op, direction, needle, carriers, comment = match.groups()
+        code = _carriage_ops[op](None, None, direction, needle_id(None, needle), _carrier_set(carriers))
+        return True, code_line(None, None, code, _comment_content(comment))
+    match = _xfer_line.fullmatch(line)
+    if match is not None:
+        needle, needle_2, comment = match.groups()
+        code = xfer_op(None, None, needle_id(None, needle), needle_id(None, needle_2))
+        return True, code_line(None, None, code, _comment_content(comment))
+    match = _rack_line.fullmatch(line)
+    if match is not None:
+        racking, comment = match.groups()
+        return True, code_line(None, None, rack_op(None, None, float_exp(None, racking)), _comment_content(comment))
+    match = _split_line.fullmatch(line)
+    if match is not None:
+        direction, needle, needle_2, carriers, comment = match.groups()
+        code = split_op(None, None, direction, needle_id(None, needle), needle_id(None, needle_2), _carrier_set(carriers))
+        return True, code_line(None, None, code, _comment_content(comment))
+    match = _drop_line.fullmatch(line)
+    if match is not None:
+        needle, comment = match.groups()
+        return True, code_line(None, None, drop_op(None, None, needle_id(None, needle)), _comment_content(comment))
+    if _blank_line.fullmatch(line) is not None:
+        return True, None
+    match = _comment_line.fullmatch(line)
+    if match is not None:
+        return True, code_line(None, None, None, _comment_content(match.group(1)))
+    return False, None
+
+
+def _clone_needle(needle: Optional[Needle]) -> Optional[Needle]:
+    """
+    :param needle: needle of an instruction, possibly held in a machine state
+    :return: the needle the parser would produce from this needle's text or None if the text cannot be cloned without the parser
+    """
+    if needle is None or isinstance(needle, Slider_Needle) or type(needle.position) is not int:
+        return None
+    return Needle(needle.is_front, needle.position)
+
+
+def _clone_carrier_set(carriers: Optional[Carrier_Set]) -> Optional[Carrier_Set]:
+    """
+    :param carriers: carrier set of an instruction
+    :return: the carrier set the parser would produce from this carrier set's text or None if the text cannot be cloned without the parser
+    """
+    if carriers is None or len(carriers) == 0 or any(type(c) is not int for c in carriers):
+        return None
+    return carrier_set(None, None, [*carriers.carrier_ids])
+
+
+def _clone_code(line: Knitout_Line) -> Optional[Knitout_Line]:
+    """
+    :param line: knitout line to clone
+    :return: a new knitout line without comments that matches parsing the line's code or None if the line must be parsed
+    """
+    if isinstance(line, Knitout_Needle_Instruction):
+        needle = _clone_needle(line.needle)
+        if needle is None:
+            return None
+        instruction_type = line.instruction_type
+        needle_2 = None
+        if instruction_type.requires_second_needle:
+            needle_2 = _clone_needle(line.needle_2)
+            if needle_2 is None:
+                return None
+        elif line.needle_2 is not None:
+            return None
+        if instruction_type.requires_carrier:
+            carriers = _clone_carrier_set(line.carrier_set)
+            if carriers is None or line.direction is None:
+                return None
+            direction = str(line.direction)
+            if instruction_type is Instruction_Type.Split:
+                return split_op(None, None, direction, needle, needle_2, carriers)
+            elif instruction_type.value in _carriage_ops:
+                return _carriage_ops[instruction_type.value](None, None, direction, needle, carriers)
+        elif line.direction is not None or line.carrier_set is not None:
+            return None
+        elif instruction_type is Instruction_Type.Xfer:
+            return xfer_op(None, None, needle, needle_2)
+        elif instruction_type is Instruction_Type.Drop:
+            return drop_op(None, None, needle)
+        elif instruction_type is Instruction_Type.Amiss:
+            return amiss_op(None, None, needle)
+        return None
+    elif isinstance(line, Carrier_Instruction):
+        carriers = _clone_carrier_set(line.carrier_set)
+        if carriers is None or line.instruction_type not in _carrier_ops:
+            return None
+        return _carrier_ops[line.instruction_type](None, None, carriers)
+    elif isinstance(line, Rack_Instruction):
+        if type(line.rack) not in [int, float] or _float_value.fullmatch(str(line.rack)) is None:
+            return None
+        return rack_op(None, None, float_exp(None, str(line.rack)))
+    return None
+
+
+def clone_line(line: Knitout_Line) -> Optional[Knitout_Line]:
+    """
+    Builds a fresh knitout line equivalent to parsing the text of the given line, without writing or parsing the text.
+    Only lines that print as a single line of knitout are cloned.
+    :param line: knitout line, possibly already executed on a machine state
+    :return: the clone or None if the line's text must be parsed to reproduce it
+    """
+    comment = line.comment
+    if comment is not None:
+        if _line_breaks.search(comment) is not None:
+            return None
+        comment = _comment_content(comment.lstrip(" \t\r"))
+    if type(line) is Comment_Line:
+        if comment is None or comment.startswith(";") or comment.startswith("!"):  # blank lines and header-like comments are parsed
+            return None
+        return code_line(None, None, None, comment)
+    code = _clone_code(line)
+    if code is None:
+        return None
+    return code_line(None, None, code, comment)
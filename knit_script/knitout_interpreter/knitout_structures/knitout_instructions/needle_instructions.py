@@ -79,21 +79,27 @@ class Knitout_Needle_Instruction(Instruction):
             if self.needle.is_slider:
                 raise Slider_Use_Error(self.needle, self)
 
+    def add_instruction_to_loops(self, loops: list):
+        """
+            Records the instruction as effecting the given loops
+        :param loops: the loops the instruction effected
+        """
+        for loop in loops:
+            loop.instructions.append(self)
+
     def add_instruction_to_needle_1_loops(self):
         """
             Records the instruction as effecting the loops held on needle 1
         """
         assert self.needle is not None
-        for loop in self.needle.held_loops:
-            loop.instructions.append(self)
+        self.add_instruction_to_loops(self.needle.held_loops)
 
     def add_instruction_to_needle_2_loops(self):
         """
             Records the instruction as effecting the loops held on needle 2
         """
         assert self.needle_2 is not None
-        for loop in self.needle_2.held_loops:
-            loop.instructions.append(self)
+        self.add_instruction_to_loops(self.needle_2.held_loops)
 
     def __str__(self):
         if self.has_direction:
@@ -128,8 +134,9 @@ class Knit_Instruction(Loop_Making_Instruction):
         self._test_operation(machine_state, test_clear_sliders=True, test_no_slider=True)
         if len(self.needle.held_loops) == 0:
             print(f"Knitout Warning: Knitting on needle {self.needle} without prior loops.")
-        self.add_instruction_to_needle_1_loops()
+        parent_loops = self.needle.held_loops
         self.made_loops = machine_state.knit(self.needle, self.carrier_set)
+        self.add_instruction_to_loops(parent_loops)  # after the machine changes so that a machine snapshot saves the loops first
         for loop in self.made_loops:
             loop.instructions.append(self)
             loop.creating_instruction = self
@@ -157,8 +164,8 @@ class Split_Instruction(Loop_Making_Instruction):
 
     def execute(self, machine_state):
         self._test_operation(machine_state, test_clear_sliders=True, test_no_slider=True)
-        self.add_instruction_to_needle_1_loops()  # loops that will be transferred
         self.made_loops, self.moved_loops = machine_state.split(self.needle, self.needle_2, self.carrier_set)
+        self.add_instruction_to_loops(self.moved_loops)  # transferred loops
         for loop in self.made_loops:
             loop.instructions.append(self)
             loop.creating_instruction = self
@@ -171,8 +178,7 @@ class Drop_Instruction(Knitout_Needle_Instruction):
 
     def execute(self, machine_state):
         self._test_operation(machine_state, test_no_slider=True, test_clear_sliders=True)
-        self.add_instruction_to_needle_1_loops()  # add to loops before drop
-        machine_state.drop(self.needle)
+        self.add_instruction_to_loops(machine_state.drop(self.needle))  # dropped loops
 
 
 class Amiss_Instruction(Knitout_Needle_Instruction):
@@ -0,0 +1,80 @@
+"""A restorable record of the state of a knitting machine"""
+from typing import Dict, List, Optional, Tuple
+
+from knit_script.knit_graphs.Loop import Loop
+from knit_script.knitting_machine.machine_components.needles import Needle, Slider_Needle
+
+
+class Machine_Snapshot:
+    """
+    The state of a machine at a point in execution that the machine can be restored to.
+    Values that the machine replaces instead of changing are held when the snapshot is taken.
+    Needles, loops, and loop records are saved the first time they change after the snapshot is taken,
+    so taking a snapshot does not copy the beds and restoring a snapshot only visits what changed.
+    ...
+
+    Attributes
+    ----------
+    parent: Optional[Machine_Snapshot]
+        The snapshot that was being recorded when this snapshot was taken
+    needle_loops: Dict[Needle, List[Loop]]
+        The loops held by each needle that changed after the snapshot was taken
+    loop_states: Dict[Loop, Tuple[Optional[Needle], int]]
+        The holding needle and number of instructions of each loop that was on a changed needle
+    loop_records: Dict[int, Tuple[bool, bool]]
+        The loop record of each needle position that was recorded after the snapshot was taken
+    activated_sliders: List[Slider_Needle]
+        The slider needles that became active after the snapshot was taken
+    """
+
+    def __init__(self, machine_state, parent=None):
+        """
+        :param machine_state: the machine state to record
+        :param parent: the snapshot that was being recorded when this snapshot was taken
+        """
+        self.parent: Optional[Machine_Snapshot] = parent
+        self.racking: float = machine_state.racking
+        self.last_carriage_direction = machine_state.last_carriage_direction
+        self.loop_id_counter: int = machine_state._loop_id_counter
+        self.gauge: int = machine_state._gauge
+        self.sheet: int = machine_state.sheet
+        self.layer_positions = machine_state._layer_positions  # copied by the machine state before it changes them
+        self.unrecorded_positions = machine_state._unrecorded_positions  # copied by the machine state before it changes them
+        self.carrier_system = machine_state.carrier_system.snapshot()
+        self.last_loop_id: int = machine_state.last_loop_id
+        self.needle_loops: Dict[Needle, List[Loop]] = {}
+        self.loop_states: Dict[Loop, Tuple[Optional[Needle], int]] = {}
+        self.loop_records: Dict[int, Tuple[bool, bool]] = {}
+        self.activated_sliders: List[Slider_Needle] = []
+
+    def save_needle(self, needle: Needle):
+        """
+        Saves the loops on the needle if the needle has not changed since the snapshot was taken
+        :param needle: the needle instance on the machine that is about to change
+        """
+        if needle not in self.needle_loops:
+            loops = needle.held_loops
+            self.needle_loops[needle] = [*loops]
+            self.save_loops(loops)
+
+    def save_loops(self, loops: List[Loop]):
+        """
+        Saves the holding needle and number of instructions of each loop that has not changed since the snapshot was taken
+        :param loops: loops that are about to be moved, dropped, or given instructions
+        """
+        for loop in loops:
+            if loop.loop_id <= self.last_loop_id and loop not in self.loop_states:  # loops made after the snapshot are removed on restore
+                self.loop_states[loop] = loop.holding_needle, len(loop.instructions)
+
+    def merge_into_parent(self):
+        """
+        Hands the changes saved by this snapshot to the parent snapshot so that the parent can still restore them
+        """
+        assert self.parent is not None, "Cannot merge a snapshot without a parent"
+        for needle, loops in self.needle_loops.items():
+            self.parent.needle_loops.setdefault(needle, loops)
+        for loop, loop_state in self.loop_states.items():
+            self.parent.loop_states.setdefault(loop, loop_state)
+        for needle_position, record in self.loop_records.items():
+            self.parent.loop_records.setdefault(needle_position, record)
+        self.parent.activated_sliders.extend(self.activated_sliders)
@@ -2,18 +2,33 @@
 import math
 from typing import Optional, List, Tuple, Iterable, Dict, Union
 
+import numpy as np
+
 from knit_script.knit_graphs.Knit_Graph import Knit_Graph, Pull_Direction
 from knit_script.knit_graphs.Loop import Loop
 from knit_script.knitout_interpreter.knitout_structures.Knitout_Line import Knitout_Line, Comment_Line
 from knit_script.knitout_interpreter.knitout_structures.knitout_instructions.knitout_instructions import xfer
-from knit_script.knitting_machine.machine_components.Sheet_Needle import get_sheet_needle, Sheet_Needle, Slider_Sheet_Needle
+from knit_script.knitting_machine.Machine_Snapshot import Machine_Snapshot
+from knit_script.knitting_machine.machine_components.Needle_Range import Needle_Range
+from knit_script.knitting_machine.machine_components.Sheet_Needle import Sheet_Needle
 from knit_script.knitting_machine.machine_components.machine_bed import Machine_Bed
 from knit_script.knitting_machine.machine_components.machine_pass_direction import Pass_Direction
-from knit_script.knitting_machine.machine_components.needles import Needle, Slider_Needle
+from knit_script.knitting_machine.machine_components.needles import Needle
 from knit_script.knitting_machine.machine_components.yarn_management.Carrier_Insertion_System import Carrier_Insertion_System
 from knit_script.knitting_machine.machine_components.yarn_management.Carrier_Set import Carrier_Set
 
 
+def _has_repeats(values: np.ndarray) -> bool:
+    """
+    :param values: integer array
+    :return: True if a value appears more than once in the array
+    """
+    if len(values) < 2:
+        return False
+    sorted_values = np.sort(values)
+    return bool(np.any(sorted_values[1:] == sorted_values[:-1]))
+
+
 class Machine_State:
     """
     The current state of a whole V-bed knitting machine
@@ -32,14 +47,20 @@ class Machine_State:
     carrier_system: Carrier_Insertion_System
         The system used to track the state of carriers and the yarn inserting hook
     knit_graph: Knit_Graph
-        The knit graph that has been made by operations on the machine
+        The knit graph that has been made by operations on the machine. Stays empty if the machine does not build a knit graph.
+        Loops and stitches are recorded in the knit graph's log and only added to the graph when it is first read
+    builds_knit_graph: bool
+        True if loops made on the machine are recorded in the knit graph and added to their yarns when the graph is read.
+        Otherwise, loops are only held by needles so the machine can validate operations cheaply
     """
     MAX_GAUGE = 10
     MAX_FLOAT = 5
 
-    def __init__(self, needle_count: int = 540, max_rack: float = 4.25, carrier_count: int = 10, hook_size: int = 5, max_float: int = 5):
+    def __init__(self, needle_count: int = 540, max_rack: float = 4.25, carrier_count: int = 10, hook_size: int = 5, max_float: int = 5,
+                 builds_knit_graph: bool = True):
         """
         Maintains the state of the machine
+        :param builds_knit_graph: If false, loops are not added to a knit graph or to their yarns. Used to validate knitout without modeling the knitted structure
         :param max_float: the maximum size of a float.
         :param needle_count:The number of needles that are on this bed
         :param max_rack: Maximum allowed racking on machine
@@ -54,21 +75,26 @@ class Machine_State:
         self.last_carriage_direction: Pass_Direction = Pass_Direction.Rightward
         # Presumes carriage is left on the Right side before knitting
         self.carrier_system: Carrier_Insertion_System = Carrier_Insertion_System(carrier_count, hook_size)
-        self._loop_id_counter: int = 0
+        self._loop_id_counter: int = 0  # the id of the next loop made on the machine
         self.knit_graph: Knit_Graph = Knit_Graph()
+        self.builds_knit_graph: bool = builds_knit_graph
         self._gauge: int = 1
         self._loop_record: Dict[int, Tuple[bool, bool]] = {i: (False, False) for i in range(0, self.needle_count)}
         # needle index -> Loops on front, loops on back
+        self._unrecorded_positions: set[int] = set()  # needle positions whose loops changed since their loops were recorded
         # self.sheet_records: Dict[int, Optional[Sheet_Record]] = {i: None for i in range(0, self._gauge)}
         # lower key value signals front layers, values are layer index in gauging
-        self._needle_pos_to_layer_pos: Dict[int, int] = {i: 0 for i in range(0, self.needle_count)}
+        self._layer_positions: np.ndarray = np.zeros(self.needle_count, dtype=np.int64)  # layer of each needle position
         self.gauge = 1  # applies property setter to fill layer records
         self._sheet: int = 0
+        self._snapshot: Optional[Machine_Snapshot] = None  # the snapshot that changes are saved to
 
-    def _use_loop_id_counter(self) -> int:
-        counter = self._loop_id_counter
-        self._loop_id_counter += 1
-        return counter
+    @property
+    def last_loop_id(self) -> int:
+        """
+        :return: The id of the last loop made on the machine or -1 if no loops have been made
+        """
+        return self._loop_id_counter - 1
 
     @property
     def max_rack(self) -> float:
@@ -96,10 +122,7 @@ class Machine_State:
         self._gauge = value
         if self.gauge != old_gauge:  # don't reset if gauge is held constant
             self.sheet_records = {}
-            self._needle_pos_to_layer_pos: Dict[int, int] = {}
-            for n in range(0, self.needle_count):
-                l_needle = get_sheet_needle(Needle(True, n), self.gauge)
-                self._needle_pos_to_layer_pos[n] = l_needle.sheet
+            self._layer_positions = np.arange(self.needle_count, dtype=np.int64) % self.gauge  # each needle starts in the layer of its sheet
             for i in range(0, self.gauge):
                 self.record_sheet(i)
 
@@ -176,14 +199,82 @@ class Machine_State:
     def __len__(self):
         return self.needle_count
 
+    def snapshot(self) -> Machine_Snapshot:
+        """
+        Starts saving changes to the machine so that it can be restored to its current state.
+        Snapshots must be restored or released in the reverse order that they are taken
+        :return: the snapshot of the current machine state
+        """
+        self._set_snapshot(Machine_Snapshot(self, self._snapshot))
+        return self._snapshot
+
+    def release(self, snapshot: Machine_Snapshot):
+        """
+        Stops saving changes for the snapshot. Changes are kept so that an enclosing snapshot can still be restored
+        :param snapshot: the most recent snapshot that has not been restored or released
+        """
+        assert snapshot is self._snapshot, "Snapshots must be released in the reverse order they were taken"
+        if snapshot.parent is not None:
+            snapshot.merge_into_parent()
+        self._set_snapshot(snapshot.parent)
+
+    def restore(self, snapshot: Machine_Snapshot):
+        """
+        Undoes every change made to the machine since the snapshot was taken
+        :param snapshot: the most recent snapshot that has not been restored or released
+        """
+        assert snapshot is self._snapshot, "Snapshots must be restored in the reverse order they were taken"
+        self._set_snapshot(None)  # changes made while restoring are not saved
+        for needle in snapshot.needle_loops:  # clear every changed needle before loops are put back on either bed
+            self._bed_of(needle).drop(needle)
+        if self.builds_knit_graph:
+            self.knit_graph.remove_loops_after(snapshot.last_loop_id)
+        for needle, loops in snapshot.needle_loops.items():
+            if len(loops) > 0:
+                self._bed_of(needle).add_loops(needle, loops, drop_prior_loops=False)
+        for loop, (holding_needle, instruction_count) in snapshot.loop_states.items():
+            loop.put_on_needle(holding_needle)
+            del loop.instructions[instruction_count:]
+        self.front_bed.deactivate_sliders([s for s in snapshot.activated_sliders if s.is_front])
+        self.back_bed.deactivate_sliders([s for s in snapshot.activated_sliders if s.is_back])
+        self._loop_record.update(snapshot.loop_records)
+        self._unrecorded_positions = snapshot.unrecorded_positions
+        self._layer_positions = snapshot.layer_positions
+        self.carrier_system.restore(snapshot.carrier_system)
+        self.racking = snapshot.racking
+        self.last_carriage_direction = snapshot.last_carriage_direction
+        self._loop_id_counter = snapshot.loop_id_counter
+        self._gauge = snapshot.gauge
+        self._sheet = snapshot.sheet
+        self._set_snapshot(snapshot.parent)
+
+    def _set_snapshot(self, snapshot: Optional[Machine_Snapshot]):
+        """
+        :param snapshot: the snapshot that changes to the machine and its beds are saved to
+        """
+        self._snapshot = snapshot
+        self.front_bed.snapshot = snapshot
+        self.back_bed.snapshot = snapshot
+
+    def _bed_of(self, needle: Needle) -> Machine_Bed:
+        """
+        :param needle: a needle on the machine
+        :return: the bed that holds the needle
+        """
+        return self.front_bed if needle.is_front else self.back_bed
+
     def record_needle_position(self, needle_position: int):
         """
         Records if there are loops on the front and back of given needle position
         :param needle_position:
         """
-        loops_on_front = self[Needle(is_front=True, position=needle_position)].has_loops
-        loops_on_back = self[Needle(is_front=False, position=needle_position)].has_loops
+        loops_on_front = self.front_bed.needles[needle_position].has_loops
+        loops_on_back = self.back_bed.needles[needle_position].has_loops
+        if self._snapshot is not None and needle_position not in self._snapshot.loop_records:
+            self._snapshot.loop_records[needle_position] = self._loop_record[needle_position]
         self._loop_record[needle_position] = loops_on_front, loops_on_back
+        self._unshare_unrecorded_positions()
+        self._unrecorded_positions.discard(needle_position)
 
     def add_loops(self, needle: Needle, carrier_set: Optional[Carrier_Set] = None,
                   loops: Optional[Iterable[Loop]] = None,
@@ -202,16 +293,22 @@ class Machine_State:
         prior_loops = [l for l in bed[needle].held_loops]
         if carrier_set is not None:
             assert self.carrier_system.is_active(carrier_set), f"Yarn Carrier {carrier_set} not in operation"
-            loops = self.carrier_system.make_loops(carrier_set, needle, self.knit_graph)
+            loops = self.carrier_system.make_loops(carrier_set, needle, self._loop_id_counter)
+            self._loop_id_counter += len(loops)
+            if self.builds_knit_graph:
+                self.knit_graph.record_loops(loops)
         loops = bed.add_loops(needle, loops, drop_prior_loops=drop_prior_loops)
-        if new_loops:  # Manage Knit Graph construction
+        if new_loops and self.builds_knit_graph:  # Manage Knit Graph construction
             for loop in loops:
                 if drop_prior_loops:
                     for parent_loop in prior_loops:
-                        self.knit_graph.connect_loops(parent_loop.loop_id, loop.loop_id,
+                        self.knit_graph.record_stitch(parent_loop.loop_id, loop.loop_id,
                                                       Pull_Direction.BtF if bed.is_front else Pull_Direction.FtB)  # todo mange cable depth and parent offsets
         if record_needle:
             self.record_needle_position(needle.position)
+        else:
+            self._unshare_unrecorded_positions()
+            self._unrecorded_positions.add(needle.position)
         return loops
 
     def knit(self, needle: Needle, carrier_set: Carrier_Set, record_needle=True) -> list[Loop]:
@@ -252,6 +349,9 @@ class Machine_State:
             loops = self.back_bed.drop(needle)
         if record_needle:
             self.record_needle_position(needle.position)
+        else:
+            self._unshare_unrecorded_positions()
+            self._unrecorded_positions.add(needle.position)
         return loops
 
     def xfer(self, start: Needle, target: Needle, record_needle=True) -> list[Loop]:
@@ -322,10 +422,11 @@ class Machine_State:
             pos = needle.position - math.floor(self.racking)
         else:
             pos = needle.position + math.floor(self.racking)
+        bed = self.back_bed if needle.is_front else self.front_bed
         if slider:
-            return self[Slider_Needle(not needle.is_front, pos)]
+            return bed.sliders[pos]
         else:
-            return self[Needle(not needle.is_front, pos)]
+            return bed.needles[pos]
 
     def __getitem__(self, item: Needle) -> Needle:
         """
@@ -350,7 +451,7 @@ class Machine_State:
         :param needle: needle or needle position to check layer of.
         :return: the layer of the given needle
         """
-        return self._needle_pos_to_layer_pos[int(needle)]
+        return int(self._layer_positions[int(needle)])
 
     def needle(self, is_front: bool, position: int, sheet: Optional[int] = None, gauge: Optional[int] = None) -> Needle:
         """
@@ -365,7 +466,8 @@ class Machine_State:
             sheet = self.sheet
         if gauge is None:
             gauge = self.gauge
-        return self[Sheet_Needle(is_front, position, sheet, gauge)]
+        bed = self.front_bed if is_front else self.back_bed
+        return bed.needles[int(Sheet_Needle.get_actual_pos(position, sheet, gauge))]
 
     def get_needle_of_loop(self, loop: Loop) -> Optional[Needle]:
         """
@@ -393,73 +495,59 @@ class Machine_State:
         actual_count = self.needle_count
         return int(actual_count / gauge)
 
-    def front_needles(self, on_sheet=True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> List[Needle]:
+    def _sheet_range(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> Tuple[int, Optional[int], int]:
         """
-        :param gauge: defaults to current gauge
+        :param on_sheet: If true, only includes needle positions on specified sheet and gauge
         :param sheet: defaults to current sheet
-        :param on_sheet: If true, only returns needle on specified sheet and gauge
-        :return: List of the needles on the front bed
+        :param gauge: defaults to current gauge
+        :return: start, stop, and step of the needle positions in the sheet
         """
         if not on_sheet:
-            return [f for f in self.front_bed.needles]
+            return 0, None, 1
         if gauge is None:
             gauge = self.gauge
         assert gauge > 0, "Gauge must be 1 or greater"
         if sheet is None:
             sheet = self.sheet
         assert 0 <= sheet < gauge, f"Sheet {sheet} must be between 0 and gauge {gauge}"
-        return [self[Sheet_Needle(True, n, sheet, gauge)] for n in range(0, self.sheet_needle_count(gauge))]
+        sheet, gauge = int(sheet), int(gauge)  # sheets may be given as sheet identifiers
+        return sheet, sheet + self.sheet_needle_count(gauge) * gauge, gauge
 
-    def back_needles(self, on_sheet=True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> List[Needle]:
+    def front_needles(self, on_sheet=True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> Needle_Range:
         """
         :param gauge: defaults to current gauge
         :param sheet: defaults to current sheet
         :param on_sheet: If true, only returns needle on specified sheet and gauge
-        :return: List of the needles on the back bed
+        :return: View of the needles on the front bed
         """
-        if not on_sheet:
-            return [b for b in self.back_bed.needles]
-        if gauge is None:
-            gauge = self.gauge
-        assert gauge > 0, "Gauge must be 1 or greater"
-        if sheet is None:
-            sheet = self.sheet
-        assert 0 <= sheet < gauge, f"Sheet {sheet} must be between 0 and gauge {gauge}"
-        return [self[Sheet_Needle(False, n, sheet, gauge)] for n in range(0, self.sheet_needle_count(gauge))]
+        return Needle_Range.of_beds((self.front_bed.needles,), *self._sheet_range(on_sheet, sheet, gauge))
 
-    def front_sliders(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> List[Needle]:
+    def back_needles(self, on_sheet=True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> Needle_Range:
         """
         :param gauge: defaults to current gauge
         :param sheet: defaults to current sheet
         :param on_sheet: If true, only returns needle on specified sheet and gauge
-        :return: List of the sliders on the front bed
+        :return: View of the needles on the back bed
         """
-        if not on_sheet:
-            return [f for f in self.front_bed.sliders]
-        if gauge is None:
-            gauge = self.gauge
-        assert gauge > 0, "Gauge must be 1 or greater"
-        if sheet is None:
-            sheet = self.sheet
-        assert 0 <= sheet < gauge, f"Sheet {sheet} must be between 0 and gauge {gauge}"
-        return [self[Slider_Sheet_Needle(True, n, sheet, gauge)] for n in range(0, self.sheet_needle_count(gauge))]
+        return Needle_Range.of_beds((self.back_bed.needles,), *self._sheet_range(on_sheet, sheet, gauge))
 
-    def back_sliders(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> List[Needle]:
+    def front_sliders(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> Needle_Range:
         """
         :param gauge: defaults to current gauge
         :param sheet: defaults to current sheet
         :param on_sheet: If true, only returns needle on specified sheet and gauge
-        :return: List of the sliders on the back bed
+        :return: View of the sliders on the front bed
         """
-        if not on_sheet:
-            return [b for b in self.back_bed.sliders]
-        if gauge is None:
-            gauge = self.gauge
-        assert gauge > 0, "Gauge must be 1 or greater"
-        if sheet is None:
-            sheet = self.sheet
-        assert 0 <= sheet < gauge, f"Sheet {sheet} must be between 0 and gauge {gauge}"
-        return [self[Slider_Sheet_Needle(False, n, sheet, gauge)] for n in range(0, self.sheet_needle_count(gauge))]
+        return Needle_Range.of_beds((self.front_bed.sliders,), *self._sheet_range(on_sheet, sheet, gauge))
+
+    def back_sliders(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> Needle_Range:
+        """
+        :param gauge: defaults to current gauge
+        :param sheet: defaults to current sheet
+        :param on_sheet: If true, only returns needle on specified sheet and gauge
+        :return: View of the sliders on the back bed
+        """
+        return Needle_Range.of_beds((self.back_bed.sliders,), *self._sheet_range(on_sheet, sheet, gauge))
 
     def front_loops(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> List[Needle]:
         """
@@ -469,8 +557,7 @@ class Machine_State:
         :param gauge: gauge defaults to current gauge
         :return: Set of front bed needles with loops on them
         """
-        needles = self.front_needles(on_sheet, sheet=sheet, gauge=gauge)
-        return [n for n in needles if n.has_loops]
+        return self.front_bed.needles_with_loops(False, *self._sheet_range(on_sheet, sheet, gauge))
 
     def back_loops(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> List[Needle]:
         """
@@ -480,8 +567,7 @@ class Machine_State:
         :param gauge: gauge defaults to current gauge
         :return: Set of front bed needles with loops on them
         """
-        needles = self.back_needles(on_sheet, sheet=sheet, gauge=gauge)
-        return [n for n in needles if n.has_loops]
+        return self.back_bed.needles_with_loops(False, *self._sheet_range(on_sheet, sheet, gauge))
 
     def front_slider_loops(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> List[Needle]:
         """
@@ -491,8 +577,7 @@ class Machine_State:
         :param gauge: gauge defaults to current gauge
         :return: Set of front bed needles with loops on them
         """
-        needles = self.front_sliders(on_sheet, sheet=sheet, gauge=gauge)
-        return [n for n in needles if n.has_loops]
+        return self.front_bed.needles_with_loops(True, *self._sheet_range(on_sheet, sheet, gauge))
 
     def back_slider_loops(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> List[Needle]:
         """
@@ -502,34 +587,27 @@ class Machine_State:
         :param gauge: gauge defaults to current gauge
         :return: Set of front bed needles with loops on them
         """
-        needles = self.back_sliders(on_sheet, sheet=sheet, gauge=gauge)
-        return [n for n in needles if n.has_loops]
+        return self.back_bed.needles_with_loops(True, *self._sheet_range(on_sheet, sheet, gauge))
 
-    def all_needles(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> List[Needle]:
+    def all_needles(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> Needle_Range:
         """
         All needles ordered for a machine pass
         :param on_sheet: If true, only returns loops on specified sheet
         :param sheet: sheet defaults to current sheet
         :param gauge: gauge defaults to current gauge
-        :return: Set of front bed needles with loops on them
+        :return: View of the front bed needles followed by the back bed needles
         """
-        needles = self.front_needles(on_sheet, sheet, gauge)
-        back_needles = self.back_needles(on_sheet, sheet, gauge)
-        needles.extend(back_needles)
-        return needles
+        return Needle_Range.of_beds((self.front_bed.needles, self.back_bed.needles), *self._sheet_range(on_sheet, sheet, gauge))
 
-    def all_sliders(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> List[Needle]:
+    def all_sliders(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> Needle_Range:
         """
         All sliders ordered for a machine pass
         :param on_sheet: If true, only returns loops on specified sheet
         :param sheet: sheet defaults to current sheet
         :param gauge: gauge defaults to current gauge
-        :return: Set of front bed needles with loops on them
+        :return: View of the front bed sliders followed by the back bed sliders
         """
-        needles = self.front_sliders(on_sheet, sheet, gauge)
-        back_needles = self.back_sliders(on_sheet, sheet, gauge)
-        needles.extend(back_needles)
-        return needles
+        return Needle_Range.of_beds((self.front_bed.sliders, self.back_bed.sliders), *self._sheet_range(on_sheet, sheet, gauge))
 
     def all_loops(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> List[Needle]:
         """
@@ -539,7 +617,9 @@ class Machine_State:
         :param gauge: gauge defaults to current gauge
         :return: Set of front bed needles with loops on them
         """
-        return [n for n in self.all_needles(on_sheet, sheet, gauge) if n.has_loops]
+        needles = self.front_loops(on_sheet, sheet, gauge)
+        needles.extend(self.back_loops(on_sheet, sheet, gauge))
+        return needles
 
     def all_slider_loops(self, on_sheet: bool = True, sheet: Optional[int] = None, gauge: Optional[int] = None) -> List[Needle]:
         """
@@ -549,7 +629,9 @@ class Machine_State:
         :param gauge: gauge defaults to current gauge
         :return: Set of front bed needles with loops on them
         """
-        return [n for n in self.all_sliders(on_sheet, sheet, gauge) if n.has_loops]
+        needles = self.front_slider_loops(on_sheet, sheet, gauge)
+        needles.extend(self.back_slider_loops(on_sheet, sheet, gauge))
+        return needles
 
     def record_sheet(self, sheet: int):
         """
@@ -558,6 +640,28 @@ class Machine_State:
         """
         return
 
+    def _unshare_unrecorded_positions(self):
+        """
+        Copies the unrecorded positions before they are changed if the current snapshot holds them
+        """
+        if self._snapshot is not None and self._snapshot.unrecorded_positions is self._unrecorded_positions:
+            self._unrecorded_positions = set(self._unrecorded_positions)
+
+    def _positions_with_loops(self) -> List[int]:
+        """
+        :return: the needle positions that hold loops on the front or back bed in increasing order
+        """
+        return np.flatnonzero(self.front_bed.loop_counts | self.back_bed.loop_counts).tolist()
+
+    def _sorted_unrecorded_positions(self) -> List[int]:
+        """
+        Positions whose loops are where they were last recorded are dropped from the unrecorded positions
+        :return: the needle positions whose loops may differ from their recorded locations in increasing order
+        """
+        self._unrecorded_positions = {p for p in self._unrecorded_positions
+                                      if self._loop_record[p] != (self.front_bed.needles[p].has_loops, self.back_bed.needles[p].has_loops)}
+        return sorted(self._unrecorded_positions)
+
     def peel_sheet_relative_to_active_sheet(self, active_sheet: int) -> tuple[list[Knitout_Line], list[int]]:
         """
         Moves loops out of the way of the active sheet based on needle layer positions
@@ -567,20 +671,22 @@ class Machine_State:
         peel_order_to_needles: Dict[int, List[Needle]] = {i: [] for i in range(0, self.gauge)}
         same_layer_needles: List[int] = []
 
-        for needle_pos, needle_layer in self._needle_pos_to_layer_pos.items():
-            back = self[Needle(False, needle_pos)]
-            front = self[Needle(True, needle_pos)]
-            if back.has_loops or front.has_loops:
-                sheet_needle = get_sheet_needle(Needle(True, needle_pos), self.gauge)
-                if sheet_needle.sheet != active_sheet:
-                    active_sheet_needle = Sheet_Needle(True, sheet_needle.sheet_pos, active_sheet, self.gauge)
-                    active_sheet_layer = self._needle_pos_to_layer_pos[active_sheet_needle.position]
-                    if active_sheet_layer == needle_layer:
-                        same_layer_needles.append(needle_pos)
-                    if needle_layer < active_sheet_layer and back.has_loops:  # needle is in front of sheet
-                        peel_order_to_needles[sheet_needle.sheet].append(back)
-                    elif needle_layer > active_sheet_layer and front.has_loops:  # needle is in back of sheet
-                        peel_order_to_needles[sheet_needle.sheet].append(front)
+        gauge = self.gauge
+        layer_positions = self._layer_positions.tolist()
+        for needle_pos in self._positions_with_loops():
+            needle_layer = layer_positions[needle_pos]
+            back = self.back_bed.needles[needle_pos]
+            front = self.front_bed.needles[needle_pos]
+            sheet_pos = Sheet_Needle.get_sheet_pos(needle_pos, gauge)
+            sheet = Sheet_Needle.get_sheet(needle_pos, sheet_pos, gauge)
+            if sheet != active_sheet:
+                active_sheet_layer = layer_positions[Sheet_Needle.get_actual_pos(sheet_pos, active_sheet, gauge)]
+                if active_sheet_layer == needle_layer:
+                    same_layer_needles.append(needle_pos)
+                if needle_layer < active_sheet_layer and back.has_loops:  # needle is in front of sheet
+                    peel_order_to_needles[sheet].append(back)
+                elif needle_layer > active_sheet_layer and front.has_loops:  # needle is in back of sheet
+                    peel_order_to_needles[sheet].append(front)
 
         xfers = []
         for sheet, peel_needles in peel_order_to_needles.items():
@@ -598,26 +704,28 @@ class Machine_State:
         """
         peel_order_to_needles: Dict[int, List[Needle]] = {i: [] for i in range(0, self.gauge)}
 
-        for needle_pos, needle_layer in self._needle_pos_to_layer_pos.items():
-            back = self[Needle(False, needle_pos)]
-            front = self[Needle(True, needle_pos)]
-            if back.has_loops or front.has_loops:
-                sheet_needle = get_sheet_needle(Needle(True, needle_pos), self.gauge)
-                if sheet_needle.sheet not in active_sheets:
-                    active_sheet_layer = None
-                    for active_sheet in active_sheets:
-                        active_sheet_needle = Sheet_Needle(True, sheet_needle.sheet_pos, active_sheet, self.gauge)
-                        other_layer = self._needle_pos_to_layer_pos[active_sheet_needle.position]
-                        if active_sheet is not None:
-                            assert other_layer == active_sheet_layer, \
-                                f"Cannot Work sheets {active_sheets} with different layers at {needle_pos}"
-                        active_sheet_layer = other_layer
-                    assert active_sheet_layer != needle_layer, \
-                        f"Cannot separate sheets {sheet_needle.sheet_pos} and sheets {active_sheets} with same layer position at {needle_pos}"
-                    if needle_layer < active_sheet_layer and back.has_loops:  # the needle is in front of the sheet
-                        peel_order_to_needles[sheet_needle.sheet].append(back)
-                    elif needle_layer > active_sheet_layer and front.has_loops:  # the needle is in the back of the sheet
-                        peel_order_to_needles[sheet_needle.sheet].append(front)
+        gauge = self.gauge
+        layer_positions = self._layer_positions.tolist()
+        for needle_pos in self._positions_with_loops():
+            needle_layer = layer_positions[needle_pos]
+            back = self.back_bed.needles[needle_pos]
+            front = self.front_bed.needles[needle_pos]
+            sheet_pos = Sheet_Needle.get_sheet_pos(needle_pos, gauge)
+            sheet = Sheet_Needle.get_sheet(needle_pos, sheet_pos, gauge)
+            if sheet not in active_sheets:
+                active_sheet_layer = None
+                for active_sheet in active_sheets:
+                    other_layer = layer_positions[Sheet_Needle.get_actual_pos(sheet_pos, active_sheet, gauge)]
+                    if active_sheet is not None:
+                        assert other_layer == active_sheet_layer, \
+                            f"Cannot Work sheets {active_sheets} with different layers at {needle_pos}"
+                    active_sheet_layer = other_layer
+                assert active_sheet_layer != needle_layer, \
+                    f"Cannot separate sheets {sheet_pos} and sheets {active_sheets} with same layer position at {needle_pos}"
+                if needle_layer < active_sheet_layer and back.has_loops:  # the needle is in front of the sheet
+                    peel_order_to_needles[sheet].append(back)
+                elif needle_layer > active_sheet_layer and front.has_loops:  # the needle is in the back of the sheet
+                    peel_order_to_needles[sheet].append(front)
 
         xfers = []
         for sheet, peel_needles in peel_order_to_needles.items():
@@ -634,10 +742,12 @@ class Machine_State:
         :return: the knitout of the xfers
         """
         knitout, same_layer_needles = self.peel_sheet_relative_to_active_sheet(sheet)
-
-        for f, b in zip(self.front_bed.needles, self.back_bed.needles):
-            sheet_needle = get_sheet_needle(f, self.gauge)
-            if sheet_needle.sheet == sheet or f.position in same_layer_needles:
+        same_layer_needles = set(same_layer_needles)
+        # positions whose loops are at their recorded locations do not need to be returned
+        for needle_pos in self._sorted_unrecorded_positions():
+            f = self.front_bed.needles[needle_pos]
+            b = self.back_bed.needles[needle_pos]
+            if self.sheet_of(f) == sheet or needle_pos in same_layer_needles:
                 front_had_loops, back_had_loops = self._loop_record[f.position]
                 if front_had_loops and back_had_loops:
                     assert f.has_loops and b.has_loops, f"Loops recorded on {f} and {b}, but cannot return to seperated state"
@@ -662,10 +772,11 @@ class Machine_State:
         :return: the knitout of the xfers
         """
         knitout = self.peel_sheet_relative_to_active_sheets(sheets)
-
-        for f, b in zip(self.front_bed.needles, self.back_bed.needles):
-            sheet_needle = get_sheet_needle(f, self.gauge)
-            if sheet_needle.sheet in sheets:
+        # positions whose loops are at their recorded locations do not need to be returned
+        for needle_pos in self._sorted_unrecorded_positions():
+            f = self.front_bed.needles[needle_pos]
+            b = self.back_bed.needles[needle_pos]
+            if self.sheet_of(f) in sheets:
                 front_had_loops, back_had_loops = self._loop_record[f.position]
                 if front_had_loops and back_had_loops:
                     assert f.has_loops and b.has_loops, f"Loops recorded on {f} and {b}, but cannot return to seperated state"
@@ -688,7 +799,14 @@ class Machine_State:
         :param needle_pos:
         :return: the layer order at a given needle position
         """
-        return self._needle_pos_to_layer_pos[needle_pos]
+        return int(self._layer_positions[needle_pos])
+
+    def get_layers_at_positions(self, needle_positions: List[int]) -> List[int]:
+        """
+        :param needle_positions: needle positions to get layers of
+        :return: the layer order at each needle position
+        """
+        return self._layer_positions[np.asarray(needle_positions, dtype=np.int64)].tolist()
 
     def set_layer_position(self, needle_pos: int, layer_value: int, set_other_positions=True):
         """
@@ -697,16 +815,51 @@ class Machine_State:
         :param needle_pos:
         :param layer_value: the position to set the layer to. Lower values are brought forward
         """
-        current_layer = self._needle_pos_to_layer_pos[needle_pos]
-        if current_layer != layer_value:
-            layer_dif = layer_value - current_layer
-            self._needle_pos_to_layer_pos[needle_pos] = layer_value
-            if set_other_positions:
-                sheet = needle_pos % self.gauge
-                positions = [needle_pos + (s - sheet) for s in range(0, self.gauge) if s != sheet]
-                for other_pos in positions:
-                    other_layer = (layer_dif + self._needle_pos_to_layer_pos[other_pos]) % self.gauge
-                    self.set_layer_position(other_pos, other_layer, set_other_positions=False)
+        if set_other_positions:
+            self.set_layer_positions([needle_pos], layer_value)
+        else:
+            self._unshare_layer_positions()
+            self._layer_positions[needle_pos] = layer_value
+
+    def set_layer_positions(self, needle_positions: List[int], layer_values: Union[int, List[int]]):
+        """
+        Sets the layer of each needle position and shifts the layers of the related positions in other sheets by the same amount, circling back.
+        Matches calling set_layer_position on each position in order.
+        :param needle_positions: the needle positions to set layers of
+        :param layer_values: the layer to set each position to, or one layer for every position. Lower values are brought forward
+        """
+        positions = np.asarray(needle_positions, dtype=np.int64)
+        values = np.broadcast_to(np.asarray(layer_values, dtype=np.int64), positions.shape)
+        sheet_starts = positions - positions % self.gauge
+        if _has_repeats(sheet_starts):  # later positions depend on the layers set for earlier positions in the same needle group
+            for needle_pos, layer_value in zip(positions.tolist(), values.tolist()):
+                self._set_group_layers(np.array([needle_pos]), np.array([needle_pos - needle_pos % self.gauge]), np.array([layer_value]))
+        else:
+            self._set_group_layers(positions, sheet_starts, values)
+
+    def _unshare_layer_positions(self):
+        """
+        Copies the layer records before they are changed if the current snapshot holds them
+        """
+        if self._snapshot is not None and self._snapshot.layer_positions is self._layer_positions:
+            self._layer_positions = self._layer_positions.copy()
+
+    def _set_group_layers(self, positions: np.ndarray, sheet_starts: np.ndarray, values: np.ndarray):
+        """
+        Sets the layers of needle positions that are each in a different group of positions that share a sheet position
+        :param positions: the needle positions to set layers of
+        :param sheet_starts: the first position in the group of each needle position
+        :param values: the layer to set each position to
+        """
+        gauge = self.gauge
+        self._unshare_layer_positions()
+        layer_differences = values - self._layer_positions[positions]
+        changed = layer_differences != 0
+        positions, values, sheet_starts, layer_differences = positions[changed], values[changed], sheet_starts[changed], layer_differences[changed]
+        group_positions = sheet_starts[:, np.newaxis] + np.arange(gauge)  # each row holds the positions of one needle in every sheet
+        group_layers = (self._layer_positions[group_positions] + layer_differences[:, np.newaxis]) % gauge
+        group_layers[np.arange(len(positions)), positions - sheet_starts] = values
+        self._layer_positions[group_positions] = group_layers
 
     def swap_layer_at_positions(self, first_pos: int, second_pos: int):
         """
@@ -714,9 +867,23 @@ class Machine_State:
         :param first_pos:
         :param second_pos:
         """
-        first_layer = self._needle_pos_to_layer_pos[first_pos]
-        self._needle_pos_to_layer_pos[first_pos] = self._needle_pos_to_layer_pos[second_pos]
-        self._needle_pos_to_layer_pos[second_pos] = first_layer
+        self.swap_layers_at_positions([first_pos], [second_pos])
+
+    def swap_layers_at_positions(self, first_positions: List[int], second_positions: List[int]):
+        """
+        Swaps the layer values between each pair of needle positions. Matches calling swap_layer_at_positions on each pair in order.
+        :param first_positions: needle positions to swap
+        :param second_positions: needle positions to swap with the first position at the same index
+        """
+        assert len(first_positions) == len(second_positions), "Cannot swap layers between different numbers of needle positions"
+        firsts = np.asarray(first_positions, dtype=np.int64)
+        seconds = np.asarray(second_positions, dtype=np.int64)
+        self._unshare_layer_positions()
+        if _has_repeats(np.concatenate([firsts, seconds])):  # a position is swapped more than once
+            for first_pos, second_pos in zip(firsts.tolist(), seconds.tolist()):
+                self._layer_positions[[first_pos, second_pos]] = self._layer_positions[[second_pos, first_pos]]
+            return
+        self._layer_positions[firsts], self._layer_positions[seconds] = self._layer_positions[seconds], self._layer_positions[firsts]
 
     def push_layer_backward(self, needle_position: int, backward_layers: int = 1):
         """
@@ -724,10 +891,24 @@ class Machine_State:
         :param needle_position:
         :param backward_layers: amount to move forward, circles around from 0 to back layer
         """
+        self.push_layers_backward([needle_position], backward_layers)
+
+    def push_layers_backward(self, needle_positions: List[int], backward_layers: int = 1):
+        """
+        Moves the layer of each needle position back from its current position
+        :param needle_positions: the needle positions to push
+        :param backward_layers: amount to move back, circles around from the back layer to 0
+        """
         if backward_layers == 0:
             return  # no op because no change to layer order
-        layer_position = (self._needle_pos_to_layer_pos[needle_position] + backward_layers) % self.gauge
-        self.set_layer_position(needle_position, layer_position)
+        positions = np.asarray(needle_positions, dtype=np.int64)
+        sheet_starts = positions - positions % self.gauge
+        if _has_repeats(sheet_starts):  # each push depends on the layer left by pushes earlier in the same needle group
+            for needle_pos in positions.tolist():
+                start = np.array([needle_pos - needle_pos % self.gauge])
+                self._set_group_layers(np.array([needle_pos]), start, (self._layer_positions[[needle_pos]] + backward_layers) % self.gauge)
+        else:
+            self._set_group_layers(positions, sheet_starts, (self._layer_positions[positions] + backward_layers) % self.gauge)
 
     def push_layer_forward(self, needle_position: int, forward_layers: int = 1):
         """
@@ -735,18 +916,40 @@ class Machine_State:
         :param needle_position:
         :param forward_layers:
         """
-        self.push_layer_backward(needle_position, -1 * forward_layers)
+        self.push_layers_backward([needle_position], -1 * forward_layers)
+
+    def push_layers_forward(self, needle_positions: List[int], forward_layers: int = 1):
+        """
+        Moves the layer of each needle position forward from its current position
+        :param needle_positions: the needle positions to push
+        :param forward_layers: amount to move forward, circles around from 0 to the back layer
+        """
+        self.push_layers_backward(needle_positions, -1 * forward_layers)
 
     def set_layer_to_front(self, needle_position: int):
         """
         Sets the layer as the front layer
         :param needle_position:
         """
-        self.set_layer_position(needle_position, 0)
+        self.set_layer_positions([needle_position], 0)
+
+    def set_layers_to_front(self, needle_positions: List[int]):
+        """
+        Sets the layer of each needle position as the front layer
+        :param needle_positions: the needle positions to bring to the front
+        """
+        self.set_layer_positions(needle_positions, 0)
 
     def set_layer_to_back(self, needle_position: int):
         """
         Sets the layer as the back layer
         :param needle_position:
         """
-        self.set_layer_position(needle_position, self.gauge - 1)
+        self.set_layer_positions([needle_position], self.gauge - 1)
+
+    def set_layers_to_back(self, needle_positions: List[int]):
+        """
+        Sets the layer of each needle position as the back layer
+        :param needle_positions: the needle positions to send to the back
+        """
+        self.set_layer_positions(needle_positions, self.gauge - 1)
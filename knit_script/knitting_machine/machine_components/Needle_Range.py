@@ -0,0 +1,92 @@
+"""Lazy views of ranges of needles on needle beds"""
+from collections.abc import Sequence
+from typing import Iterator, Union
+
+from knit_script.knitting_machine.machine_components.needles import Needle
+
+
+class Needle_Range(Sequence):
+    """
+        Sequence of the needles at a range of positions on one or more beds, in bed order.
+        Slices compose with the range of positions, and needles are only looked up when they are read
+    """
+    __slots__ = ("_beds", "_positions", "_indices")
+
+    def __init__(self, beds: tuple[list[Needle], ...], positions: range, indices: range | None = None):
+        """
+        Instantiate
+        :param beds: the needle lists of the beds in the order their needles are given
+        :param positions: positions of the needles taken from each bed
+        :param indices: indices of the view in the needles of all beds. Defaults to every needle
+        """
+        self._beds: tuple[list[Needle], ...] = beds
+        self._positions: range = positions
+        if indices is None:
+            indices = range(len(beds) * len(positions))
+        self._indices: range = indices
+
+    @staticmethod
+    def of_beds(beds: tuple[list[Needle], ...], start: int = 0, stop: int | None = None, step: int = 1):
+        """
+        :param beds: the needle lists of the beds in the order their needles are given
+        :param start: first position on each bed
+        :param stop: position after the last position on each bed. Defaults to the end of the bed
+        :param step: spacing between positions
+        :return: view of the needles at positions[start:stop:step] of each bed
+        """
+        return Needle_Range(beds, range(len(beds[0]))[start:stop:step])
+
+    def _needle(self, index: int) -> Needle:
+        """
+        :param index: index in the needles of all beds
+        :return: the needle at that index
+        """
+        bed, position = divmod(index, len(self._positions))
+        return self._beds[bed][self._positions[position]]
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[Needle, "Needle_Range"]:
+        if isinstance(item, slice):
+            return Needle_Range(self._beds, self._positions, self._indices[item])
+        return self._needle(self._indices[item])
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __iter__(self) -> Iterator[Needle]:
+        if len(self._beds) == 1:  # compose the indices with the positions of the single bed
+            positions, indices = self._positions, self._indices
+            return map(self._beds[0].__getitem__, range(positions.start + positions.step * indices.start, positions.start + positions.step * indices.stop,
+                                                         positions.step * indices.step))
+        return map(self._needle, self._indices)
+
+    def __reversed__(self) -> Iterator[Needle]:
+        return iter(self[::-1])
+
+    def __contains__(self, needle) -> bool:
+        if not isinstance(needle, Needle):
+            return False
+        for bed_index, bed in enumerate(self._beds):
+            if needle.position in self._positions:
+                index = bed_index * len(self._positions) + self._positions.index(needle.position)
+                if index in self._indices and bed[needle.position] == needle:
+                    return True
+        return False
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, Needle_Range)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, other) -> list[Needle]:
+        return [*self, *other]
+
+    def __radd__(self, other) -> list[Needle]:
+        return [*other, *self]
+
+    def __str__(self):
+        return str(list(self))
+
+    def __repr__(self):
+        return str(self)
@@ -6,6 +6,7 @@ class Sheet_Needle(Needle):
     """
         Used for managing needles at a layered gauging schema
     """
+    __slots__ = ("_gauge", "_sheet_pos", "_sheet")
 
     def __init__(self, is_front: bool, sheet_pos: int, sheet: int, gauge: int):
         self._gauge: int = gauge
@@ -211,6 +212,7 @@ class Slider_Sheet_Needle(Sheet_Needle, Slider_Needle):
     """
         Used for slider needles in gauging schema
     """
+    __slots__ = ()
 
     def __init__(self, is_front: bool, sheet_pos: int, sheet: int, gauge: int):
         super().__init__(is_front, sheet_pos, sheet, gauge)
@@ -2,9 +2,11 @@
 
 from typing import Dict, List, Optional, Set
 
+import numpy as np
 from knit_script.knit_graphs.Knit_Graph import Knit_Graph
 from knit_script.knit_graphs.Loop import Loop
 
+from knit_script.knitting_machine.Machine_Snapshot import Machine_Snapshot
 from knit_script.knitting_machine.machine_components.needles import Slider_Needle, Needle
 from knit_script.knitting_machine.machine_components.yarn_management.Carrier_Set import Carrier_Set
 
@@ -16,13 +18,18 @@ class Machine_Bed:
         i.e., LEFT -> 0 1 2....N <- RIGHT of Machine
     Attributes
     ----------
-    loops_to_needle: Dict[int, Optional[int]]
-        A dictionary keyed by loop ids to the needle location that this loop is currently held at.
-         If it is not held this is None or non-existent
+    loops_to_needle: Dict[Loop, Needle]
+        A dictionary keyed by loops to the needle that currently holds them. Loops that are not held on this bed are not in the dictionary
     needles: List[Needle]
         The needles on this bed ordered from 0 to max
     sliders: List[Slider_Needle]
         The slider needles on this bed ordered from 0 to max
+    loop_counts: np.ndarray
+        The number of loops held on each needle, indexed by needle position
+    slider_loop_counts: np.ndarray
+        The number of loops held on each slider needle, indexed by needle position
+    snapshot: Optional[Machine_Snapshot]
+        The snapshot that needles are saved to before they change. None if no snapshot is being recorded
     """
 
     def __init__(self, is_front: bool, needle_count: int = 250):
@@ -37,6 +44,9 @@ class Machine_Bed:
         self.sliders: List[Slider_Needle] = [Slider_Needle(self._is_front, i) for i in range(0, self.needle_count)]
         self.loops_to_needle: Dict[Loop, Optional[Needle]] = {}
         self._active_sliders: Set[Slider_Needle] = set()
+        self.loop_counts: np.ndarray = np.zeros(self.needle_count, dtype=np.int32)
+        self.slider_loop_counts: np.ndarray = np.zeros(self.needle_count, dtype=np.int32)
+        self.snapshot: Optional[Machine_Snapshot] = None
 
     @property
     def needle_count(self) -> int:
@@ -66,11 +76,17 @@ class Machine_Bed:
         needle = self[needle]  # make sure needle instance is the one in the machine bed state
         assert 0 <= needle.position < self.needle_count, f"Cannot place a loop at position {needle.position}"
         assert not (drop_prior_loops and needle.is_slider), "Cannot knit on slider needle"
+        if self.snapshot is not None:
+            self.snapshot.save_needle(needle)
+            self.snapshot.save_loops(loops)
         if drop_prior_loops:
             assert needle.is_clear(self), "Cannot drop loops if needle is not clear"
             self.drop(needle)
         needle.add_loops(loops)
-        if isinstance(needle, Slider_Needle):
+        self._update_loop_count(needle)
+        if isinstance(needle, Slider_Needle) and needle not in self._active_sliders:
+            if self.snapshot is not None:
+                self.snapshot.activated_sliders.append(needle)
             self._active_sliders.add(needle)
         for loop in loops:
             self.loops_to_needle[loop] = needle
@@ -83,12 +99,55 @@ class Machine_Bed:
         :return list of loops that were dropped
         """
         needle = self[needle]  # make sure the correct needle instance in machine bed state is used
+        if self.snapshot is not None:
+            self.snapshot.save_needle(needle)
         loops = [l for l in needle.held_loops]
         for loop in needle.held_loops:
-            self.loops_to_needle[loop] = None
+            self.loops_to_needle.pop(loop, None)
         needle.drop()
+        self._update_loop_count(needle)
         return loops
 
+    def deactivate_sliders(self, sliders: List[Slider_Needle]):
+        """
+        Marks slider needles as inactive
+        :param sliders: the slider needles in this bed to deactivate
+        """
+        self._active_sliders.difference_update(sliders)
+
+    def _update_loop_count(self, needle: Needle):
+        """
+        Records the number of loops held on the needle in the occupancy index
+        :param needle: the needle instance in this bed whose loops changed
+        """
+        if needle.is_slider:
+            self.slider_loop_counts[needle.position] = len(needle.held_loops)
+        else:
+            self.loop_counts[needle.position] = len(needle.held_loops)
+
+    def loop_positions(self, sliders: bool = False, start: int = 0, stop: Optional[int] = None, step: int = 1) -> List[int]:
+        """
+        Positions of the needles holding loops among the needles in range(start, stop, step)
+        :param sliders: if true, searches the slider needles
+        :param start: first needle position to search
+        :param stop: position to stop the search before, defaults to the end of the bed
+        :param step: distance between searched positions
+        :return: the positions that hold loops in increasing order
+        """
+        counts = self.slider_loop_counts if sliders else self.loop_counts
+        return (np.flatnonzero(counts[start:stop:step]) * step + start).tolist()
+
+    def needles_with_loops(self, sliders: bool = False, start: int = 0, stop: Optional[int] = None, step: int = 1) -> List[Needle]:
+        """
+        :param sliders: if true, searches the slider needles
+        :param start: first needle position to search
+        :param stop: position to stop the search before, defaults to the end of the bed
+        :param step: distance between searched positions
+        :return: the needles in range(start, stop, step) that hold loops in increasing order
+        """
+        needles = self.sliders if sliders else self.needles
+        return [needles[position] for position in self.loop_positions(sliders, start, stop, step)]
+
     def __getitem__(self, item: Needle) -> Needle:
         """
         Gets an indexed needle on the bed
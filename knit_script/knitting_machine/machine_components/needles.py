@@ -1,6 +1,6 @@
 """File used to manage Needles and Slider Needles"""
 import math
-from typing import Set, Iterable
+from typing import Iterable, Optional
 
 from knit_script.knit_graphs.Loop import Loop
 
@@ -23,9 +23,11 @@ class Needle:
 
     Attributes
     ----------
-    held_loops: Set[Loop]
-        The set of loops currently held on the needle
+    held_loops: list[Loop]
+        The loops currently held on the needle
     """
+    __slots__ = ("_is_front", "_position", "_held_loops")
+    _slider_bit: int = 0  # bit of the slider flag in needle keys
 
     def __init__(self, is_front: bool, position: int):
         """
@@ -36,7 +38,7 @@ class Needle:
         self._is_front: bool = is_front
         self._position: int = int(position)
         assert self.position is not None
-        self.held_loops: list[Loop] = []
+        self._held_loops: Optional[list[Loop]] = None  # only needles that have held loops allocate a list of loops
 
     @property
     def is_front(self) -> bool:
@@ -52,19 +54,41 @@ class Needle:
         """
         return self._position
 
+    @property
+    def key(self) -> int:
+        """
+        :return: Integer that packs the position, slider flag, and bed of the needle. Needles are equal when their keys are equal
+        """
+        return (self._position << 2) | self._slider_bit | (1 if self._is_front else 0)
+
+    @property
+    def held_loops(self) -> list[Loop]:
+        """
+        :return: The loops currently held on the needle
+        """
+        if self._held_loops is None:
+            return []
+        return self._held_loops
+
+    @held_loops.setter
+    def held_loops(self, loops: list[Loop]):
+        self._held_loops = loops
+
     @property
     def has_loops(self) -> bool:
         """
         :return: True if needle is holding loops
         """
-        return len(self.held_loops) > 0
+        return self._held_loops is not None and len(self._held_loops) > 0
 
     def add_loop(self, loop: Loop):
         """
         puts the loop in the set of currently held loops
         :param loop:
         """
-        self.held_loops.append(loop)
+        if self._held_loops is None:
+            self._held_loops = []
+        self._held_loops.append(loop)
 
     def add_loops(self, loops: Iterable[Loop]):
         """
@@ -81,7 +105,7 @@ class Needle:
         """
         for l in self.held_loops:
             l.drop_from_needle()
-        self.held_loops = []
+        self._held_loops = []
 
     @property
     def is_back(self) -> bool:
@@ -146,7 +170,7 @@ class Needle:
         return str(self)
 
     def __hash__(self):
-        return self.position
+        return (self._position << 2) | self._slider_bit | (1 if self._is_front else 0)
 
     def __lt__(self, other) -> bool:
         if isinstance(other, Needle):
@@ -317,7 +341,7 @@ class Needle:
 
     def __eq__(self, other):
         assert isinstance(other, Needle), f"Cannot compare needle equality to other types: {type(other)}"
-        return self.is_front == other.is_front and self.is_slider == other.is_slider and self.position == other.position
+        return self._position == other._position and self._slider_bit == other._slider_bit and self._is_front == other._is_front
 
     @property
     def is_slider(self) -> bool:
@@ -341,6 +365,8 @@ class Slider_Needle(Needle):
     """
     A Needle subclass for slider needles which an only transfer loops, but not be knit through
     """
+    __slots__ = ()
+    _slider_bit: int = 2
 
     def __init__(self, is_front: bool, position: int):
         super().__init__(is_front, position)
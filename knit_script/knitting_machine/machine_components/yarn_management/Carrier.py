@@ -116,6 +116,19 @@ class Carrier:
         self.is_active = False
         self.yarn = self.yarn.cut_yarn()
 
+    def snapshot(self) -> tuple:
+        """
+        :return: the yarn, activity, hook state, position, and loops since release of the carrier
+        """
+        return self.yarn, self._is_active, self._is_hooked, self._position, self._loops_since_release
+
+    def restore(self, snapshot: tuple):
+        """
+        Returns the carrier to the state it was in when the snapshot was taken
+        :param snapshot: the values returned by snapshot
+        """
+        self.yarn, self._is_active, self._is_hooked, self._position, self._loops_since_release = snapshot
+
     @property
     def carrier_id(self) -> int:
         """
@@ -1,7 +1,6 @@
 """Representation of the carrier managing components of the machine"""
 from typing import Dict, Optional, List
 
-from knit_script.knit_graphs.Knit_Graph import Knit_Graph
 from knit_script.knit_graphs.Loop import Loop
 from knit_script.knit_graphs.Yarn import Yarn
 from knit_script.knitout_interpreter.knitout_structures.Knitout_Line import Knitout_Line
@@ -201,10 +200,10 @@ class Carrier_Insertion_System:
         carrier_operations.append(outhook_op)
         return carrier_operations
 
-    def make_loops(self, carrier_set: Carrier_Set, needle: Needle, knit_graph: Knit_Graph) -> List[Loop]:
+    def make_loops(self, carrier_set: Carrier_Set, needle: Needle, first_loop_id: int) -> List[Loop]:
         """
         Establishes that yarn carrier has been used to make a loop at a given needle
-        :param knit_graph:
+        :param first_loop_id: The id of the first loop made. Each following loop has the next id
         :param carrier_set:
         :param needle: The needle to make the loops on.
         :Return The list of loops created
@@ -214,10 +213,25 @@ class Carrier_Insertion_System:
             self._searching_for_position = False
         loops = []
         for carrier in carrier_set.get_carriers(self):
-            loop_id, loop = carrier.yarn.add_loop_to_end(knit_graph=knit_graph)
+            loop = Loop(first_loop_id + len(loops), carrier.yarn)
             loop.put_on_needle(needle)
             loops.append(loop)
         return loops
 
+    def snapshot(self) -> tuple:
+        """
+        :return: the state of each carrier and of the yarn inserting hook
+        """
+        return [carrier.snapshot() for carrier in self.carriers.values()], self.hook_position, self._searching_for_position, self.hooked_carriers
+
+    def restore(self, snapshot: tuple):
+        """
+        Returns the carriers and yarn inserting hook to the state they were in when the snapshot was taken
+        :param snapshot: the values returned by snapshot
+        """
+        carrier_snapshots, self.hook_position, self._searching_for_position, self.hooked_carriers = snapshot
+        for carrier, carrier_snapshot in zip(self.carriers.values(), carrier_snapshots):
+            carrier.restore(carrier_snapshot)
+
     def __getitem__(self, item: int) -> Carrier:
         return self.carriers[item]
@@ -113,11 +113,12 @@ class Header:
         else:
             return self.declarations[code.operation] == code
 
-    def machine_state(self) -> Machine_State:
+    def machine_state(self, builds_knit_graph: bool = True) -> Machine_State:
         """
+        :param builds_knit_graph: If false, the machine state only validates operations and does not build a knit graph
         :return: A reset machine state with given specifications
         """
-        machine_state = Machine_State(self.width, self.max_rack, self.carrier_count, self.hook_size)
+        machine_state = Machine_State(self.width, self.max_rack, self.carrier_count, self.hook_size, builds_knit_graph=builds_knit_graph)
         for cid, yarn in self.carriers_to_yarns.items():  # update yarns on the carriers
             if yarn is not None:
                 machine_state.carrier_system[cid].yarn = yarn
@@ -0,0 +1,50 @@
+"""Benchmark of Machine_State queries for needles holding loops on full width beds"""
+import sys
+import time
+
+from knit_script.knit_graphs.Loop import Loop
+from knit_script.knitting_machine.Machine_State import Machine_State
+from knit_script.knitting_machine.machine_components.needles import Needle
+
+
+def filled_machine_state(needle_count: int, spacing: int = 2) -> Machine_State:
+    """
+    :param needle_count: number of needles on each bed
+    :param spacing: distance between needles that hold a loop
+    :return: machine state with loops held on every spacing-th needle of both beds
+    """
+    machine_state = Machine_State(needle_count=needle_count)
+    for position in range(0, needle_count, spacing):
+        machine_state.front_bed.add_loops(Needle(True, position), [Loop(2 * position, None)], drop_prior_loops=False)
+        machine_state.back_bed.add_loops(Needle(False, position), [Loop(2 * position + 1, None)], drop_prior_loops=False)
+    return machine_state
+
+
+def _time(query, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        query()
+    return (time.perf_counter() - start) / repeats
+
+
+def run(needle_counts: tuple[int, ...] = (540, 1500), repeats: int = 200):
+    """
+    Prints the time of one all_loops query at each gauge compared to scanning every needle in the sheet
+    :param needle_counts: number of needles on each bed of the benchmarked machines
+    :param repeats: number of queries timed for each measurement
+    """
+    print(f"{'needles':>8} {'gauge':>6} {'scan (us)':>10} {'index (us)':>11} {'speedup':>8}")
+    for needle_count in needle_counts:
+        machine_state = filled_machine_state(needle_count)
+        for gauge in (1, 2, 4):
+            machine_state.gauge = gauge
+            scan = _time(lambda: [n for n in machine_state.all_needles() if n.has_loops], repeats)
+            index = _time(lambda: machine_state.all_loops(), repeats)
+            print(f"{needle_count:>8} {gauge:>6} {scan * 1e6:>10.1f} {index * 1e6:>11.1f} {scan / index:>8.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(tuple(int(arg) for arg in sys.argv[1:]))
+    else:
+        run()
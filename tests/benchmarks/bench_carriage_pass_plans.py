@@ -0,0 +1,84 @@
+"""Benchmark of reusing carriage pass plans for the repeated rows of tall stockinette and rib swatches"""
+import os
+import sys
+import tempfile
+import time
+
+from knit_script.knit_script_interpreter.statements import Carriage_Pass
+from knit_script.knitout_interpreter.knitout_structures.knitout_instructions.instruction import Instruction_Type
+from knit_script.knitting_machine.machine_components.machine_pass_direction import Pass_Direction
+from knit_script.knitting_machine.machine_components.needles import Needle
+from tests.benchmarks.bench_compiled_statements import execution_time, scaled_program
+
+_programs = ["stst.ks", "rib.ks", "stst_tube.ks", "rib_tube.ks"]
+
+
+def row_pass(width: int, rib: bool, direction: Pass_Direction) -> Carriage_Pass.Carriage_Pass:
+    """
+    :param width: number of needles knit in the row
+    :param rib: if True, the row knits 2x2 rib across the beds. Otherwise, it knits stockinette on the front bed
+    :param direction: direction of the carriage pass
+    :return: a carriage pass that knits one row of a swatch
+    """
+    return Carriage_Pass.Carriage_Pass({Needle(not rib or position % 4 < 2, position): Instruction_Type.Knit for position in range(width)}, direction)
+
+
+def planning_time(width: int, rib: bool, rows: int) -> tuple[float, float]:
+    """
+    :param width: number of needles knit in each row
+    :param rib: if True, rows knit 2x2 rib. Otherwise, they knit stockinette
+    :param rows: number of rows planned
+    :return: time to plan every row and time to find the plan of every row in the plan cache
+    """
+    passes = [row_pass(width, rib, Pass_Direction.Leftward if row % 2 == 0 else Pass_Direction.Rightward) for row in range(rows)]
+    needle_instructions = [tuple(carriage_pass._needle_to_instruction.items()) for carriage_pass in passes]
+    start = time.perf_counter()
+    for carriage_pass, instructions in zip(passes, needle_instructions):
+        carriage_pass._plan(instructions, 0.0)
+    plan = time.perf_counter() - start
+    Carriage_Pass.pass_plans.clear()
+    for carriage_pass, instructions in zip(passes[0:2], needle_instructions[0:2]):  # plan one row in each direction
+        carriage_pass._cached_plan(instructions, 0.0)
+    start = time.perf_counter()
+    for carriage_pass, instructions in zip(passes, needle_instructions):
+        carriage_pass._cached_plan(instructions, 0.0)
+    cached = time.perf_counter() - start
+    Carriage_Pass.pass_plans.clear()
+    return plan, cached
+
+
+def run(scales: tuple[int, ...] = (4, 16), widths: tuple[int, ...] = (20, 100, 540), rows: int = 1000):
+    """
+    Prints the time to plan the rows of stockinette and rib swatches with and without reusing carriage pass plans,
+    then the time to write the knitout of scaled swatches with and without reusing carriage pass plans
+    :param scales: multipliers of the heights of the swatches
+    :param widths: numbers of needles in the planned rows
+    :param rows: number of rows planned at each width
+    """
+    print(f"{'swatch':>7} {'width':>6} {'rows':>6} {'plan (s)':>9} {'plan cache (s)':>15}")
+    for rib in [False, True]:
+        for width in widths:
+            plan, cached = planning_time(width, rib, rows)
+            print(f"{'rib' if rib else 'stst':>7} {width:>6} {rows:>6} {plan:>9.4f} {cached:>15.4f}")
+    print()
+    print(f"{'program':>18} {'lines':>7} {'no plan cache (s)':>18} {'plan cache (s)':>15}")
+    max_pass_plans = Carriage_Pass.max_pass_plans
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_file_name = os.path.join(out_dir, "out.k")
+        for scale in scales:
+            for file_name in _programs:
+                path = scaled_program(file_name, out_dir, scale)
+                Carriage_Pass.max_pass_plans = 0  # every plan is evicted as soon as it is made
+                uncached, lines = execution_time(path, out_file_name, compile_statements=True)
+                Carriage_Pass.max_pass_plans = max_pass_plans
+                Carriage_Pass.pass_plans.clear()
+                cached, cached_lines = execution_time(path, out_file_name, compile_statements=True)
+                assert lines == cached_lines
+                print(f"{os.path.basename(path):>18} {lines:>7} {uncached:>18.3f} {cached:>15.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(tuple(int(arg) for arg in sys.argv[1:]))
+    else:
+        run()
@@ -0,0 +1,97 @@
+"""Benchmark of executing knit script programs as compiled statement functions and by walking the statement tree"""
+import contextlib
+import io
+import os
+import re
+import sys
+import tempfile
+import time
+
+import importlib_resources
+
+from knit_script.knit_script_interpreter.Knit_Script_Interpreter import Knit_Script_Interpreter
+
+_programs = ["stst.ks", "rib.ks", "stst_tube.ks", "stripes.ks"]
+
+_arithmetic_program = r"""
+total = 0;
+i = 0;
+while i < ITERATIONS:{
+    if i % 3 == 0 and not i == 6:{
+        total = total + i * 2;
+    } else:{
+        total = total - 1;
+    }
+    i = i + 1;
+}
+"""
+
+
+def scaled_program(file_name: str, out_dir: str, scale: int) -> str:
+    """
+    :param file_name: name of a program in tests/leverage_evaluation
+    :param out_dir: directory to write the scaled program to
+    :param scale: multiplier of the height of the knitted swatch
+    :return: path to a copy of the program that knits scale times as many rows
+    """
+    program = importlib_resources.files("tests.leverage_evaluation").joinpath(file_name).read_text()
+    program = re.sub(r"height as (\d+)", lambda match: f"height as {int(match.group(1)) * scale}", program)
+    path = os.path.join(out_dir, f"{scale}x_{file_name}")
+    with open(path, "w") as program_file:
+        program_file.write(program)
+    return path
+
+
+def execution_time(program: str, out_file_name: str, compile_statements: bool) -> tuple[float, int]:
+    """
+    :param program: path to a knit script program
+    :param out_file_name: knitout file to write
+    :param compile_statements: If true, statements are compiled before execution
+    :return: time to write the knitout of the program without optimizing it and the number of knitout lines it wrote
+    """
+    interpreter = Knit_Script_Interpreter(compile_statements=compile_statements)
+    with contextlib.redirect_stdout(io.StringIO()):  # silence the interpreter's progress messages
+        start = time.perf_counter()
+        knitout, _knit_graph, _machine_state = interpreter.write_knitout(program, out_file_name, pattern_is_file=True, optimize=False)
+        duration = time.perf_counter() - start
+    return duration, len(knitout)
+
+
+def arithmetic_time(iterations: int, compile_statements: bool) -> float:
+    """
+    :param iterations: number of iterations of the arithmetic loop
+    :param compile_statements: If true, statements are compiled before execution
+    :return: time to execute a loop of arithmetic and branches that makes no machine operations
+    """
+    interpreter = Knit_Script_Interpreter(compile_statements=compile_statements)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        interpreter._interpret_knit_script(_arithmetic_program.replace("ITERATIONS", str(iterations)), pattern_is_file=False)
+        return time.perf_counter() - start
+
+
+def run(scales: tuple[int, ...] = (1, 4), iterations: int = 20000):
+    """
+    Prints the time to interpret scaled sample programs and an arithmetic loop with and without compiling statements
+    :param scales: multipliers of the heights of the sample programs
+    :param iterations: number of iterations of the arithmetic loop
+    """
+    print(f"{'program':>18} {'lines':>7} {'tree walk (s)':>14} {'compiled (s)':>13}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_file_name = os.path.join(out_dir, "out.k")
+        for scale in scales:
+            for file_name in _programs:
+                path = scaled_program(file_name, out_dir, scale)
+                walk, lines = execution_time(path, out_file_name, compile_statements=False)
+                compiled, compiled_lines = execution_time(path, out_file_name, compile_statements=True)
+                assert lines == compiled_lines
+                print(f"{os.path.basename(path):>18} {lines:>7} {walk:>14.3f} {compiled:>13.3f}")
+    walk, compiled = arithmetic_time(iterations, compile_statements=False), arithmetic_time(iterations, compile_statements=True)
+    print(f"{f'{iterations} iterations':>18} {'-':>7} {walk:>14.3f} {compiled:>13.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(tuple(int(arg) for arg in sys.argv[1:]))
+    else:
+        run()
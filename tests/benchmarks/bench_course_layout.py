@@ -0,0 +1,61 @@
+"""Benchmark of splitting a knit graph into courses and drawing it with visualize_sheet"""
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+
+from tests.benchmarks.bench_knit_graph_memory import stockinette_graph
+
+matplotlib.use("Agg")  # draw to files without opening windows
+
+from knit_script.knit_graphs.knit_graph_viz import visualize_sheet  # noqa: E402, imported after selecting the backend
+
+
+def course_layout_time(width: int, rows: int) -> float:
+    """
+    :param width: number of loops in each course
+    :param rows: number of courses
+    :return: time to find the courses of a stockinette swatch and the index of every loop in its course
+    """
+    knit_graph = stockinette_graph(width, rows)
+    start = time.perf_counter()
+    courses = knit_graph.get_courses()
+    for course in courses:
+        for loop_id in course:
+            course.index(loop_id)
+    return time.perf_counter() - start
+
+
+def visualize_time(width: int, rows: int) -> float:
+    """
+    :param width: number of loops in each course
+    :param rows: number of courses
+    :return: time to draw a stockinette swatch and save the drawing
+    """
+    knit_graph = stockinette_graph(width, rows)
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        visualize_sheet(knit_graph, os.path.join(out_dir, "knit_graph.png"))
+        duration = time.perf_counter() - start
+    matplotlib.pyplot.close("all")
+    return duration
+
+
+def run(rows: tuple[int, ...] = (200, 2000), width: int = 20):
+    """
+    Prints the time to index the courses of stockinette swatches and to draw them
+    :param rows: numbers of courses in the benchmarked swatches
+    :param width: number of loops in each course
+    """
+    print(f"{'courses':>8} {'course index (s)':>17} {'visualize (s)':>14}")
+    for row_count in rows:
+        print(f"{row_count:>8} {course_layout_time(width, row_count):>17.3f} {visualize_time(width, row_count):>14.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(tuple(int(arg) for arg in sys.argv[1:]))
+    else:
+        run()
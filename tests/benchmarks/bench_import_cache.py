@@ -0,0 +1,57 @@
+"""Benchmark of importing standard library modules repeatedly within a program and across programs"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import importlib_resources
+
+from knit_script.knit_script_interpreter.Knit_Script_Interpreter import Knit_Script_Interpreter
+
+_looped_imports = r"""
+for i in range(0, IMPORTS):{
+    import cast_ons;
+    import bind_offs;
+}
+"""
+
+
+def interpret_time(program: str, runs: int) -> float:
+    """
+    :param program: path to a knit script program
+    :param runs: number of times to interpret the program, each with a new interpreter
+    :return: average time to interpret the program
+    """
+    start = time.perf_counter()
+    for _ in range(runs):
+        interpreter = Knit_Script_Interpreter()
+        interpreter._knit_pass_context.ks_file = program
+        with contextlib.redirect_stdout(io.StringIO()):  # silence the interpreter's progress messages
+            interpreter._interpret_knit_script(program, pattern_is_file=True)
+    return (time.perf_counter() - start) / runs
+
+
+def run(runs: int = 10, imports: int = 50):
+    """
+    Prints the time to interpret programs that import standard library modules and the hits and misses of the import caches
+    :param runs: number of times each program is interpreted
+    :param imports: number of times the looped program imports cast_ons and bind_offs
+    """
+    with tempfile.TemporaryDirectory() as program_dir:
+        looped_program = os.path.join(program_dir, "looped_imports.ks")
+        with open(looped_program, "w") as program_file:
+            program_file.write(_looped_imports.replace("IMPORTS", str(imports)))
+        programs = [("stst.ks", str(importlib_resources.files("tests.leverage_evaluation").joinpath("stst.ks"))), (f"{imports} imports", looped_program)]
+        print(f"{'program':>12} {'runs':>5} {'time per run (s)':>17}")
+        for name, program in programs:
+            print(f"{name:>12} {runs:>5} {interpret_time(program, runs):>17.3f}")
+    print(", ".join(f"{key}: {value}" for key, value in Knit_Script_Interpreter.import_cache_info().items()))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(*(int(arg) for arg in sys.argv[1:]))
+    else:
+        run()
@@ -0,0 +1,59 @@
+"""Benchmark of the memory each loop and stitch adds to a knit graph of a large garment"""
+import sys
+import time
+import tracemalloc
+
+from knit_script.knit_graphs.Knit_Graph import Knit_Graph
+from knit_script.knit_graphs.Pull_Direction import Pull_Direction
+from knit_script.knit_graphs.Yarn import Yarn
+
+
+def stockinette_graph(width: int, rows: int) -> Knit_Graph:
+    """
+    :param width: number of loops in each course
+    :param rows: number of courses
+    :return: knit graph of a stockinette swatch where each loop after the first course is knit through the loop one course before it
+    """
+    knit_graph = Knit_Graph()
+    yarn = Yarn("1")
+    knit_graph.add_yarn(yarn)
+    for loop_id in range(width * rows):
+        yarn.add_loop_to_end(knit_graph=knit_graph)
+        if loop_id >= width:
+            knit_graph.connect_loops(loop_id - width, loop_id, Pull_Direction.BtF)
+    return knit_graph
+
+
+def knit_graph_bytes_per_loop(width: int, rows: int) -> tuple[float, float]:
+    """
+    :param width: number of loops in each course
+    :param rows: number of courses
+    :return: bytes allocated for each loop in the knit graph, including the loop, its yarn entry, and its stitch edge, and the time to build the graph
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    knit_graph = stockinette_graph(width, rows)
+    duration = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(knit_graph.loops) == width * rows
+    return memory / (width * rows), duration
+
+
+def run(rows: tuple[int, ...] = (50, 5000), width: int = 200):
+    """
+    Prints the memory and time of building knit graphs of stockinette swatches
+    :param rows: numbers of courses in the benchmarked swatches
+    :param width: number of loops in each course
+    """
+    print(f"{'loops':>8} {'bytes per loop':>15} {'build (s)':>10}")
+    for row_count in rows:
+        per_loop, duration = knit_graph_bytes_per_loop(width, row_count)
+        print(f"{width * row_count:>8} {per_loop:>15.1f} {duration:>10.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(tuple(int(arg) for arg in sys.argv[1:]))
+    else:
+        run()
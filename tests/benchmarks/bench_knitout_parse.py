@@ -0,0 +1,57 @@
+"""Throughput benchmark of the knitout parser on generated knitout files"""
+import os
+import sys
+import tempfile
+import time
+
+from knit_script.knitout_interpreter.Knitout_Parser import Knitout_Parser
+
+
+def write_stockinette_knitout(file_name: str, line_count: int, width: int = 100):
+    """
+    Writes a knitout file of alternating knit and transfer rows
+    :param file_name: file to write to
+    :param line_count: approximate number of lines in the file
+    :param width: number of needles in each row
+    """
+    with open(file_name, "w") as knitout_file:
+        knitout_file.write(";!knitout-2\n;;Machine: SWG091N2\n;;Gauge: 15\n;;Width: 250\n;;Carriers: 1 2 3 4 5 6 7 8 9 10\n;;Position: Center\ninhook 3\n")
+        lines = 7
+        row = 0
+        while lines < line_count:
+            if row % 2 == 0:
+                direction = "-" if row % 4 == 0 else "+"
+                knitout_file.writelines(f"knit {direction} f{n} 3 ;row {row}\n" for n in range(width))
+            else:
+                knitout_file.write(f"rack 0\n")
+                knitout_file.writelines(f"xfer f{n} b{n}\n" for n in range(width))
+                lines += 1
+            lines += width
+            row += 1
+        knitout_file.write("outhook 3\n")
+
+
+def run(line_count: int = 1000000, batch_sizes: tuple[int, ...] = (1, 1000)):
+    """
+    Prints lines per second for parsing a generated knitout file with and without the fast path decoder
+    :param line_count: number of lines in the generated file
+    :param batch_sizes: number of lines handed to the parser at once. A batch size of 1 parses line by line
+    """
+    parser = Knitout_Parser()
+    with tempfile.TemporaryDirectory() as directory:
+        file_name = os.path.join(directory, "generated.k")
+        write_stockinette_knitout(file_name, line_count)
+        print(f"{'batch size':>10} {'fast path':>10} {'lines/sec':>12}")
+        for fast_path in [False, True]:
+            for batch_size in batch_sizes:
+                start = time.perf_counter()
+                _version, _head, _instructions, codes, _comments = parser.parse(file_name, pattern_is_file=True, batch_size=batch_size, fast_path=fast_path)
+                duration = time.perf_counter() - start
+                print(f"{batch_size:>10} {str(fast_path):>10} {len(codes) / duration:>12.0f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(int(sys.argv[1]))
+    else:
+        run()
@@ -0,0 +1,67 @@
+"""Benchmark of validating knitout without building a knit graph compared to interpreting it with the full knit graph"""
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+import importlib_resources
+
+from knit_script.knit_script_interpreter.Knit_Script_Interpreter import Knit_Script_Interpreter
+from knit_script.knitout_interpreter.Knitout_Interpreter import Knitout_Interpreter
+
+_programs = [("tests.leverage_evaluation", "stst_tube.ks"), ("tests.leverage_evaluation", "rib_tube.ks"), ("tests.paper_samples", "ribbed_tube.ks")]
+
+
+def sample_knitout(out_dir: str) -> list[tuple[str, str]]:
+    """
+    :param out_dir: directory to write knitout generated from knit script programs
+    :return: name and path of each knitout sample and each knitout file generated from the sample programs
+    """
+    samples_directory = os.path.join(os.path.dirname(os.path.dirname(__file__)), "knitout_samples")
+    knitout = [(file_name, os.path.join(samples_directory, file_name)) for file_name in sorted(os.listdir(samples_directory))]
+    for package, file_name in _programs:
+        program = str(importlib_resources.files(package).joinpath(file_name))
+        out_file = os.path.join(out_dir, f"{os.path.splitext(file_name)[0]}.k")
+        with contextlib.redirect_stdout(io.StringIO()):  # silence the interpreter's progress messages
+            Knit_Script_Interpreter().write_knitout(program, out_file, pattern_is_file=True, optimize=False)
+        knitout.append((file_name, out_file))
+    return knitout
+
+
+def interpret(pattern: str, builds_knit_graph: bool, repeats: int) -> tuple[float, int]:
+    """
+    :param pattern: path to a knitout file
+    :param builds_knit_graph: if true, the interpreter builds the knit graph while executing the knitout
+    :param repeats: number of times the knitout is interpreted for the timing
+    :return: average time to parse and interpret the knitout and the peak bytes allocated while interpreting it
+    """
+    interpreter = Knitout_Interpreter(builds_knit_graph=builds_knit_graph)
+    with contextlib.redirect_stdout(io.StringIO()):  # silence machine warnings
+        start = time.perf_counter()
+        for _ in range(repeats):
+            interpreter.interpret_knitout(pattern)
+        duration = (time.perf_counter() - start) / repeats
+        tracemalloc.start()
+        interpreter.interpret_knitout(pattern)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return duration, peak
+
+
+def run(repeats: int = 3):
+    """
+    Prints the time and peak memory of interpreting knitout with and without building the knit graph
+    :param repeats: number of times each knitout file is interpreted for the timing
+    """
+    print(f"{'knitout':>16} {'graph (ms)':>11} {'validate (ms)':>14} {'graph (KiB)':>12} {'validate (KiB)':>15}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for name, pattern in sample_knitout(out_dir):
+            graph_time, graph_peak = interpret(pattern, True, repeats)
+            validate_time, validate_peak = interpret(pattern, False, repeats)
+            print(f"{name:>16} {graph_time * 1e3:>11.1f} {validate_time * 1e3:>14.1f} {graph_peak / 1024:>12.0f} {validate_peak / 1024:>15.0f}")
+
+
+if __name__ == "__main__":
+    run()
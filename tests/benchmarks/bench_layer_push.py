@@ -0,0 +1,55 @@
+"""Benchmark of pushing the layers of every needle in a sheet on wide beds"""
+import sys
+import time
+
+from knit_script.knitting_machine.Machine_State import Machine_State
+
+
+def _push_each_needle(layers: dict[int, int], gauge: int, needle_positions: list[int], backward_layers: int):
+    """
+    Pushes one needle at a time on a dictionary of layers, as Push_Statement did before batched layer updates
+    :param layers: layer of each needle position
+    :param gauge: number of sheets
+    :param needle_positions: needle positions to push
+    :param backward_layers: number of layers to push each needle back
+    """
+    for needle_pos in needle_positions:
+        layer_value = (layers[needle_pos] + backward_layers) % gauge
+        layer_dif = layer_value - layers[needle_pos]
+        if layer_dif != 0:
+            layers[needle_pos] = layer_value
+            sheet = needle_pos % gauge
+            for other_pos in [needle_pos + (s - sheet) for s in range(0, gauge) if s != sheet]:
+                layers[other_pos] = (layer_dif + layers[other_pos]) % gauge
+
+
+def run(needle_counts: tuple[int, ...] = (540, 1500), repeats: int = 100):
+    """
+    Prints the time to push every needle of sheet 0 back one layer
+    :param needle_counts: number of needles on each bed of the benchmarked machines
+    :param repeats: number of pushes timed for each measurement
+    """
+    print(f"{'needles':>8} {'gauge':>6} {'per needle (us)':>16} {'batched (us)':>13} {'speedup':>8}")
+    for needle_count in needle_counts:
+        for gauge in (2, 4):
+            machine_state = Machine_State(needle_count=needle_count)
+            machine_state.gauge = gauge
+            positions = list(range(0, needle_count, gauge))
+            layers = {n: n % gauge for n in range(needle_count)}
+            start = time.perf_counter()
+            for _ in range(repeats):
+                _push_each_needle(layers, gauge, positions, 1)
+            per_needle = (time.perf_counter() - start) / repeats
+            start = time.perf_counter()
+            for _ in range(repeats):
+                machine_state.push_layers_backward(positions, 1)
+            batched = (time.perf_counter() - start) / repeats
+            assert machine_state.get_layers_at_positions(list(range(needle_count))) == [layers[n] for n in range(needle_count)]
+            print(f"{needle_count:>8} {gauge:>6} {per_needle * 1e6:>16.1f} {batched * 1e6:>13.1f} {per_needle / batched:>8.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(tuple(int(arg) for arg in sys.argv[1:]))
+    else:
+        run()
@@ -0,0 +1,44 @@
+"""Benchmark of writing knitout from knit script programs without reading the knit graph, and of building the graph when it is first read"""
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import importlib_resources
+
+from knit_script.knit_script_interpreter.Knit_Script_Interpreter import Knit_Script_Interpreter
+
+_programs = [("tests.leverage_evaluation", "stst_tube.ks"), ("tests.leverage_evaluation", "rib_tube.ks"), ("tests.paper_samples", "ribbed_tube.ks")]
+
+
+def interpret(program: str, out_file_name: str) -> tuple[float, float, int]:
+    """
+    :param program: path to a knit script file
+    :param out_file_name: knitout file to write
+    :return: time to write the knitout without optimizing it, time to read the knit graph afterwards, and the number of loops in the graph
+    """
+    with contextlib.redirect_stdout(io.StringIO()):  # silence the interpreter's progress messages
+        start = time.perf_counter()
+        _knitout, knit_graph, _machine_state = Knit_Script_Interpreter().write_knitout(program, out_file_name, pattern_is_file=True, optimize=False)
+        write = time.perf_counter() - start
+    start = time.perf_counter()
+    loop_count = len(knit_graph.loops)
+    read = time.perf_counter() - start
+    return write, read, loop_count
+
+
+def run():
+    """
+    Prints the time to write knitout from sample programs and the time to read the knit graph that each program made
+    """
+    print(f"{'program':>16} {'loops':>7} {'knitout (s)':>12} {'first read (s)':>15}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for package, file_name in _programs:
+            program = str(importlib_resources.files(package).joinpath(file_name))
+            write, read, loop_count = interpret(program, os.path.join(out_dir, "out.k"))
+            print(f"{file_name:>16} {loop_count:>7} {write:>12.3f} {read:>15.3f}")
+
+
+if __name__ == "__main__":
+    run()
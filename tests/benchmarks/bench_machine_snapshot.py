@@ -0,0 +1,68 @@
+"""Benchmark of taking and restoring machine state snapshots compared to deep copying the machine state"""
+import copy
+import sys
+import time
+
+from knit_script.knitout_interpreter.knitout_structures.knitout_instructions import knitout_instructions
+from knit_script.knitting_machine.Machine_State import Machine_State
+from knit_script.knitting_machine.machine_components.machine_pass_direction import Pass_Direction
+from knit_script.knitting_machine.machine_components.needles import Needle
+from knit_script.knitting_machine.machine_components.yarn_management.Carrier_Set import Carrier_Set
+
+
+def knit_rows(machine_state: Machine_State, carrier_set: Carrier_Set, width: int, rows: int):
+    """
+    Knits rows of stockinette back and forth across the front bed
+    :param machine_state: machine with the carrier set active
+    :param carrier_set: carrier set to knit with
+    :param width: number of needles in each row
+    :param rows: number of rows to knit
+    """
+    for row in range(rows):
+        direction = Pass_Direction.Rightward if row % 2 == 0 else Pass_Direction.Leftward
+        for needle in direction.sort_needles([Needle(True, p) for p in range(width)]):
+            knitout_instructions.knit(machine_state, direction, needle, carrier_set)
+
+
+def knitted_machine_state(width: int, rows: int) -> Machine_State:
+    """
+    :param width: number of needles in each row
+    :param rows: number of rows knit on the machine
+    :return: machine state after casting on and knitting the rows
+    """
+    machine_state = Machine_State()
+    carrier_set = Carrier_Set(1)
+    knitout_instructions.inhook(machine_state, carrier_set)
+    for position in reversed(range(width)):
+        knitout_instructions.tuck(machine_state, Pass_Direction.Leftward, Needle(True, position), carrier_set)
+    knitout_instructions.releasehook(machine_state)
+    knit_rows(machine_state, carrier_set, width, rows)
+    return machine_state
+
+
+def run(rows: tuple[int, ...] = (20, 100), width: int = 200, changed_rows: int = 2):
+    """
+    Prints the time to snapshot and restore a machine after knitting a few rows compared to deep copying the machine before the rows
+    :param rows: numbers of rows knit before each snapshot
+    :param width: number of needles in each row
+    :param changed_rows: number of rows knit after the snapshot and undone by restoring it
+    """
+    print(f"{'rows':>6} {'deepcopy (ms)':>14} {'snapshot (ms)':>14} {'restore (ms)':>13}")
+    sys.setrecursionlimit(100000)  # deep copying follows the chains of loops in the knit graph
+    for row_count in rows:
+        machine_state = knitted_machine_state(width, row_count)
+        start = time.perf_counter()
+        copy.deepcopy(machine_state)
+        deep_copy = time.perf_counter() - start
+        start = time.perf_counter()
+        snapshot = machine_state.snapshot()
+        take = time.perf_counter() - start
+        knit_rows(machine_state, Carrier_Set(1), width, changed_rows)
+        start = time.perf_counter()
+        machine_state.restore(snapshot)
+        restore = time.perf_counter() - start
+        print(f"{row_count:>6} {deep_copy * 1e3:>14.2f} {take * 1e3:>14.3f} {restore * 1e3:>13.2f}")
+
+
+if __name__ == "__main__":
+    run()
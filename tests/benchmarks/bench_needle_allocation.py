@@ -0,0 +1,70 @@
+"""Benchmark of the number of needles created while interpreting knit script programs and the memory each needle holds"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import importlib_resources
+
+from knit_script.knit_script_interpreter.Knit_Script_Interpreter import Knit_Script_Interpreter
+from knit_script.knitting_machine.machine_components.needles import Needle
+
+_programs = [("tests.leverage_evaluation", "stst_tube.ks"), ("tests.leverage_evaluation", "rib_tube.ks"), ("tests.paper_samples", "ribbed_tube.ks")]
+
+
+def needle_bytes(count: int = 10000) -> float:
+    """
+    :param count: number of needles to allocate
+    :return: average bytes allocated by a needle on the machine
+    """
+    tracemalloc.start()
+    needles = [Needle(i % 2 == 0, i) for i in range(count)]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memory / len(needles)
+
+
+def count_needles(program: str, out_file_name: str) -> tuple[int, float]:
+    """
+    :param program: path to a knit script file
+    :param out_file_name: knitout file to write
+    :return: number of needles created while interpreting the program without optimizing it, and the time to interpret it without counting
+    """
+    needle_init = Needle.__init__.__code__
+    created = 0
+
+    def _profile(frame, event, _arg):
+        nonlocal created
+        if event == "call" and frame.f_code is needle_init:
+            created += 1
+
+    with contextlib.redirect_stdout(io.StringIO()):  # silence the interpreter's progress messages
+        sys.setprofile(_profile)
+        try:
+            Knit_Script_Interpreter().write_knitout(program, out_file_name, pattern_is_file=True, optimize=False)
+        finally:
+            sys.setprofile(None)
+        start = time.perf_counter()
+        Knit_Script_Interpreter().write_knitout(program, out_file_name, pattern_is_file=True, optimize=False)
+        duration = time.perf_counter() - start
+    return created, duration
+
+
+def run():
+    """
+    Prints the bytes held by each needle and the needles created by interpreting sample programs
+    """
+    print(f"bytes per needle: {needle_bytes():.1f}")
+    print(f"{'program':>16} {'needles created':>16} {'interpret (s)':>14}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for package, file_name in _programs:
+            program = str(importlib_resources.files(package).joinpath(file_name))
+            created, duration = count_needles(program, os.path.join(out_dir, "out.k"))
+            print(f"{file_name:>16} {created:>16} {duration:>14.3f}")
+
+
+if __name__ == "__main__":
+    run()
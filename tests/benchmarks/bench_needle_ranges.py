@@ -0,0 +1,49 @@
+"""Benchmark of slicing and indexing the needle sets of wide machine beds in knit script"""
+import contextlib
+import io
+import sys
+import time
+
+from knit_script.knit_script_interpreter.Knit_Script_Interpreter import Knit_Script_Interpreter
+from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
+
+_program = r"""
+for r in range(0, ROWS):{
+    row = Front_Needles[0:20:2];
+    last = Back_Needles[-1];
+    count = len(Needles);
+    with Gauge as 2:{ sheet_row = Front_Sliders[r % 10: r % 10 + 20]; }
+}
+"""
+
+
+def slicing_time(bed_width: int, rows: int) -> float:
+    """
+    :param bed_width: number of needles on each bed
+    :param rows: number of times the needle sets are sliced
+    :return: time to interpret a program that slices and indexes needle sets once per row
+    """
+    interpreter = Knit_Script_Interpreter(context=Knit_Script_Context(bed_width=bed_width))
+    with contextlib.redirect_stdout(io.StringIO()):  # silence the interpreter's progress messages
+        start = time.perf_counter()
+        interpreter._interpret_knit_script(_program.replace("ROWS", str(rows)), pattern_is_file=False)
+        return time.perf_counter() - start
+
+
+def run(bed_widths: tuple[int, ...] = (540, 5400, 54000), rows: int = 2000):
+    """
+    Prints the time to slice needle sets on beds of different widths
+    :param bed_widths: numbers of needles on each bed
+    :param rows: number of times the needle sets are sliced
+    """
+    slicing_time(bed_widths[0], 10)  # load the grammar and the interpreter before timing
+    print(f"{'bed width':>10} {'rows':>6} {'time (s)':>9}")
+    for bed_width in bed_widths:
+        print(f"{bed_width:>10} {rows:>6} {slicing_time(bed_width, rows):>9.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(tuple(int(arg) for arg in sys.argv[1:]))
+    else:
+        run()
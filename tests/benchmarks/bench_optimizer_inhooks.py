@@ -0,0 +1,56 @@
+"""Benchmark of Knitout_Optimizer time as the number of yarn insertions grows"""
+import sys
+import time
+
+from knit_script.knitout_interpreter.Knitout_Interpreter import Knitout_Interpreter
+from knit_script.knitout_interpreter.Knitout_Optimizer import Knitout_Optimizer
+
+
+def intarsia_knitout(colors: int, block_width: int = 4, rows: int = 6) -> str:
+    """
+    Generates knitout for side by side blocks of color, each brought in with an inhook, knit, transferred to the back bed, and taken out with an outhook
+    :param colors: number of color blocks, each block inhooks one carrier
+    :param block_width: number of needles in each block
+    :param rows: number of rows knit in each block after the cast on
+    :return: the knitout program
+    """
+    lines = [";!knitout-2", ";;Machine: SWG091N2", ";;Gauge: 15", ";;Width: 540", ";;Carriers: 1 2 3 4 5 6 7 8 9 10", ";;Position: Left"]
+    for block in range(colors):
+        carrier = block % 10 + 1
+        needles = range(block * block_width, (block + 1) * block_width)
+        lines.append(f"inhook {carrier}")
+        lines.extend(f"tuck - f{n} {carrier}" for n in reversed(needles))
+        for row in range(rows):
+            if row % 2 == 0:
+                lines.extend(f"knit + f{n} {carrier}" for n in needles)
+            else:
+                lines.extend(f"knit - f{n} {carrier}" for n in reversed(needles))
+            if row == 1:
+                lines.append(f"releasehook {carrier}")
+        lines.extend(f"xfer f{n} b{n}" for n in needles)
+        lines.append(f"outhook {carrier}")
+    return "\n".join(lines) + "\n"
+
+
+def run(color_counts: tuple[int, ...] = (10, 25, 50, 100)):
+    """
+    Prints the time to build the optimizer's constraints and to optimize programs with increasing numbers of inhooks
+    :param color_counts: number of inhooks in each generated program
+    """
+    print(f"{'inhooks':>8} {'constraints (s)':>16} {'optimize (s)':>13}")
+    for colors in color_counts:
+        interpreter = Knitout_Interpreter()
+        interpreter.interpret_knitout(intarsia_knitout(colors), pattern_is_file=False)
+        start = time.perf_counter()
+        optimizer = Knitout_Optimizer(interpreter.context)
+        built = time.perf_counter()
+        optimizer.optimize()
+        optimized = time.perf_counter()
+        print(f"{colors:>8} {built - start:>16.3f} {optimized - built:>13.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(tuple(int(arg) for arg in sys.argv[1:]))
+    else:
+        run()
@@ -0,0 +1,59 @@
+"""Benchmark of Knitout_Optimizer time on programs with many carriage passes"""
+import sys
+import time
+import tracemalloc
+
+from knit_script.knitout_interpreter.Knitout_Interpreter import Knitout_Interpreter
+from knit_script.knitout_interpreter.Knitout_Optimizer import Knitout_Optimizer
+
+
+def alternating_bed_knitout(carriage_passes: int, width: int = 2) -> str:
+    """
+    Generates knitout that knits a row and transfers it to the opposite bed, repeatedly
+    :param carriage_passes: approximate number of carriage passes in the program
+    :param width: number of needles in each row
+    :return: the knitout program
+    """
+    lines = [";!knitout-2", ";;Machine: SWG091N2", ";;Gauge: 15", ";;Width: 250", ";;Carriers: 1 2 3 4 5 6 7 8 9 10", ";;Position: Center", "inhook 1"]
+    lines.extend(f"tuck + f{n} 1" for n in range(width))
+    lines.append("releasehook 1")
+    for row in range(carriage_passes // 2):
+        bed, other_bed = ("f", "b") if row % 2 == 0 else ("b", "f")
+        if row % 2 == 0:
+            lines.extend(f"knit - {bed}{n} 1" for n in range(width - 1, -1, -1))
+        else:
+            lines.extend(f"knit + {bed}{n} 1" for n in range(width))
+        lines.extend(f"xfer {bed}{n} {other_bed}{n}" for n in range(width))
+    lines.append("outhook 1")
+    return "\n".join(lines) + "\n"
+
+
+def run(pass_counts: tuple[int, ...] = (1000, 10000, 100000), width: int = 2):
+    """
+    Prints the time to build the optimizer's constraints, the memory the optimizer holds, and the time to optimize programs with increasing numbers of carriage passes
+    :param pass_counts: number of carriage passes in each generated program
+    :param width: number of needles in each carriage pass
+    """
+    print(f"{'passes':>8} {'instructions':>13} {'constraints (s)':>16} {'memory (MB)':>12} {'optimize (s)':>13}")
+    for carriage_passes in pass_counts:
+        interpreter = Knitout_Interpreter()
+        interpreter.interpret_knitout(alternating_bed_knitout(carriage_passes, width), pattern_is_file=False)
+        tracemalloc.start()
+        traced_optimizer = Knitout_Optimizer(interpreter.context)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del traced_optimizer
+        start = time.perf_counter()
+        optimizer = Knitout_Optimizer(interpreter.context)
+        built = time.perf_counter()
+        optimizer.optimize()
+        optimized = time.perf_counter()
+        instructions = sum(len(carriage_pass.instructions) for carriage_pass in optimizer.carriage_passes)
+        print(f"{len(optimizer.carriage_passes):>8} {instructions:>13} {built - start:>16.3f} {memory / 1e6:>12.1f} {optimized - built:>13.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:  # width followed by pass counts
+        run(tuple(int(arg) for arg in sys.argv[2:]), int(sys.argv[1]))
+    else:
+        run()
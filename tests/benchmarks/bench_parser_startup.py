@@ -0,0 +1,35 @@
+"""Benchmark of parser construction with a cold, disk-warm, and process-warm grammar cache"""
+import os
+import tempfile
+import time
+
+from knit_script import grammar_cache
+from knit_script.knit_script_interpreter.Knit_Script_Parser import Knit_Script_Parser
+from knit_script.knitout_interpreter.Knitout_Parser import Knitout_Parser
+
+
+def _time_construction(parser_class, clear_memory: bool) -> float:
+    if clear_memory:
+        grammar_cache.clear_memory_cache()
+    start = time.perf_counter()
+    parser_class()
+    return time.perf_counter() - start
+
+
+def run():
+    """
+        Prints construction time of each parser from an empty cache directory, from the disk cache, and from the process cache
+    """
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["KNIT_SCRIPT_CACHE_DIR"] = cache_dir
+        print(f"{'parser':>20} {'cold (s)':>10} {'disk (s)':>10} {'warm (s)':>10}")
+        for parser_class in [Knit_Script_Parser, Knitout_Parser]:
+            cold = _time_construction(parser_class, clear_memory=True)
+            disk = _time_construction(parser_class, clear_memory=True)
+            warm = _time_construction(parser_class, clear_memory=False)
+            print(f"{parser_class.__name__:>20} {cold:>10.4f} {disk:>10.4f} {warm:>10.6f}")
+        del os.environ["KNIT_SCRIPT_CACHE_DIR"]
+
+
+if __name__ == "__main__":
+    run()
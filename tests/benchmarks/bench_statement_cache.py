@@ -0,0 +1,55 @@
+"""Benchmark of loading parsed knit script programs from the on-disk statement cache instead of parsing them, as a new worker process would"""
+import glob
+import os
+import sys
+import tempfile
+import time
+
+import importlib_resources
+
+from knit_script.knit_script_interpreter.Knit_Script_Parser import Knit_Script_Parser
+from knit_script.knit_script_interpreter.module_cache import Statement_Disk_Cache, parsed_modules
+
+
+def parse_time(programs: list[str], statement_cache: Statement_Disk_Cache | None, runs: int) -> float:
+    """
+    :param programs: paths to knit script programs
+    :param statement_cache: on-disk cache to load statements from, or None to parse every program
+    :param runs: number of times to read the programs, each with an empty in-memory cache
+    :return: average time to read the statements of all programs
+    """
+    parser = Knit_Script_Parser(statement_cache=statement_cache)
+    duration = 0.0
+    for _ in range(runs):
+        parsed_modules.clear()  # each run reads the programs like a new process
+        start = time.perf_counter()
+        for program in programs:
+            parser.parse(program, pattern_is_file=True)
+        duration += time.perf_counter() - start
+    parsed_modules.clear()
+    return duration / runs
+
+
+def run(runs: int = 20):
+    """
+    Prints the time to parse the standard library and paper samples and the time to load them from a warm on-disk cache
+    :param runs: number of times the programs are read
+    """
+    library = os.path.dirname(str(importlib_resources.files("knit_script.knit_script_std_library").joinpath("cast_ons.ks")))
+    samples = os.path.dirname(str(importlib_resources.files("tests.paper_samples").joinpath("ribbed_tube.ks")))
+    programs = [path for path in sorted(glob.glob(os.path.join(library, "*.ks")) + glob.glob(os.path.join(samples, "*.ks"))) if not path.endswith("cast_ons_1.ks")]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        statement_cache = Statement_Disk_Cache(cache_dir)
+        parse = parse_time(programs, None, runs)
+        parse_time(programs, statement_cache, 1)  # warm the cache
+        load = parse_time(programs, statement_cache, runs)
+        cache_size = sum(os.path.getsize(path) for path in glob.glob(os.path.join(cache_dir, "*.pickle")))
+    print(f"{'programs':>9} {'parse (s)':>10} {'disk cache (s)':>15} {'cache bytes':>12}")
+    print(f"{len(programs):>9} {parse:>10.4f} {load:>15.4f} {cache_size:>12}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(int(sys.argv[1]))
+    else:
+        run()
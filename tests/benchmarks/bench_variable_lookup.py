@@ -0,0 +1,52 @@
+"""Micro-benchmark comparing eval-first variable lookup with frame-dictionary lookup"""
+import timeit
+
+from knit_script.knit_script_interpreter.Knit_Script_Parser import Knit_Script_Parser
+from knit_script.knit_script_interpreter.knit_script_context import Knit_Script_Context
+
+
+def _legacy_lookup(scope, key: str):
+    """
+    Mirrors the former lookup: probe python scope with eval, then walk parents checking each frame
+    :param scope: scope to start the lookup from
+    :param key: variable name
+    :return: value of the variable
+    """
+    try:
+        return eval(key)
+    except NameError:
+        pass
+    while scope is not None:
+        if key in scope._variables:
+            return scope._variables[key]
+        scope = scope.parent
+    raise NameError(f"Variable {key} is not in scope")
+
+
+def _nested_context(depth: int) -> Knit_Script_Context:
+    context = Knit_Script_Context()
+    context.variable_scope["width"] = 40
+    for _ in range(depth):
+        context.enter_sub_scope()
+    context.variable_scope["r"] = 0
+    return context
+
+
+def run(depth: int = 4, number: int = 200000):
+    """
+    Times lookups of a local, an outer scope variable, and a python builtin
+    :param depth: number of nested code-block scopes between the outer variable and the lookup
+    :param number: number of lookups per measurement
+    """
+    context = _nested_context(depth)
+    parser = Knit_Script_Parser()
+    expressions = {key: parser.parse(f"{key};", pattern_is_file=False)[0].expression for key in ["r", "width", "range"]}
+    print(f"{'variable':>10} {'legacy (s)':>12} {'resolved (s)':>14} {'speedup':>8}")
+    for key, expression in expressions.items():
+        legacy = timeit.timeit(lambda: _legacy_lookup(context.variable_scope, key), number=number)
+        resolved = timeit.timeit(lambda: expression.evaluate(context), number=number)
+        print(f"{key:>10} {legacy:>12.4f} {resolved:>14.4f} {legacy / resolved:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run()
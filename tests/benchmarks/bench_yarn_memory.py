@@ -0,0 +1,43 @@
+"""Benchmark of the memory each loop adds to the yarn it is made on"""
+import sys
+import time
+import tracemalloc
+
+from knit_script.knit_graphs.Loop import Loop
+from knit_script.knit_graphs.Yarn import Yarn
+
+
+def yarn_bytes_per_loop(loop_count: int) -> tuple[float, float]:
+    """
+    :param loop_count: number of loops added to the end of the yarn
+    :return: bytes allocated by the yarn for each loop, not counting the loops, and the time to add the loops
+    """
+    yarn = Yarn("1")
+    loops = [Loop(loop_id, yarn) for loop_id in range(loop_count)]
+    tracemalloc.start()
+    start = time.perf_counter()
+    for loop in loops:
+        yarn.add_loop_to_end(loop_id=loop.loop_id, loop=loop)
+    duration = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(yarn) == loop_count
+    return memory / loop_count, duration
+
+
+def run(loop_counts: tuple[int, ...] = (10000, 1000000)):
+    """
+    Prints the memory and time of adding loops to the end of a yarn
+    :param loop_counts: numbers of loops on the benchmarked yarns
+    """
+    print(f"{'loops':>8} {'bytes per loop':>15} {'append (s)':>11}")
+    for loop_count in loop_counts:
+        per_loop, duration = yarn_bytes_per_loop(loop_count)
+        print(f"{loop_count:>8} {per_loop:>15.1f} {duration:>11.3f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        run(tuple(int(arg) for arg in sys.argv[1:]))
+    else:
+        run()
@@ -0,0 +1,49 @@
+"""Benchmark of finding the last needle holding a loop of a long yarn, as checked each time a carrier set is selected"""
+import time
+from typing import Optional
+
+from knit_script.knit_graphs.Yarn import Yarn
+from knit_script.knitting_machine.machine_components.needles import Needle
+from tests.benchmarks.bench_machine_snapshot import knitted_machine_state
+
+
+def scan_last_needle(yarn: Yarn) -> Optional[Needle]:
+    """
+    :param yarn: yarn to search
+    :return: the needle holding the last loop on the yarn that is on a needle, found by walking back from the end of the yarn
+    """
+    for loop_id in reversed(yarn):
+        loop = yarn[loop_id]
+        if loop.on_needle:
+            return loop.holding_needle
+    return None
+
+
+def _time(query, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        query()
+    return (time.perf_counter() - start) / repeats
+
+
+def run(rows: tuple[int, ...] = (50, 500), width: int = 200, repeats: int = 20):
+    """
+    Prints the time of one last needle query on yarns of increasing length compared to walking back along the yarn
+    :param rows: numbers of rows knit on the yarn
+    :param width: number of needles in each row
+    :param repeats: number of queries timed for each measurement
+    """
+    print(f"{'loops':>8} {'scan (us)':>10} {'index (us)':>11}")
+    for row_count in rows:
+        machine_state = knitted_machine_state(width, row_count)
+        yarn = machine_state.carrier_system.carriers[1].yarn
+        for position in range(width - 1, width // 2, -1):  # the last loops on the yarn are dropped so the scan walks back half a row
+            machine_state.drop(machine_state[Needle(True, position)])
+        assert scan_last_needle(yarn) is yarn.last_needle()
+        scan = _time(lambda: scan_last_needle(yarn), repeats)
+        index = _time(lambda: yarn.last_needle(), repeats)
+        print(f"{len(yarn):>8} {scan * 1e6:>10.1f} {index * 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    run()
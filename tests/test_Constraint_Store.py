@@ -0,0 +1,47 @@
+from enum import Enum
+from unittest import TestCase
+
+import networkx as nx
+
+from knit_script.knitout_interpreter.Constraint_Store import Constraint_Store
+
+
+class _Prerequisite(Enum):
+    first = "first"
+    second = "second"
+
+
+class _Kind(Enum):
+    a = "a"
+    b = "b"
+
+
+class Test_Constraint_Store(TestCase):
+
+    def _store(self) -> Constraint_Store:
+        store = Constraint_Store([*_Prerequisite], [*_Kind])
+        for u, v, kind, prerequisite in [("e", "c", _Kind.a, _Prerequisite.first), ("a", "b", _Kind.a, _Prerequisite.first), ("b", "c", _Kind.b, _Prerequisite.second),
+                                         ("a", "c", _Kind.b, _Prerequisite.first), ("d", "b", _Kind.a, _Prerequisite.second), ("a", "b", _Kind.b, _Prerequisite.second)]:
+            store.add_edge(u, v, kind, prerequisite, label=f"{u}{v}")
+        store.add_node("f")
+        return store
+
+    def test_merged_edges(self):
+        store = self._store()
+        self.assertEqual(store.edge_count, 5)
+        self.assertEqual(store.successors("a"), ["b", "c"])
+        self.assertEqual(store.predecessors("b", _Kind.b), ["a"])
+        self.assertEqual(store.predecessors("b", _Kind.a), ["a", "d"])
+        exported = store.to_networkx()
+        self.assertEqual(exported["a"]["b"]["prereqs"], {_Prerequisite.first, _Prerequisite.second})
+        self.assertEqual(exported["a"]["b"]["constraint_graphs"], {_Kind.a, _Kind.b})
+        self.assertEqual(len(store.to_networkx(_Kind.b).edges), 3)
+
+    def test_topological_sort_matches_networkx(self):
+        store = self._store()
+        self.assertEqual(store.topological_sort(), [*nx.topological_sort(store.to_networkx())])
+        store.add_edge("c", "a", _Kind.a, _Prerequisite.second)
+        self.assertIsNone(store.topological_sort())
+        prerequisites = store.prerequisites[:]
+        prerequisites[-1] = 0  # removes the cycle
+        self.assertEqual(store.topological_sort(prerequisites), [*nx.topological_sort(store.to_networkx(prerequisites=prerequisites))])
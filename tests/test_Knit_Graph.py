@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from knit_script.knit_graphs.Knit_Graph import Knit_Graph
+from knit_script.knit_graphs.Loop import Loop
+from knit_script.knit_graphs.Pull_Direction import Pull_Direction
+from knit_script.knit_graphs.Yarn import Yarn
+
+
+class Test_Knit_Graph(TestCase):
+
+    def test_yarn_sequence(self):
+        knit_graph = Knit_Graph()
+        yarn = Yarn("1")
+        knit_graph.add_yarn(yarn)
+        for _ in range(5):
+            yarn.add_loop_to_end(knit_graph=knit_graph)
+        yarn.insert_loop(2, True, loop_id=10, loop=Loop(10, yarn))
+        yarn.insert_loop(0, False, loop_id=11, loop=Loop(11, yarn))
+        self.assertEqual([*yarn], [11, 0, 1, 2, 10, 3, 4])
+        self.assertEqual([*reversed(yarn)], [4, 3, 10, 2, 1, 0, 11])
+        self.assertEqual(sorted(yarn.yarn_graph.edges), [(0, 1), (1, 2), (2, 10), (3, 4), (10, 3), (11, 0)])
+        self.assertIs(yarn.yarn_graph.nodes[10]["loop"], yarn[10])
+        self.assertEqual(yarn.last_loop_id, 4)
+        yarn.remove_loop(4)
+        yarn.remove_loop(10)
+        self.assertEqual([*yarn], [11, 0, 1, 2, 3])
+        self.assertEqual(yarn.last_loop_id, 3)
+        self.assertNotIn(10, yarn)
+        self.assertEqual(len(yarn), 5)
+        _, loop = yarn.add_loop_to_end(knit_graph=knit_graph)
+        self.assertEqual((loop.loop_id, yarn.last_loop_id, [*yarn][-1]), (5, 5, 5))
+
+    def test_stitch_edges(self):
+        knit_graph = Knit_Graph()
+        yarn = Yarn("1")
+        knit_graph.add_yarn(yarn)
+        for _ in range(8):
+            yarn.add_loop_to_end(knit_graph=knit_graph)
+        for child_id in range(4, 8):
+            knit_graph.connect_loops(child_id - 4, child_id, Pull_Direction.FtB if child_id % 2 == 0 else Pull_Direction.BtF)
+        knit_graph.connect_loops(2, 7, depth=-1, parent_offset=1, stack_position=0)
+        self.assertEqual(knit_graph.parent_ids(7), [3, 2])
+        self.assertEqual([l.loop_id for l in knit_graph[7].parent_loops], [2, 3])
+        self.assertEqual(knit_graph.get_stitch_edge(2, 7), {"pull_direction": Pull_Direction.BtF, "depth": -1, "parent_offset": 1})
+        self.assertEqual(knit_graph.get_stitch_edge(0, 4, "pull_direction"), Pull_Direction.FtB)
+        self.assertIsNone(knit_graph.get_stitch_edge(1, 4))
+        self.assertEqual([knit_graph.get_child_loop(i) for i in range(8)], [4, 5, 6, 7, None, None, None, None])
+        self.assertEqual(sorted(knit_graph.graph.edges), [(0, 4), (1, 5), (2, 6), (2, 7), (3, 7)])
+        self.assertEqual(knit_graph.graph[2][7]["depth"], -1)
+        self.assertEqual([[*c] for c in knit_graph.get_courses()], [[0, 1, 2, 3], [4, 5, 6, 7]])
+        course_numbers, course_indices = knit_graph.course_positions()
+        self.assertEqual(course_numbers.tolist(), [0, 0, 0, 0, 1, 1, 1, 1])
+        self.assertEqual(course_indices.tolist(), [0, 1, 2, 3, 0, 1, 2, 3])
+        self.assertEqual(knit_graph.get_courses()[1].index(6), 2)
+        knit_graph.get_courses()[1].add_loop(knit_graph[0], index=0)  # returned courses are copies
+        self.assertEqual([[*c] for c in knit_graph.get_courses()], [[0, 1, 2, 3], [4, 5, 6, 7]])
+        self.assertEqual(knit_graph.course_positions()[1].tolist(), [0, 1, 2, 3, 0, 1, 2, 3])
+        knit_graph.remove_loops_after(5)
+        self.assertEqual(sorted(knit_graph.graph.edges), [(0, 4), (1, 5)])
+        self.assertEqual(knit_graph.course_positions()[0].tolist()[:6], [0, 0, 0, 0, 1, 1])
+        self.assertEqual([knit_graph.get_child_loop(i) for i in range(4)], [4, 5, None, None])
+        yarn.add_loop_to_end(knit_graph=knit_graph)
+        knit_graph.connect_loops(3, 6)
+        self.assertEqual(knit_graph.parent_ids(6), [3])
+        self.assertEqual(knit_graph.get_child_loop(3), 6)
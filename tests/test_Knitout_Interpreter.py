@@ -1,5 +1,9 @@
+import contextlib
+import io
+import os
 from unittest import TestCase
 
+from knit_script.Knit_Errors.knitting_errors import Long_Float_Error
 from knit_script.knitout_interpreter.Knitout_Interpreter import Knitout_Interpreter
 
 
@@ -119,3 +123,21 @@ class TestKnitout_Interpreter(TestCase):
                 outhook 5
                         """
         interpreter.organize_knitout(pattern, out_file="test.k", pattern_is_file=False)
+
+    def test_validation_without_knit_graph(self):
+        samples_directory = os.path.join(os.path.dirname(__file__), "knitout_samples")
+        warned_pattern = ";!knitout-2\ninhook 1\ntuck - f14 1\ntuck - f12 1\nknit + f13 1\nreleasehook 1\nxfer f14 b14\nin 2\nknit - f12 2\nout 1\nin 1\n"
+        for pattern, pattern_is_file in [(os.path.join(samples_directory, f), True) for f in sorted(os.listdir(samples_directory))] + [(warned_pattern, False)]:
+            results = []
+            for builds_knit_graph in [True, False]:
+                interpreter = Knitout_Interpreter(builds_knit_graph=builds_knit_graph)
+                with contextlib.redirect_stdout(io.StringIO()) as warnings:
+                    knitout = interpreter.interpret_knitout(pattern, pattern_is_file)
+                machine_state = interpreter.context.machine_state
+                results.append(([str(line) for line in knitout], warnings.getvalue(), machine_state.last_loop_id,
+                                machine_state.front_bed.loop_counts.tolist(), machine_state.back_bed.loop_counts.tolist()))
+            self.assertEqual(results[0], results[1], pattern)
+            self.assertEqual(len(interpreter.context.machine_state.knit_graph.loops), 0)
+        for builds_knit_graph in [True, False]:
+            with self.assertRaises(Long_Float_Error):
+                Knitout_Interpreter(builds_knit_graph=builds_knit_graph).interpret_knitout(";!knitout-2\ninhook 1\ntuck - f20 1\ntuck - f10 1\n", False)
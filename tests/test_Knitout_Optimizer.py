@@ -2,7 +2,7 @@ from unittest import TestCase
 
 from knit_script.knit_script_interpreter.Knit_Script_Interpreter import Knit_Script_Interpreter
 from knit_script.knitout_interpreter.Knitout_Interpreter import Knitout_Interpreter
-from knit_script.knitout_interpreter.Knitout_Optimizer import Knitout_Optimizer
+from knit_script.knitout_interpreter.Knitout_Optimizer import Knitout_Optimizer, Instruction_Prerequisite
 
 
 class TestKnitout_Optimizer(TestCase):
@@ -195,4 +195,84 @@ class TestKnitout_Optimizer(TestCase):
         knitout, _knit_graph, _machine_state = ks_interpreter.write_knitout(program, "small_op.k", pattern_is_file=False, optimize=False)
         print(knitout)
         knitout, _knit_graph, _machine_state = ks_interpreter.write_knitout(program, "small_op.k", pattern_is_file=False, optimize=True)
-        print(knitout)
\ No newline at end of file
+        print(knitout)
+
+    def test_constraint_views(self):
+        interpreter = Knitout_Interpreter(False, False)
+        pattern = r"""
+                        ;!knitout-2
+                        inhook 1
+                        tuck + f1 1
+                        tuck + f2 1
+                        tuck + f3 1
+                        tuck + f4 1
+                        releasehook 1
+                        xfer f1 b1
+                        xfer f2 b2
+                        xfer f3 b3
+                        xfer f4 b4
+                        knit - b4 1
+                        knit - b3 1
+                        knit - b2 1
+                        knit - b1 1
+                        outhook 1
+                        """
+        interpreter.interpret_knitout(pattern, False, True)
+        optimizer = Knitout_Optimizer(interpreter.context, 1)
+        views = [optimizer.needle_instruction_graph, optimizer.yarn_instruction_graph, optimizer.carriage_pass_prerequisites]
+        for view in views:
+            self.assertGreater(len(view.edges), 0)
+        for u, v in optimizer.constraint_graph.edges():
+            self.assertTrue(any(view.has_edge(u, v) for view in views), f"{u} -> {v} is not in any constraint view")
+        optimized_knitout = optimizer.optimize()
+        self.assertGreater(len(optimized_knitout), 0)
+
+    def test_long_program_xfer_release(self):
+        lines = [";!knitout-2", "inhook 1", "tuck + f1 1", "releasehook 1"]
+        for _ in range(750):  # longer chain of carriage passes than the recursion limit
+            lines.extend(["knit - f1 1", "xfer f1 b1", "knit + b1 1", "xfer b1 f1"])
+        lines.append("outhook 1")
+        interpreter = Knitout_Interpreter(False, False)
+        interpreter.interpret_knitout("\n".join(lines), False, True)
+        optimizer = Knitout_Optimizer(interpreter.context, 1)
+        xfer_after_release = [(u, v) for u, v, is_xfer_after in optimizer.yarn_instruction_graph.edges(data="xfer_after_release", default=False) if is_xfer_after]
+        self.assertEqual(len(xfer_after_release), 1)
+        self.assertTrue(xfer_after_release[0][1].is_xfer_pass)
+        self.assertGreater(len(optimizer.optimize()), 3000)
+
+    def test_relaxed_constraints(self):
+        interpreter = Knitout_Interpreter(False, False)
+        pattern = r"""
+                        ;!knitout-2
+                        inhook 1
+                        releasehook 1
+                        inhook 2
+                        releasehook 2
+                        tuck + f1 1
+                        tuck + f2 1
+                        tuck + f3 1
+                        tuck + f4 1
+                        knit + f1 2
+                        knit + f2 2
+                        knit + f3 2
+                        knit + f4 2
+                        knit - f4 1
+                        knit - f3 1
+                        knit - f2 1
+                        knit - f1 1
+                        knit - f4 2
+                        knit - f3 2
+                        knit - f2 2
+                        knit - f1 2
+                        outhook 1
+                        outhook 2
+                        """
+        interpreter.interpret_knitout(pattern, False, True)
+        optimizer = Knitout_Optimizer(interpreter.context, 1)
+        optimized_knitout = [str(instruction).strip() for instruction in optimizer.optimize()]
+        self.assertEqual(len(optimizer.relaxed_constraints), 1)
+        _pass, release, prerequisite = optimizer.relaxed_constraints[0]
+        self.assertIs(prerequisite, Instruction_Prerequisite.hook_direction)
+        self.assertEqual(str(release).strip(), "releasehook 1")
+        # the hook direction of carrier 2 is not on a cycle, so it is released after its first pass in the inhook direction
+        self.assertGreater(optimized_knitout.index("releasehook 2"), optimized_knitout.index("knit - f1 2"))
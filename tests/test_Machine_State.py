@@ -0,0 +1,228 @@
+import random
+from unittest import TestCase
+
+from knit_script.knit_graphs.Loop import Loop
+from knit_script.knitout_interpreter.knitout_structures.knitout_instructions import knitout_instructions
+from knit_script.knitting_machine.Machine_State import Machine_State
+from knit_script.knitting_machine.machine_components.Sheet_Needle import Sheet_Needle, Slider_Sheet_Needle
+from knit_script.knitting_machine.machine_components.machine_pass_direction import Pass_Direction
+from knit_script.knitting_machine.machine_components.needles import Needle, Slider_Needle
+from knit_script.knitting_machine.machine_components.yarn_management.Carrier_Set import Carrier_Set
+
+
+class Test_Machine_State(TestCase):
+
+    def _machine_state(self) -> Machine_State:
+        machine_state = Machine_State(needle_count=40)
+        loop_id = 0
+        for position in range(0, 39, 3):
+            machine_state.front_bed.add_loops(Needle(True, position), [Loop(loop_id, None)], drop_prior_loops=False)
+            machine_state.back_bed.add_loops(Needle(False, position + 1), [Loop(loop_id + 1, None), Loop(loop_id + 2, None)], drop_prior_loops=False)
+            loop_id += 3
+        machine_state.front_bed.add_loops(Slider_Needle(True, 5), [Loop(loop_id, None)], drop_prior_loops=False)
+        return machine_state
+
+    def test_loops_match_needle_scan(self):
+        machine_state = self._machine_state()
+        machine_state.drop(machine_state[Needle(True, 9)])
+        for gauge in range(1, 5):
+            for sheet in range(0, gauge):
+                for loops, needles in [(machine_state.front_loops, machine_state.front_needles), (machine_state.back_loops, machine_state.back_needles),
+                                       (machine_state.front_slider_loops, machine_state.front_sliders), (machine_state.all_loops, machine_state.all_needles),
+                                       (machine_state.all_slider_loops, machine_state.all_sliders)]:
+                    expected = [n for n in needles(True, sheet, gauge) if n.has_loops]
+                    self.assertEqual(loops(True, sheet, gauge), expected)
+                    self.assertTrue(all(a is b for a, b in zip(loops(True, sheet, gauge), expected)))
+        self.assertEqual(machine_state.all_loops(on_sheet=False), [n for n in machine_state.all_needles(on_sheet=False) if n.has_loops])
+
+    def test_needle_ranges(self):
+        machine_state = Machine_State(needle_count=40)
+        front = machine_state.front_bed.needles
+        back = machine_state.back_bed.needles
+        needles = machine_state.front_needles(True, 1, 2)
+        self.assertEqual(needles, front[1:40:2])
+        self.assertTrue(all(a is b for a, b in zip(needles, front[1:40:2])))
+        for item in [slice(0, 10, 2), slice(-3, None), slice(None, None, -3), slice(15, 2, -2), slice(50, 60)]:
+            self.assertEqual(list(needles[item]), front[1:40:2][item])
+            self.assertEqual(list(needles[2:18][item]), front[1:40:2][2:18][item])
+        self.assertIs(needles[-1], front[39])
+        self.assertEqual(str(needles[0:3]), str(front[1:6:2]))
+        self.assertIn(front[7], needles)
+        self.assertNotIn(front[8], needles)
+        self.assertNotIn(back[7], needles)
+        all_needles = machine_state.all_needles(True, 0, 4)
+        self.assertEqual(all_needles, front[0:40:4] + back[0:40:4])
+        self.assertEqual(list(all_needles[8:12]), front[32:40:4] + back[0:8:4])
+        self.assertEqual(all_needles[::-5], (front[0:40:4] + back[0:40:4])[::-5])
+        self.assertIn(back[36], all_needles)
+        self.assertEqual(machine_state.back_sliders(False)[5:7] + [front[0]], machine_state.back_bed.sliders[5:7] + [front[0]])
+
+    def test_loop_counts(self):
+        machine_state = self._machine_state()
+        self.assertEqual(machine_state.back_bed.loop_counts[4], 2)
+        self.assertEqual(machine_state.front_bed.slider_loop_counts[5], 1)
+        machine_state.xfer(machine_state[Needle(False, 4)], machine_state[Needle(True, 4)])
+        self.assertEqual(machine_state.back_bed.loop_counts[4], 0)
+        self.assertEqual(machine_state.front_bed.loop_counts[4], 2)
+        self.assertEqual(machine_state.back_bed.loop_positions(start=1, step=3), [1, 7, 10, 13, 16, 19, 22, 25, 28, 31, 34, 37])
+        self.assertEqual(machine_state.front_bed.loop_positions(start=1, step=3), [4])
+
+    def test_needle_keys(self):
+        needles = [Needle(True, 5), Needle(False, 5), Slider_Needle(True, 5), Slider_Needle(False, 5), Needle(True, 6)]
+        self.assertEqual(len({n.key for n in needles}), len(needles))
+        self.assertEqual(Sheet_Needle(True, 2, 1, 2).key, Needle(True, 5).key)
+        self.assertEqual(Slider_Sheet_Needle(False, 2, 1, 2), Slider_Needle(False, 5))
+        self.assertFalse(Needle(True, 5).has_loops)
+        self.assertFalse(hasattr(Needle(True, 5), "__dict__"))
+
+    def test_reset_sheet_returns_unrecorded_loops(self):
+        machine_state = Machine_State(needle_count=20)
+        machine_state.gauge = 2
+        for position in [0, 2, 4]:
+            machine_state.add_loops(machine_state[Needle(True, position)], loops=[Loop(position, None)], drop_prior_loops=False)
+        machine_state.xfer(machine_state[Needle(True, 2)], machine_state[Needle(False, 2)], record_needle=False)
+        xfers = [str(line).split(";")[0].strip() for line in machine_state.reset_sheet(0) if "xfer" in str(line)]
+        self.assertEqual(xfers, ["xfer b2 f2"])
+        self.assertEqual(machine_state.front_loops(), [machine_state[Needle(True, p)] for p in [0, 2, 4]])
+        self.assertEqual([line for line in machine_state.reset_sheet(0) if "xfer" in str(line)], [])
+
+    @staticmethod
+    def _set_layer(layers: dict[int, int], gauge: int, needle_pos: int, layer_value: int):
+        """Reference for setting one layer position: the other sheets at the position shift by the same amount"""
+        layer_dif = layer_value - layers[needle_pos]
+        if layer_dif != 0:
+            layers[needle_pos] = layer_value
+            sheet = needle_pos % gauge
+            for other_pos in [needle_pos + (s - sheet) for s in range(0, gauge) if s != sheet]:
+                layers[other_pos] = (layer_dif + layers[other_pos]) % gauge
+
+    def test_batched_layer_positions(self):
+        machine_state = Machine_State(needle_count=60)
+        machine_state.gauge = 3
+        layers = {n: n % 3 for n in range(60)}
+        generator = random.Random(4)
+        for _ in range(20):
+            positions = generator.sample(range(60), 12)
+            values = [generator.randrange(3) for _ in positions]
+            machine_state.set_layer_positions(positions, values)
+            for needle_pos, layer_value in zip(positions, values):
+                self._set_layer(layers, 3, needle_pos, layer_value)
+            self.assertEqual(machine_state.get_layers_at_positions(list(range(60))), [layers[n] for n in range(60)])
+            machine_state.push_layers_backward(positions, 2)
+            for needle_pos in positions:
+                self._set_layer(layers, 3, needle_pos, (layers[needle_pos] + 2) % 3)
+            self.assertEqual(machine_state.get_layers_at_positions(list(range(60))), [layers[n] for n in range(60)])
+        sheet_positions = list(range(1, 60, 3))
+        machine_state.set_layers_to_back(sheet_positions)
+        for needle_pos in sheet_positions:
+            self._set_layer(layers, 3, needle_pos, 2)
+        self.assertEqual(machine_state.get_layers_at_positions(list(range(60))), [layers[n] for n in range(60)])
+        machine_state.swap_layers_at_positions([0, 3, 4], [1, 5, 3])
+        layers[0], layers[1] = layers[1], layers[0]
+        layers[3], layers[5] = layers[5], layers[3]
+        layers[4], layers[3] = layers[3], layers[4]
+        self.assertEqual(machine_state.get_layers_at_positions(list(range(60))), [layers[n] for n in range(60)])
+
+    @staticmethod
+    def _state(machine_state: Machine_State) -> tuple:
+        """The parts of a machine state that a snapshot restores"""
+        beds = [machine_state.front_bed, machine_state.back_bed]
+        return (machine_state.racking, machine_state.gauge, machine_state.sheet, machine_state.last_carriage_direction,
+                [[(n.key, [l.loop_id for l in n.held_loops]) for n in bed.needles + bed.sliders] for bed in beds],
+                [bed.loop_counts.tolist() for bed in beds], [bed.sliders_are_clear() for bed in beds],
+                [{l.loop_id: None if n is None else n.key for l, n in bed.loops_to_needle.items() if n is not None} for bed in beds],
+                {l.loop_id: (None if l.holding_needle is None else l.holding_needle.key, len(l.instructions), [p.loop_id for p in l.parent_loops])
+                 for l in machine_state.knit_graph.loops.values()},
+                sorted(machine_state.knit_graph.graph.edges), machine_state.knit_graph.last_loop_id, [*machine_state.knit_graph.yarns],
+                [(y.last_loop_id, sorted(y.yarn_graph.edges), len(y)) for y in machine_state.knit_graph.yarns.values()],
+                [str(c.snapshot()) for c in machine_state.carrier_system.carriers.values()], machine_state.carrier_system.hook_position,
+                machine_state.get_layers_at_positions(list(range(len(machine_state)))), dict(machine_state._loop_record),
+                sorted(machine_state._unrecorded_positions))
+
+    @staticmethod
+    def _knit_rows(machine_state: Machine_State, carrier_set: Carrier_Set, positions: range, rows: int):
+        for row in range(rows):
+            direction = Pass_Direction.Rightward if row % 2 == 0 else Pass_Direction.Leftward
+            for position in direction.sort_needles([Needle(True, p) for p in positions]):
+                knitout_instructions.knit(machine_state, direction, position, carrier_set)
+
+    def test_snapshot_restore(self):
+        machine_state = Machine_State(needle_count=30)
+        carrier_set = Carrier_Set(1)
+        knitout_instructions.inhook(machine_state, carrier_set)
+        for position in range(0, 10):
+            knitout_instructions.tuck(machine_state, Pass_Direction.Leftward, Needle(True, 9 - position), carrier_set)
+        knitout_instructions.releasehook(machine_state)
+        machine_state.gauge = 2
+        start_state = self._state(machine_state)
+        snapshot = machine_state.snapshot()
+        self._knit_rows(machine_state, carrier_set, range(0, 10), 2)
+        for position in range(0, 10, 2):
+            knitout_instructions.xfer(machine_state, machine_state[Needle(True, position)], machine_state[Needle(False, position)])
+        machine_state.push_layers_backward([0, 2, 4], 1)
+        knitout_instructions.rack(machine_state, 1)
+        middle_state = self._state(machine_state)
+        inner_snapshot = machine_state.snapshot()
+        knitout_instructions.rack(machine_state, 0)
+        knitout_instructions.drop(machine_state, Needle(False, 4))
+        knitout_instructions.inhook(machine_state, Carrier_Set(2))
+        knitout_instructions.knit(machine_state, Pass_Direction.Leftward, Needle(False, 2), Carrier_Set(2))
+        knitout_instructions.releasehook(machine_state)
+        knitout_instructions.outhook(machine_state, Carrier_Set(2))
+        machine_state.front_bed.add_loops(Slider_Needle(True, 3), machine_state.front_bed.drop(Needle(True, 3)), drop_prior_loops=False)
+        machine_state.swap_layers_at_positions([1], [3])
+        self.assertNotEqual(self._state(machine_state), middle_state)
+        machine_state.restore(inner_snapshot)
+        self.assertEqual(self._state(machine_state), middle_state)
+        inner_snapshot = machine_state.snapshot()
+        knitout_instructions.drop(machine_state, Needle(False, 6))
+        machine_state.release(inner_snapshot)
+        self._knit_rows(machine_state, carrier_set, range(1, 10, 2), 1)
+        machine_state.restore(snapshot)
+        self.assertEqual(self._state(machine_state), start_state)
+        self._knit_rows(machine_state, carrier_set, range(0, 10), 1)
+        self.assertEqual(machine_state.knit_graph.last_loop_id, 19)
+
+    def test_yarn_last_needle(self):
+        machine_state = Machine_State(needle_count=30)
+        carrier_set = Carrier_Set(1)
+        yarn = machine_state.carrier_system.carriers[1].yarn
+        self.assertIsNone(yarn.last_needle())
+        knitout_instructions.inhook(machine_state, carrier_set)
+        for position in range(0, 10):
+            knitout_instructions.tuck(machine_state, Pass_Direction.Leftward, Needle(True, 9 - position), carrier_set)
+        knitout_instructions.releasehook(machine_state)
+        self._knit_rows(machine_state, carrier_set, range(0, 10), 3)
+
+        def _expected_needle():
+            on_needles = [l for l in machine_state.knit_graph.loops.values() if l.yarn is yarn and l.on_needle]
+            return max(on_needles, key=lambda l: l.loop_id).holding_needle if len(on_needles) > 0 else None
+        self.assertEqual(yarn.last_needle(), Needle(True, 9))
+        for position in [9, 8, 2, 0, 5, 7, 6, 1, 4, 3]:
+            knitout_instructions.drop(machine_state, Needle(True, position))
+            self.assertIs(yarn.last_needle(), _expected_needle())
+        self.assertIsNone(yarn.last_needle())
+        self.assertTrue(machine_state.carrier_system.yarn_is_loose(carrier_set))
+
+    def test_knit_graph_built_when_read(self):
+        machine_state = Machine_State(needle_count=30)
+        carrier_set = Carrier_Set(1)
+        knitout_instructions.inhook(machine_state, carrier_set)
+        for position in range(0, 10):
+            knitout_instructions.tuck(machine_state, Pass_Direction.Leftward, Needle(True, 9 - position), carrier_set)
+        knitout_instructions.releasehook(machine_state)
+        self._knit_rows(machine_state, carrier_set, range(0, 10), 2)
+        snapshot = machine_state.snapshot()
+        self._knit_rows(machine_state, carrier_set, range(0, 10), 1)
+        knitout_instructions.inhook(machine_state, Carrier_Set(2))
+        knitout_instructions.tuck(machine_state, Pass_Direction.Leftward, Needle(True, 4), Carrier_Set(2))
+        machine_state.restore(snapshot)
+        knit_graph = machine_state.knit_graph
+        self.assertEqual(len(knit_graph._loops), 0)  # nothing has read the graph
+        self.assertEqual(knit_graph.last_loop_id, 29)
+        self.assertEqual([*knit_graph.yarns], ["1"])
+        self.assertEqual([*knit_graph.yarns["1"]], list(range(0, 30)))
+        self.assertEqual(sorted(knit_graph.graph.edges), sorted([(19 - c, c) for c in range(10, 20)] + [(39 - c, c) for c in range(20, 30)]))
+        self._knit_rows(machine_state, carrier_set, range(0, 10), 1)
+        self.assertEqual(knit_graph.parent_ids(30), [29])
+        self.assertEqual([l.loop_id for l in knit_graph[30].parent_loops], [29])
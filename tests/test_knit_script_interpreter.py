@@ -1,7 +1,10 @@
+import os
+import tempfile
 from unittest import TestCase
 
 from knit_script.knit_script_interpreter.Knit_Script_Interpreter import Knit_Script_Interpreter
 from knit_script.knit_script_interpreter.Knit_Script_Parser import Knit_Script_Parser
+from knit_script.knit_script_interpreter.statements import Carriage_Pass
 from knit_script.knitout_interpreter.knitout_structures.Knitout_Line import Knitout_Line
 
 
@@ -58,3 +61,129 @@ class Test_KS_Interpreter(TestCase):
         _print_parse(parser, pattern)
         knitout = interpreter._interpret_knit_script(pattern, pattern_is_file=False)
         _print_knitout(knitout)
+
+    def test_variable_scoping(self):
+        interpreter = Knit_Script_Interpreter()
+        pattern = r"""
+                name = "outer";
+                parent = 1;
+                def bump(x):{
+                    parent = x + 1;
+                    return parent;
+                }
+                inner = bump(parent);
+                if True:{
+                    parent = parent + 10;
+                }
+                length = len([1, 2, 3]);
+                """
+        interpreter._interpret_knit_script(pattern, pattern_is_file=False)
+        scope = interpreter._knit_pass_context.variable_scope
+        self.assertEqual(scope["name"], "outer")
+        self.assertEqual(scope["parent"], 11)
+        self.assertEqual(scope["inner"], 2)
+        self.assertEqual(scope["length"], 3)
+        self.assertIsNone(scope.parent)
+
+    def test_failed_try_is_undone(self):
+        pattern = r"""
+                with Carrier as c1:{
+                    in Leftward direction:{ tuck Front_Needles[0:10:2]; }
+                    in Rightward direction:{ tuck Front_Needles[1:10:2]; }
+                    TRY
+                    in reverse direction:{ knit Loops; }
+                }
+                """
+        try_statement = r"""
+                    try:{
+                        in reverse direction:{ knit Loops; }
+                        xfer Loops across to Back bed;
+                        Rack = 1;
+                        with Carrier as c2:{ in reverse direction:{ knit Back_Loops; } }
+                        assert False;
+                    } catch:{ print "caught"; }"""
+        results = []
+        for body in ["", try_statement]:
+            interpreter = Knit_Script_Interpreter()
+            knitout = interpreter._interpret_knit_script(pattern.replace("TRY", body), pattern_is_file=False)
+            machine_state = interpreter._knit_pass_context.machine_state
+            results.append(([str(line) for line in knitout if "caught" not in str(line)], machine_state.racking, machine_state.knit_graph.last_loop_id,
+                            machine_state.front_bed.loop_positions(), machine_state.back_bed.loop_positions()))
+        self.assertEqual(results[0], results[1])
+
+    def test_compiled_statements_match_tree_walk(self):
+        pattern = r"""
+                def rows(count, step=1):{
+                    total = 0;
+                    i = 0;
+                    while i < count:{
+                        total = total + step;
+                        i = i + 1;
+                    }
+                    return total;
+                }
+                with Carrier as c1, width as 8:{
+                    in Leftward direction:{ tuck Front_Needles[0:width:2]; }
+                    in Rightward direction:{ tuck Front_Needles[1:width:2]; }
+                    for r in range(0, rows(4, step=1)):{
+                        if r % 2 == 0 and not r == 2:{
+                            in reverse direction:{ knit Loops; }
+                        } else:{
+                            in reverse direction:{ knit Front_Loops[0:width:2]; tuck Front_Needles[1:width:2]; }
+                        }
+                    }
+                    with Rack as 1:{ xfer Front_Loops across to Back bed; }
+                    print f"{Loops}";
+                }
+                """
+        results = []
+        for compile_statements in [True, False]:
+            interpreter = Knit_Script_Interpreter(compile_statements=compile_statements)
+            knitout = interpreter._interpret_knit_script(pattern, pattern_is_file=False)
+            results.append([str(line) for line in knitout])
+        self.assertEqual(results[0], results[1])
+
+    def test_imported_modules_are_cached(self):
+        with tempfile.TemporaryDirectory() as program_dir:
+            with open(os.path.join(program_dir, "counted.ks"), "w") as module_file:
+                module_file.write('print "loaded counted";\ndef double(x):{ return x * 2; }\n')
+            program = os.path.join(program_dir, "program.ks")
+            with open(program, "w") as program_file:
+                program_file.write('total = 0;\nfor i in range(0, 3):{\n    import counted;\n    total = total + counted.double(i);\n}\n'
+                                   'import counted as c;\nprint f"total {total + c.double(1)}";\n')
+            start = Knit_Script_Interpreter.import_cache_info()
+            for _ in range(2):
+                interpreter = Knit_Script_Interpreter()
+                interpreter._knit_pass_context.ks_file = program
+                lines = [str(line) for line in interpreter._interpret_knit_script(program, pattern_is_file=True)]
+                self.assertEqual(len([line for line in lines if "loaded counted" in line]), 1)
+                self.assertEqual(len([line for line in lines if "total 8" in line]), 1)
+            end = Knit_Script_Interpreter.import_cache_info()
+        change = {key: end[key] - start[key] for key in end}
+        self.assertEqual(change, {"parse_hits": 2, "parse_misses": 2, "module_hits": 6, "module_misses": 2})
+
+    def test_repeated_passes_reuse_plans(self):
+        pattern = r"""
+                with Carrier as c1, width as 8:{
+                    in Leftward direction:{ tuck Front_Needles[0:width:2]; }
+                    in Rightward direction:{ tuck Front_Needles[1:width:2]; }
+                    for r in range(0, 20):{
+                        in reverse direction:{ knit Front_Loops[0:width:2]; knit Front_Loops[1:width:2]; }
+                    }
+                    with Rack as 1:{ xfer Front_Loops across to Back bed; }
+                }
+                """
+        max_pass_plans = Carriage_Pass.max_pass_plans
+        results = []
+        try:
+            for plan_limit in [0, max_pass_plans]:
+                Carriage_Pass.max_pass_plans = plan_limit
+                Carriage_Pass.pass_plans.clear()
+                interpreter = Knit_Script_Interpreter()
+                results.append([str(line) for line in interpreter._interpret_knit_script(pattern, pattern_is_file=False)])
+            self.assertEqual(len(Carriage_Pass.pass_plans), 5)  # two tucks, a knit in each direction and the transfer
+            for _direction, _racking, _target_bed, needle_keys in Carriage_Pass.pass_plans:  # plans do not hold on to the needles of finished programs
+                self.assertTrue(all(isinstance(needle_key, int) for needle_key, _ in needle_keys))
+        finally:
+            Carriage_Pass.max_pass_plans = max_pass_plans
+        self.assertEqual(results[0], results[1])
@@ -0,0 +1,58 @@
+import os
+from unittest import TestCase
+
+from knit_script.knit_script_interpreter.Knit_Script_Interpreter import Knit_Script_Interpreter
+from knit_script.knitout_interpreter.Knitout_Parser import Knitout_Parser
+from knit_script.knitout_interpreter.knitout_fast_path import decode_line
+
+samples_directory = os.path.join(os.path.dirname(__file__), "knitout_samples")
+leverage_directory = os.path.join(os.path.dirname(__file__), "leverage_evaluation")
+
+
+def _describe(code) -> tuple:
+    """
+    :param code: parsed knitout line
+    :return: type, text, and all attribute values of the knitout line
+    """
+    return type(code), str(code), {key: (type(value), repr(value)) for key, value in vars(code).items()}
+
+
+class Test_Knitout_Fast_Path(TestCase):
+
+    def test_sample_files(self):
+        parser = Knitout_Parser()
+        sample_files = [f for f in os.listdir(samples_directory) if f.endswith(".k")]
+        self.assertGreater(len(sample_files), 0)
+        for sample_file in sample_files:
+            path = os.path.join(samples_directory, sample_file)
+            fast = parser.parse(path, pattern_is_file=True, fast_path=True)
+            parsed = parser.parse(path, pattern_is_file=True, fast_path=False)
+            self.assertEqual(_describe(fast[0]), _describe(parsed[0]), sample_file)
+            for fast_codes, parsed_codes in zip(fast[1:], parsed[1:]):
+                self.assertEqual([_describe(c) for c in fast_codes], [_describe(c) for c in parsed_codes], sample_file)
+
+    def test_unusual_lines_fall_back(self):
+        for line in [";!knitout-2", ";;Gauge: 15", "KNIT + f1 3", "knit+f1 3", "rack", "stitch 5 6", "x-presser_on", "knit + f1 3 bad"]:
+            decoded, _code = decode_line(line)
+            self.assertFalse(decoded, line)
+
+    def _assert_lines_match_text(self, parser: Knitout_Parser, knitout: list, message: str):
+        from_lines = parser.parse_knitout_lines(knitout)
+        from_text = parser.parse("".join(str(k) for k in knitout), pattern_is_file=False)
+        self.assertEqual(_describe(from_lines[0]), _describe(from_text[0]), message)
+        for line_codes, text_codes in zip(from_lines[1:], from_text[1:]):
+            self.assertEqual([_describe(c) for c in line_codes], [_describe(c) for c in text_codes], message)
+
+    def test_parse_knitout_lines(self):
+        parser = Knitout_Parser()
+        for sample_file in ["stst.k", "rib.k", "ribbed_tube.k"]:  # edge cases include header comments that do not survive writing as text
+            knitout = parser.parse(os.path.join(samples_directory, sample_file), pattern_is_file=True)[3]
+            self._assert_lines_match_text(parser, knitout, sample_file)
+
+    def test_parse_executed_knitout_lines(self):
+        interpreter = Knit_Script_Interpreter()
+        pattern = os.path.join(leverage_directory, "rib_tube.ks")
+        interpreter._knit_pass_context.ks_file = pattern
+        knitout = interpreter._interpret_knit_script(pattern, pattern_is_file=True)
+        knitout.extend(interpreter._knit_pass_context.machine_state.carrier_system.cut_all_yarns(interpreter._knit_pass_context.machine_state))
+        self._assert_lines_match_text(Knitout_Parser(), knitout, "rib_tube.ks")
@@ -1,5 +1,8 @@
+import os
+import tempfile
 from unittest import TestCase
 
+from knit_script import grammar_cache
 from knit_script.knitout_interpreter.Knitout_Parser import Knitout_Parser
 
 
@@ -121,3 +124,31 @@ class TestKnitout_Parser(TestCase):
                 outhook 5
                         """
         _print_parse(parser, pattern)
+
+    def test_grammar_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            os.environ["KNIT_SCRIPT_CACHE_DIR"] = cache_dir
+            try:
+                grammar_cache.clear_memory_cache()
+                first = Knitout_Parser()
+                self.assertEqual(len([f for f in os.listdir(cache_dir) if f.endswith(".pgt")]), 1)
+                self.assertIs(first._parser, Knitout_Parser()._parser)
+                grammar_cache.clear_memory_cache()
+                from_disk = Knitout_Parser()
+                self.assertIsNot(first._parser, from_disk._parser)
+                version, head, instructions, codes, comments = from_disk.parse("knit + f1 5\nxfer f1 b1", pattern_is_file=False)
+                self.assertEqual([str(i).split(";")[0].strip() for i in instructions], ["knit + f1 5", "xfer f1 b1"])
+            finally:
+                del os.environ["KNIT_SCRIPT_CACHE_DIR"]
+                grammar_cache.clear_memory_cache()
+
+    def test_batch_line_numbers(self):
+        parser = Knitout_Parser(False, False, False)
+        pattern = ";!knitout-2\n;;Carriers: 1 2 3\n\ninhook 3 ; bring in\n   \n; only a comment\nknit + f1 3\nxfer f1 b1\n"
+        for batch_size in [1, 2, 3, 1000]:
+            version, head, instructions, codes, comments = parser.parse(pattern, batch_size=batch_size)
+            self.assertEqual(version.version, 2)
+            self.assertEqual(len(head), 1)
+            self.assertEqual([c.original_line_number for c in codes], [0, 1, 3, 5, 6, 7])
+            self.assertEqual([i.original_line_number for i in instructions], [3, 6, 7])
+            self.assertEqual([c.original_line_number for c in comments], [5])
@@ -1,8 +1,12 @@
 """Tests associated with the parsing of the language. Does not interpret the code"""
+import os
+import tempfile
 from unittest import TestCase
 
 from knit_script.knit_script_interpreter.Knit_Script_Interpreter import Knit_Script_Interpreter
+from knit_script.knit_script_interpreter.Knit_Script_Parser import Knit_Script_Parser
 from knit_script.knit_script_interpreter.expressions.needle_set_expression import Needle_Sets
+from knit_script.knit_script_interpreter.module_cache import Statement_Disk_Cache
 from knit_script.knitting_machine.machine_specification.Machine_Type import Machine_Type
 from knit_script.knitting_machine.machine_specification.Header_ID import Header_ID
 from knit_script.knit_script_interpreter.statements.Statement import Expression_Statement
@@ -411,3 +415,27 @@ def alt_tuck_needle_set(co_needles, co_dir=Leftward):{
         print(results)
 
 
+
+    def test_statement_disk_cache(self):
+        program = r"""
+def double(x):{ return x * 2; }
+for i in range(0, 3):{ print double(i); }
+"""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = Statement_Disk_Cache(cache_dir)
+            parsed = Knit_Script_Parser(statement_cache=cache).parse(program)
+            loaded = Knit_Script_Parser(statement_cache=Statement_Disk_Cache(cache_dir)).parse(program)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+            self.assertEqual(str(loaded), str(parsed))
+            self.assertEqual(loaded[0].line_number, parsed[0].line_number)
+            entry_path = cache.entry_path(program)
+            with open(entry_path, "wb") as entry:
+                entry.write(b"corrupt")
+            self.assertEqual(str(Knit_Script_Parser(statement_cache=cache).parse(program)), str(parsed))
+            self.assertEqual((cache.hits, cache.misses), (0, 2))
+            other_program = "x = 1;"
+            os.utime(entry_path, (0, 0))  # unused for longer than the maximum age
+            Knit_Script_Parser(statement_cache=Statement_Disk_Cache(cache_dir, max_age_seconds=60)).parse(other_program)
+            self.assertEqual(os.listdir(cache_dir), [os.path.basename(cache.entry_path(other_program))])
+            Knit_Script_Parser(statement_cache=Statement_Disk_Cache(cache_dir, max_bytes=0)).parse(program)
+            self.assertEqual(os.listdir(cache_dir), [])